@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from .job_runner import JobRunner
 from .optimizer_factory import OptimizerFactory
 
-__all__ = ['OptimizerFactory']
+__all__ = ['JobRunner', 'OptimizerFactory']
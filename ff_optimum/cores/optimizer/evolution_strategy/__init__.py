@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+from .cma_evolution_strategy import (
+    CovarianceMatrixAdaptationEvolutionStrategyOptimizer)
+
+__all__ = ['CovarianceMatrixAdaptationEvolutionStrategyOptimizer']
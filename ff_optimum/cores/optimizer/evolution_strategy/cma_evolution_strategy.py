@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+import copy
+import time
+from typing import Any, Union
+
+import numpy as np
+
+from ff_optimum.cores.optimizer.optimizer_base import Optimizer
+from ff_optimum.cores.utilities import (EvaluationBudget, EventLogger,
+                                        file_set_path)
+
+__all__ = ['CovarianceMatrixAdaptationEvolutionStrategyOptimizer']
+
+logger = EventLogger(__name__)
+
+
+class CovarianceMatrixAdaptationEvolutionStrategyOptimizer(Optimizer):
+
+    """
+    Class for the covariance matrix adaptation evolution strategy (CMA-ES)
+
+    The search space is the parameters with nonzero step size, every
+    parameter is normalized by its step size relative to the initial value
+    as the moves of simulated annealing, so the initial distribution is
+    isotropic. The samples are repaired into the constraints before the
+    evaluation and the repaired samples update the distribution. The
+    population of every generation is evaluated as one batch across the
+    engines if the package supports it.
+
+    Attributes
+    ----------
+    __number_of_generations: int
+        maximum number of generations
+
+    __population_size: int
+        number of samples of every generation
+
+    __sigma: float
+        initial step size of the distribution in normalized units
+
+    __tolerance: float
+        step size of the distribution to terminate the optimization
+
+    __threshold: float
+        threshold of the error for terminating the optimization
+
+    __errors_trace: dict
+        best and mean errors of the generations
+
+    __budget: EvaluationBudget
+        wall time and evaluation budget of the run, None if the run is
+        not budgeted
+
+    Methods
+    -------
+    optimize()
+        run the evolution strategy
+    """
+
+    __slots__ = ['__number_of_generations', '__population_size', '__sigma',
+                 '__tolerance', '__threshold', '__errors_trace',
+                 '__budget']
+
+    def __init__(self, number_of_processors: int, profile: str,
+                 package_name: str, package_settings: dict,
+                 parameters: Union[dict, np.ndarray],
+                 constraints_source: str, constraints_input: Any,
+                 command_holder_train: object, training_data: dict,
+                 plot_information: dict, alogrithm_parameters: dict,
+                 output_directory: str):
+
+        logger.info('Algorithm name: Covariance Matrix Adaptation '
+                    'Evolution Strategy')
+
+        self.__number_of_generations = int(
+            alogrithm_parameters.get('number_of_generations', 100))
+
+        self.__population_size = alogrithm_parameters.get('population_size',
+                                                          None)
+
+        self.__sigma = float(alogrithm_parameters.get('sigma', 0.5))
+
+        self.__tolerance = float(alogrithm_parameters.get('tolerance',
+                                                          1.0e-3))
+
+        self.__threshold = float(alogrithm_parameters.get('threshold', 0))
+
+        self.__errors_trace = {'Generation': [], 'Best': [], 'Mean': []}
+
+        self.__budget = EvaluationBudget.from_config(
+            alogrithm_parameters.get('budget', None))
+
+        logger.info(f'Number of generations: '
+                    f'{self.__number_of_generations}')
+        logger.info(f'Sigma: {self.__sigma:.4f}')
+        logger.info(f'Tolerance: {self.__tolerance:.4e}')
+        logger.info(f'Threshold: {self.__threshold:.4f}')
+
+        if self.__budget is not None:
+            logger.info(f'Budget: {alogrithm_parameters["budget"]}')
+
+        super(CovarianceMatrixAdaptationEvolutionStrategyOptimizer,
+              self).__init__(
+            number_of_processors, profile, package_name, package_settings,
+            parameters, constraints_source, constraints_input,
+            command_holder_train, training_data, plot_information,
+            output_directory)
+
+        if self._package_setting_train.get('weights', None) is None:
+            raise ValueError('CMA-ES requires the weights of the '
+                             'objectives')
+
+    def optimize(self) -> Union[float, Any]:
+        """
+        Run the evolution strategy until the maximum number of generations,
+        the step size of the distribution is smaller than the tolerance,
+        the best error is smaller than the threshold or the budget can not
+        afford another generation
+
+        Returns
+        -------
+        best_error
+            The global best error searched during optimzation
+
+        best_param_values
+            Parameters with the global best error searched during optimzation
+
+        See Also
+        --------
+        __evaluate_population
+        """
+
+        active = list(self._package.next_parameter_generator(
+            self._parameters, self._step_size, self._constraints, True))
+
+        initial_values = np.array([array[idx] for idx, array, _, _ in active],
+                                  dtype='f8')
+
+        scale = np.array([step for _, _, step, _ in active], dtype='f8') * \
+            np.where(initial_values != 0, np.abs(initial_values), 1.0)
+
+        lower_bound, upper_bound = (
+            (np.array(bound, dtype='f8') - initial_values) / scale
+            for bound in zip(*(constraint for _, _, _, constraint in active)))
+
+        dimension = initial_values.size
+
+        population_size = int(self.__population_size or
+                              4 + int(3 * np.log(dimension)))
+
+        number_of_parents = population_size // 2
+
+        weights = (np.log(number_of_parents + 0.5) -
+                   np.log(np.arange(1, number_of_parents + 1)))
+
+        weights /= weights.sum()
+
+        mueff = 1 / np.square(weights).sum()
+
+        cc = (4 + mueff / dimension) / (dimension + 4 + 2 * mueff / dimension)
+
+        cs = (mueff + 2) / (dimension + mueff + 5)
+
+        c1 = 2 / ((dimension + 1.3)**2 + mueff)
+
+        cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) /
+                  ((dimension + 2)**2 + mueff))
+
+        damps = 1 + 2 * max(0, np.sqrt((mueff - 1) / (dimension + 1)) - 1) + \
+            cs
+
+        chi = np.sqrt(dimension) * (1 - 1 / (4 * dimension) +
+                                    1 / (21 * dimension**2))
+
+        mean, sigma = np.zeros(dimension), self.__sigma
+
+        pc, ps = np.zeros(dimension), np.zeros(dimension)
+
+        basis, scaling = np.eye(dimension), np.ones(dimension)
+
+        covariance = np.eye(dimension)
+
+        best_param_values = copy.deepcopy(self._parameters)
+
+        best_error = self.__evaluate_population([best_param_values])[0]
+
+        logger.info(f'Optimization starts, number of parameters: '
+                    f'{dimension} population size: {population_size} '
+                    f'initial error: {best_error:.4f}')
+
+        for generation in range(self.__number_of_generations):
+
+            if best_error < self.__threshold or sigma < self.__tolerance:
+                break
+
+            if (self.__budget is not None and
+                    self.__budget.remaining_evaluations() < population_size):
+                logger.info(f'Budget is exhausted, evaluations: '
+                            f'{self.__budget.number_of_evaluations} '
+                            f'elapsed time: '
+                            f'{self.__budget.elapsed_time():.1f} s')
+                break
+
+            samples = np.clip(
+                mean + sigma * (np.random.randn(population_size, dimension) *
+                                scaling).dot(basis.T),
+                lower_bound, upper_bound)
+
+            population = [
+                self.__set_values(initial_values + scale * sample)
+                for sample in samples]
+
+            errors = np.array(self.__evaluate_population(population))
+
+            order = np.argsort(errors)
+
+            if errors[order[0]] < best_error:
+                best_error = errors[order[0]]
+                best_param_values = population[order[0]]
+
+            self.__errors_trace['Generation'].append(generation)
+
+            self.__errors_trace['Best'].append(best_error)
+
+            self.__errors_trace['Mean'].append(float(np.mean(errors)))
+
+            logger.info(f'Generation: {generation} Sigma: {sigma:.4f} '
+                        f'Generation best: {errors[order[0]]:.4f} '
+                        f'Best error: {best_error:.4f}')
+
+            previous_mean = mean
+
+            steps = (samples[order[:number_of_parents]] - previous_mean) / \
+                sigma
+
+            mean = previous_mean + sigma * weights.dot(steps)
+
+            step = weights.dot(steps)
+
+            ps = (1 - cs) * ps + np.sqrt(cs * (2 - cs) * mueff) * \
+                basis.dot(basis.T.dot(step) / scaling)
+
+            hsig = (np.linalg.norm(ps) /
+                    np.sqrt(1 - (1 - cs)**(2 * (generation + 1))) / chi <
+                    1.4 + 2 / (dimension + 1))
+
+            pc = (1 - cc) * pc + hsig * np.sqrt(cc * (2 - cc) * mueff) * step
+
+            covariance = (
+                (1 - c1 - cmu) * covariance +
+                c1 * (np.outer(pc, pc) +
+                      (1 - hsig) * cc * (2 - cc) * covariance) +
+                cmu * (steps.T * weights).dot(steps))
+
+            sigma *= np.exp((cs / damps) * (np.linalg.norm(ps) / chi - 1))
+
+            covariance = np.triu(covariance) + np.triu(covariance, 1).T
+
+            eigenvalues, basis = np.linalg.eigh(covariance)
+
+            scaling = np.sqrt(np.maximum(eigenvalues, 1.0e-20))
+
+        logger.info(f'Optimization finish best error: {best_error:.4f}')
+
+        self._parameters = copy.deepcopy(best_param_values)
+
+        return best_error, copy.deepcopy(best_param_values)
+
+    def __evaluate_population(self, population: list) -> list:
+        """
+        Evaluate the errors of the population, the population is computed
+        as one batch if the package supports it
+
+        Parameters
+        ----------
+        population
+            list of the parameters
+
+        Returns
+        -------
+        errors
+            list of the errors
+        """
+
+        if self.__budget is not None:
+            self.__budget.record(len(population))
+
+        if hasattr(self._package, 'compute_values_batch'):
+            calculated_values_list = self._package.compute_values_batch(
+                self._commands_holder_train.compiled_commands, population,
+                self._commands_holder_train.temp_directory)
+
+        else:
+            calculated_values_list = [
+                self._commands_holder_train.execute_commands(parameters)
+                for parameters in population]
+
+        return [float(self._evaluate_fitness(calculated_values,
+                                             self._training_dataset))
+                for calculated_values in calculated_values_list]
+
+    def __set_values(self, values: np.ndarray) -> Any:
+        """
+        Copy the current parameters with the values of the active
+        parameters
+
+        Parameters
+        ----------
+        values
+            values of the active parameters
+
+        Returns
+        -------
+        parameters
+            copy of the parameters
+        """
+
+        parameters = copy.deepcopy(self._parameters)
+
+        for (idx, array, _, _), value in zip(
+                self._package.next_parameter_generator(
+                    parameters, self._step_size, self._constraints, True),
+                values):
+            array[idx] = value
+
+        return parameters
+
+    def save_error_to_file(self) -> None:
+        """
+        Save the best and mean errors of the generations to the file
+
+        Returns
+        -------
+        None
+        """
+
+        now = time.strftime('%y_%m_%d_%H_%M')
+
+        file_path = file_set_path(self._output_directory,
+                                  f'errors_cmaes_{now}')
+
+        with open(file_path, 'w+') as fp:
+
+            fp.write('# generation best mean\n')
+
+            for generation, best, mean in zip(
+                    self.__errors_trace['Generation'],
+                    self.__errors_trace['Best'],
+                    self.__errors_trace['Mean']):
+                fp.write(f'{generation} {best} {mean}\n')
+
+    def save_parameters_to_file(self, filename='ffield_out') -> None:
+        """
+        Save the parameter to the file
+
+        Parameters
+        ----------
+        filename
+            filename of the parameters to be saved
+
+        Returns
+        -------
+        None
+        """
+
+        file_path = file_set_path(self._output_directory, filename)
+
+        self._package.save_parameters_to_file(self._parameters, file_path)
@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+import copy
+import multiprocessing
+import queue
+import time
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from ff_optimum.cores.optimizer.optimizer_base import Optimizer
+from ff_optimum.cores.optimizer.simulated_annealing.achrive import Achrive
+from ff_optimum.cores.utilities import EventLogger, file_set_path
+
+__all__ = ['RingMigration', 'IslandModelOptimizer']
+
+logger = EventLogger(__name__)
+
+
+class RingMigration(object):
+
+    """
+    Class exchanging the solutions between the islands on a ring, every
+    island sends its emigrants to the next island and takes the immigrants
+    waiting in its own inbox without blocking, so the islands never wait
+    for each other
+
+    Attributes
+    ----------
+    __index: int
+        index of the island
+
+    __inboxes: list
+        inbox queue of every island
+
+    __interval: int
+        number of the temperature steps between the migrations
+
+    __number_of_migrants: int
+        maximum number of the solutions sent by one migration
+
+    Methods
+    -------
+    exchange(completed_steps, emigrants)
+        send the emigrants and receive the immigrants
+    """
+
+    __slots__ = ['__index', '__inboxes', '__interval',
+                 '__number_of_migrants']
+
+    def __init__(self, index: int, inboxes: list, interval: int=5,
+                 number_of_migrants: int=1) -> None:
+
+        self.__index = index
+
+        self.__inboxes = inboxes
+
+        self.__interval = interval
+
+        self.__number_of_migrants = number_of_migrants
+
+    def exchange(self, completed_steps: int, emigrants: list) -> list:
+        """
+        Send the emigrants to the next island and receive the immigrants
+        every interval of the completed temperature steps, the emigrants
+        are sampled randomly if there are more than the number of migrants
+
+        Parameters
+        ----------
+        completed_steps
+            number of the completed temperature steps of the island
+
+        emigrants
+            list of the solutions containing parameter and fitness
+
+        Returns
+        -------
+        immigrants
+            list of the solutions received
+        """
+
+        if completed_steps % self.__interval:
+            return []
+
+        if len(emigrants) > self.__number_of_migrants:
+            emigrants = [emigrants[idx] for idx in np.random.choice(
+                len(emigrants), self.__number_of_migrants, replace=False)]
+
+        self.__inboxes[(self.__index + 1) % len(self.__inboxes)].put(
+            emigrants)
+
+        immigrants = []
+
+        while True:
+
+            try:
+                immigrants.extend(self.__inboxes[self.__index].get_nowait())
+
+            except queue.Empty:
+                break
+
+        return immigrants
+
+
+def _run_island(config_path: str, index: int, seed: int, inboxes: list,
+                results: object, interval: int, number_of_migrants: int,
+                frames: Optional[dict], step_size: Any) -> None:
+    """
+    Run one island in the worker process and put the solutions of the
+    island to the results
+
+    Parameters
+    ----------
+    config_path
+        file path of the config file
+
+    index
+        index of the island
+
+    seed
+        seed of the random number generator of the island
+
+    inboxes
+        inbox queue of every island
+
+    results
+        queue of the results of the islands
+
+    interval
+        number of the temperature steps between the migrations
+
+    number_of_migrants
+        maximum number of the solutions sent by one migration
+
+    frames
+        training frames selected for all the islands, None if all the
+        frames are trained
+
+    step_size
+        step size selected for all the islands, None if the island selects
+        its own
+
+    Returns
+    -------
+    None
+    """
+
+    from ff_optimum.cores.optimizer.optimizer_factory import OptimizerFactory
+
+    np.random.seed(seed)
+
+    solutions = None
+
+    try:
+
+        optimizer = OptimizerFactory.create_island_from_config(
+            config_path, index, frames, step_size)
+
+        optimizer.set_migration(
+            RingMigration(index, inboxes, interval, number_of_migrants))
+
+        result = optimizer.optimize()
+
+        optimizer.save_parameters_to_file('ffield_out')
+
+        optimizer.save_error_to_file()
+
+        solutions = (optimizer.get_solutions() if result is None else
+                     [{'parameter': result[1], 'fitness': result[0]}])
+
+    except Exception as e:
+
+        logger.error(f'Island {index} failed: {e}')
+
+    finally:
+
+        for inbox in inboxes:
+            inbox.cancel_join_thread()
+
+        results.put((index, solutions))
+
+
+class IslandModelOptimizer(Optimizer):
+
+    """
+    Class running several islands of simulated annealing in parallel, the
+    islands exchange their best solutions or the solutions of their
+    achrives periodically
+
+    Every island is a worker process creating its own optimizer from the
+    config, with its own seed, output directory and temporary directory
+    and optionally its own optimization level. The islands evaluate
+    serially unless a profile of ipyparallel is given to every island, so
+    the islands scale over the cores of a node without idle engines. The
+    best solution of the islands is the result of simulated annealing,
+    the achrives of the islands are merged for the dominance based
+    multiobjective simulated annealing.
+
+    The training frames and the step size are selected once by the island
+    model and shared by the islands, so the fitness of the islands are
+    comparable for the migration and the result. The step size is selected
+    by every island if the islands have their own optimization levels.
+
+    Attributes
+    ----------
+    __config_path: str
+        file path of the config file
+
+    __is_multiobjective: bool
+        whether the islands run the dominance based multiobjective
+        simulated annealing
+
+    __number_of_islands: int
+        number of the islands
+
+    __seed: int
+        seed of the first island, the seed of every island is offset by
+        its index
+
+    __interval: int
+        number of the temperature steps between the migrations
+
+    __number_of_migrants: int
+        maximum number of the solutions sent by one migration
+
+    __solutions: list
+        solutions of every island, None if the island failed
+
+    __achrive: Achrive
+        merged achrive of the islands
+
+    __is_step_size_shared: bool
+        whether the step size of the island model is shared by the
+        islands
+
+    Methods
+    -------
+    optimize()
+        run the islands
+    """
+
+    __slots__ = ['__config_path', '__is_multiobjective',
+                 '__number_of_islands', '__seed', '__interval',
+                 '__number_of_migrants', '__solutions', '__achrive',
+                 '__is_step_size_shared']
+
+    _PREPARES_COMMANDS_HOLDER = False
+
+    def __init__(self, config_path: str, algorithm_name: str,
+                 package_name: str, package_settings: dict,
+                 parameters: Union[dict, np.ndarray],
+                 constraints_source: str, constraints_input: Any,
+                 command_holder_train: object, training_data: dict,
+                 plot_information: dict, alogrithm_parameters: dict,
+                 output_directory: str):
+
+        islands = alogrithm_parameters['islands']
+
+        self.__config_path = config_path
+
+        self.__is_multiobjective = 'dominance_based' in algorithm_name
+
+        self.__number_of_islands = int(islands.get('number_of_islands', 2))
+
+        self.__seed = int(islands.get('seed', np.random.randint(2**30)))
+
+        self.__interval = max(1, int(islands.get('migration_interval', 5)))
+
+        self.__number_of_migrants = int(islands.get('number_of_migrants', 1))
+
+        self.__solutions = []
+
+        self.__is_step_size_shared = not islands.get('levels')
+
+        self.__achrive = Achrive(
+            alogrithm_parameters.get('achrive_size', 50),
+            alogrithm_parameters.get('achrive_format', 'snapshot'))
+
+        logger.info(f'Algorithm name: Island Model of {algorithm_name}')
+        logger.info(f'Islands: {islands}')
+
+        if alogrithm_parameters.get('resume_from', None):
+            logger.warning('Resume is not supported by the island model, '
+                           'the islands start again')
+
+        super(IslandModelOptimizer, self).__init__(
+            1, None, package_name, package_settings, parameters,
+            constraints_source, constraints_input, command_holder_train,
+            training_data, plot_information, output_directory)
+
+    def optimize(self) -> Union[float, Any]:
+        """
+        Run the islands in the worker processes until all of them finish
+
+        Returns
+        -------
+        best_error
+            the best error of the islands, None for the dominance based
+            multiobjective simulated annealing
+
+        best_param_values
+            parameters with the best error of the islands, None for the
+            dominance based multiobjective simulated annealing
+        """
+
+        context = multiprocessing.get_context('spawn')
+
+        inboxes = [context.Queue() for _ in range(self.__number_of_islands)]
+
+        results = context.Queue()
+
+        processes = [
+            context.Process(
+                target=_run_island, name=f'island_{index}',
+                args=(self.__config_path, index, self.__seed + index,
+                      inboxes, results, self.__interval,
+                      self.__number_of_migrants, self._training_frames,
+                      self._step_size if self.__is_step_size_shared
+                      else None))
+            for index in range(self.__number_of_islands)]
+
+        for process in processes:
+            process.start()
+
+        logger.info(f'Islands start, number of islands: '
+                    f'{self.__number_of_islands} seed: {self.__seed}')
+
+        self.__solutions = [None] * self.__number_of_islands
+
+        for _ in range(self.__number_of_islands):
+
+            while True:
+
+                try:
+                    index, solutions = results.get(timeout=10)
+                    break
+
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        index, solutions = None, None
+                        break
+
+            if index is None:
+                break
+
+            self.__solutions[index] = solutions
+
+            logger.info(f'Island {index} finishes')
+
+        for process in processes:
+            process.join()
+
+        if self.__is_multiobjective:
+            return self.__merge_achrives()
+
+        islands = [(solutions[0]['fitness'], index)
+                   for index, solutions in enumerate(self.__solutions)
+                   if solutions]
+
+        if not islands:
+            raise RuntimeError('All the islands failed')
+
+        best_error, index = min(islands)
+
+        self._parameters = copy.deepcopy(
+            self.__solutions[index][0]['parameter'])
+
+        logger.info(f'Optimization finish best error: {best_error:.4f} '
+                    f'island: {index}')
+
+        return best_error, copy.deepcopy(self._parameters)
+
+    def __merge_achrives(self) -> None:
+        """
+        Merge the solutions of the islands not dominated by each other into
+        the achrive
+
+        Returns
+        -------
+        None
+        """
+
+        for solutions in self.__solutions:
+            for solution in solutions or []:
+
+                if self.__achrive.count_being_dominated_in_achrive(
+                        solution['fitness']):
+                    continue
+
+                self.__achrive.pop_dominated_solution(solution)
+
+                self.__achrive.push_solution(solution)
+
+        logger.info(f'Optimization finish, size of merged achrive: '
+                    f'{self.__achrive.get_achrive_size()}')
+
+    def save_error_to_file(self) -> None:
+        """
+        Save the best error of every island to the file, the errors of the
+        islands are saved in their own output directories
+
+        Returns
+        -------
+        None
+        """
+
+        if self.__is_multiobjective:
+            return
+
+        now = time.strftime('%y_%m_%d_%H_%M')
+
+        file_path = file_set_path(self._output_directory,
+                                  f'errors_islands_{now}')
+
+        with open(file_path, 'w+') as fp:
+
+            fp.write('# island error\n')
+
+            for index, solutions in enumerate(self.__solutions):
+                if solutions:
+                    fp.write(f'{index} {solutions[0]["fitness"]}\n')
+
+    def save_parameters_to_file(self, filename='ffield_out') -> None:
+        """
+        Save the best parameters of the islands, or the merged achrive for
+        the dominance based multiobjective simulated annealing
+
+        Parameters
+        ----------
+        filename
+            filename of the parameters to be saved
+
+        Returns
+        -------
+        None
+        """
+
+        if self.__is_multiobjective:
+            self.__achrive.dump_parameters_to_file(self._package,
+                                                   self._output_directory)
+            return
+
+        file_path = file_set_path(self._output_directory, filename)
+
+        self._package.save_parameters_to_file(self._parameters, file_path)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+import importlib
+import os
+from threading import Thread
+from typing import Optional
+
+from ff_optimum.cores.optimizer.optimizer_factory import OptimizerFactory
+from ff_optimum.cores.utilities import (EventLogger, WorkerPool,
+                                        file_read_json, set_worker_pool)
+
+__all__ = ['JobRunner']
+
+logger = EventLogger(__name__)
+
+
+class JobRunner(object):
+
+    """
+    Class running several optimization jobs side by side on one persistent
+    worker pool instead of an ipyparallel cluster per job
+
+    Every job is a thread creating its optimizer from its config, the jobs
+    only prepare the evaluations while the frames are computed by the
+    worker pool. The pool serves the jobs round robin and the frames
+    computed by several jobs with the same force field are computed once,
+    e.g. the initial evaluations of the jobs starting from the same force
+    field. The jobs write their temporary files to their own directories.
+    The precision of the parameters written for evaluation is a setting of
+    the package shared by the jobs, so the jobs must use the same one.
+
+    Attributes
+    ----------
+    __config_paths: list
+        file path of the config file of every job
+
+    __number_of_workers: int
+        number of the worker processes of the pool
+
+    __results: list
+        result of optimize of every job, None if the job failed
+
+    Methods
+    -------
+    run()
+        run all the jobs until they finish
+    """
+
+    __slots__ = ['__config_paths', '__number_of_workers', '__results']
+
+    def __init__(self, config_paths: list,
+                 number_of_workers: Optional[int]=None) -> None:
+
+        self.__config_paths = list(config_paths)
+
+        self.__number_of_workers = number_of_workers or os.cpu_count()
+
+        self.__results = [None] * len(self.__config_paths)
+
+    @property
+    def results(self) -> list:
+        return self.__results
+
+    def run(self) -> list:
+        """
+        Start the worker pool, run all the jobs and shut the pool down
+
+        Returns
+        -------
+        results
+            result of optimize of every job, None if the job failed
+
+        Raises
+        ------
+        ValueError
+            if the jobs set different precisions of the parameters
+        """
+
+        self.__check_precisions()
+
+        pool = WorkerPool(self.__number_of_workers)
+
+        pool.start()
+
+        set_worker_pool(pool)
+
+        try:
+
+            threads = [Thread(name=f'job_{index}', target=self.__run_job,
+                              args=(index, config_path))
+                       for index, config_path in enumerate(
+                           self.__config_paths)]
+
+            for thread in threads:
+                thread.start()
+
+            logger.info(f'Jobs start, number of jobs: {len(threads)}')
+
+            for thread in threads:
+                thread.join()
+
+        finally:
+
+            set_worker_pool(None)
+
+            pool.shutdown()
+
+        return self.__results
+
+    def __check_precisions(self) -> None:
+        """
+        Check that all the jobs set the same precision of the parameters,
+        the precision is set for the whole process by every job
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            if the jobs set different precisions of the parameters
+        """
+
+        precisions = {}
+
+        for config_path in self.__config_paths:
+
+            setting = file_read_json(config_path)['package']
+
+            package_name = setting.pop('name').lower()
+
+            package = importlib.import_module(f'ff_optimum.user_packages.'
+                                              f'{package_name}')
+
+            precisions[config_path] = package.read_package_setting(
+                setting).get('precision')
+
+        if len(set(map(repr, precisions.values()))) > 1:
+            raise ValueError(f'Jobs set different precisions of the '
+                             f'parameters: {precisions}')
+
+    def __run_job(self, index: int, config_path: str) -> None:
+        """
+        Create the optimizer of the job, optimize and save the results
+
+        Parameters
+        ----------
+        index
+            index of the job
+
+        config_path
+            file path of the config file
+
+        Returns
+        -------
+        None
+        """
+
+        try:
+
+            optimizer = OptimizerFactory.create_job_from_config(config_path,
+                                                                index)
+
+            self.__results[index] = optimizer.optimize()
+
+            optimizer.save_parameters_to_file('ffield_out')
+
+            optimizer.save_error_to_file()
+
+            logger.info(f'Job {index} finishes: {config_path}')
+
+        except Exception as e:
+
+            logger.error(f'Job {index} failed: {config_path} {e}')
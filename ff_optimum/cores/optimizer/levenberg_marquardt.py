@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+import copy
+from typing import Any, Optional
+
+import numpy as np
+
+from ff_optimum.cores.utilities import EventLogger
+
+__all__ = ['LevenbergMarquardtRefinement']
+
+logger = EventLogger(__name__)
+
+
+class LevenbergMarquardtRefinement(object):
+
+    """
+    Class refining the parameters by the Levenberg-Marquardt method on the
+    residuals of the training data, e.g. after simulated annealing
+
+    The active parameters are the parameters with nonzero step size. The
+    Jacobian of the residuals is built by forward finite differences, all
+    the perturbed parameters are computed as one batch by the package.
+    The trial steps of three dampings are computed as one batch as well,
+    the steps are clamped to the constraints. The normal equations are kept
+    while the trial steps are rejected, only the damped system is solved
+    again with the larger damping. A parameter set with a failed
+    frame has no residuals, its trial step costs infinity and its column of
+    the Jacobian is left out of the iteration.
+
+    Attributes
+    ----------
+    __package: module
+        user package providing next_parameter_generator,
+        compute_values_batch and compute_residuals
+
+    __commands_holder: CommandsHolder
+        commands holder storing the compiled commands for training
+
+    __training_dataset: dict
+        training data
+
+    __package_settings: dict
+        package settings for training
+
+    __step_size: Any
+        step size of the parameters
+
+    __constraints: Any
+        constraints of the parameters
+
+    __max_iterations: int
+        maximum number of iterations
+
+    __finite_difference: float
+        size of the finite differences in units of the step size
+
+    __damping: float
+        initial damping of the normal equations
+
+    __tolerance: float
+        minimum relative decrease of the cost to continue
+
+    __budget: EvaluationBudget
+        budget of the run the evaluations are recorded to, the refinement
+        stops when an iteration is not affordable, None if not budgeted
+
+    Methods
+    -------
+    refine(parameters)
+        refine the parameters
+    """
+
+    __slots__ = ['__package', '__commands_holder', '__training_dataset',
+                 '__package_settings', '__step_size', '__constraints',
+                 '__max_iterations', '__finite_difference', '__damping',
+                 '__tolerance', '__budget']
+
+    def __init__(self, package: Any, commands_holder: object,
+                 training_dataset: dict, package_settings: dict,
+                 step_size: Any, constraints: Any, max_iterations: int=10,
+                 finite_difference: float=1.0e-2, damping: float=1.0e-3,
+                 tolerance: float=1.0e-4,
+                 budget: Optional[object]=None) -> None:
+
+        self.__package = package
+
+        self.__commands_holder = commands_holder
+
+        self.__training_dataset = training_dataset
+
+        self.__package_settings = package_settings
+
+        self.__step_size = step_size
+
+        self.__constraints = constraints
+
+        self.__max_iterations = max_iterations
+
+        self.__finite_difference = finite_difference
+
+        self.__damping = damping
+
+        self.__tolerance = tolerance
+
+        self.__budget = budget
+
+    def refine(self, parameters: Any) -> tuple:
+        """
+        Refine the parameters until the relative decrease of the cost is
+        smaller than the tolerance, the maximum number of iterations is
+        reached or the budget can not afford another iteration
+
+        Parameters
+        ----------
+        parameters
+            parameters to be refined
+
+        Returns
+        -------
+        parameters
+            refined copy of the parameters
+
+        cost
+            half of the sum of squared residuals of the refined parameters,
+            infinity if the residuals of the parameters are not computed
+
+        See Also
+        --------
+        LevenbergMarquardtRefinement.__compute_jacobian
+        LevenbergMarquardtRefinement.__compute_normal_equations
+        LevenbergMarquardtRefinement.__compute_steps
+        """
+
+        active = list(self.__package.next_parameter_generator(
+            parameters, self.__step_size, self.__constraints, True))
+
+        if not active:
+            logger.info('Refinement skipped, no active parameters')
+            return copy.deepcopy(parameters), float('inf')
+
+        values = np.array([array[idx] for idx, array, _, _ in active],
+                          dtype='f8')
+
+        lower_bound, upper_bound = (
+            np.array(bound, dtype='f8') for bound in
+            zip(*(constraint for _, _, _, constraint in active)))
+
+        residuals = self.__compute_residuals([parameters])[0]
+
+        if residuals is None:
+            logger.warning('Refinement skipped, residuals of the '
+                           'parameters are not computed')
+            return copy.deepcopy(parameters), float('inf')
+
+        cost, damping = 0.5 * residuals.dot(residuals), self.__damping
+
+        logger.info(f'Refinement starts, number of parameters: '
+                    f'{values.size} cost: {cost:.6e}')
+
+        step_size = np.array([step for _, _, step, _ in active], dtype='f8')
+
+        normal_equations = None
+
+        for iteration in range(self.__max_iterations):
+
+            evaluations = 3 if normal_equations else values.size + 3
+
+            if (self.__budget is not None and
+                    self.__budget.remaining_evaluations() < evaluations):
+                logger.info(f'Refinement stops at iteration: {iteration}, '
+                            f'budget is exhausted')
+                break
+
+            if normal_equations is None:
+                normal_equations = self.__compute_normal_equations(
+                    self.__compute_jacobian(parameters, values, residuals,
+                                            upper_bound, step_size),
+                    residuals)
+
+            dampings = damping * np.array([0.1, 1.0, 10.0])
+
+            trials = [np.clip(values + step, lower_bound, upper_bound)
+                      for step in self.__compute_steps(*normal_equations,
+                                                       dampings)]
+
+            trial_residuals = self.__compute_residuals(
+                [self.__set_values(parameters, trial) for trial in trials],
+                residuals.size)
+
+            trial_costs = [float('inf') if trial is None else
+                           0.5 * trial.dot(trial)
+                           for trial in trial_residuals]
+
+            best = int(np.argmin(trial_costs))
+
+            if trial_costs[best] >= cost:
+
+                damping *= 100.0
+
+                logger.info(f'Refinement iteration: {iteration} '
+                            f'rejected, damping: {damping:.3e}')
+
+                continue
+
+            decrease = (cost - trial_costs[best]) / cost
+
+            values, residuals = trials[best], trial_residuals[best]
+
+            cost, damping = trial_costs[best], dampings[best]
+
+            normal_equations = None
+
+            logger.info(f'Refinement iteration: {iteration} '
+                        f'cost: {cost:.6e} damping: {damping:.3e}')
+
+            if decrease < self.__tolerance:
+                break
+
+        return self.__set_values(parameters, values), cost
+
+    def __compute_jacobian(self, parameters: Any, values: np.ndarray,
+                           residuals: np.ndarray, upper_bound: np.ndarray,
+                           step_size: np.ndarray) -> np.ndarray:
+        """
+        Compute the Jacobian of the residuals by forward finite differences,
+        the difference is taken backward at the upper bound
+
+        Parameters
+        ----------
+        parameters
+            parameters of the values
+
+        values
+            values of the active parameters
+
+        residuals
+            residuals of the values
+
+        upper_bound
+            upper bound of the active parameters
+
+        step_size
+            step size of the active parameters
+
+        Returns
+        -------
+        jacobian
+            one column per active parameter, zero for the parameter whose
+            perturbed residuals are not computed
+        """
+
+        differences = (self.__finite_difference * step_size *
+                       np.where(values != 0, np.abs(values), 1.0))
+
+        differences = np.where(values + differences > upper_bound,
+                               -differences, differences)
+
+        perturbed = []
+
+        for idx, difference in enumerate(differences):
+
+            trial = values.copy()
+
+            trial[idx] += difference
+
+            perturbed.append(self.__set_values(parameters, trial))
+
+        perturbed_residuals = self.__compute_residuals(perturbed,
+                                                       residuals.size)
+
+        failed = sum(trial is None for trial in perturbed_residuals)
+
+        if failed:
+            logger.warning(f'Refinement leaves out {failed} parameters '
+                           f'whose residuals are not computed')
+
+        return np.column_stack([
+            np.zeros(residuals.size) if trial is None else
+            (trial - residuals) / difference for trial, difference in
+            zip(perturbed_residuals, differences)])
+
+    def __compute_normal_equations(self, jacobian: np.ndarray,
+                                   residuals: np.ndarray) -> tuple:
+        """
+        Compute the normal equations of the residuals at the current values
+
+        Parameters
+        ----------
+        jacobian
+            Jacobian of the residuals
+
+        residuals
+            residuals of the current values
+
+        Returns
+        -------
+        normal
+            product of the transposed Jacobian and the Jacobian
+
+        gradient
+            gradient of the cost
+
+        scaling
+            diagonal of the normal matrix scaling the damping, bounded
+            away from zero
+        """
+
+        normal = jacobian.T.dot(jacobian)
+
+        gradient = jacobian.T.dot(residuals)
+
+        scaling = np.maximum(np.diag(normal),
+                             np.finfo('f8').eps * max(normal.max(), 1.0))
+
+        return normal, gradient, scaling
+
+    def __compute_steps(self, normal: np.ndarray, gradient: np.ndarray,
+                        scaling: np.ndarray, dampings: np.ndarray) -> list:
+        """
+        Solve the damped normal equations for every damping
+
+        Parameters
+        ----------
+        normal
+            product of the transposed Jacobian and the Jacobian
+
+        gradient
+            gradient of the cost
+
+        scaling
+            diagonal scaling of the damping
+
+        dampings
+            dampings of the normal equations
+
+        Returns
+        -------
+        steps
+            steps of the active parameters
+        """
+
+        steps = []
+
+        for damping in dampings:
+
+            try:
+                steps.append(np.linalg.solve(
+                    normal + damping * np.diag(scaling), -gradient))
+
+            except np.linalg.LinAlgError:
+                steps.append(np.linalg.lstsq(
+                    normal + damping * np.diag(scaling), -gradient,
+                    rcond=None)[0])
+
+        return steps
+
+    def __compute_residuals(self, parameters_list: list,
+                            size: Optional[int]=None) -> list:
+        """
+        Compute the residuals of a batch of parameters
+
+        Parameters
+        ----------
+        parameters_list
+            list of the parameters
+
+        size
+            expected number of the residuals, not checked if None
+
+        Returns
+        -------
+        residuals_list
+            list of the residuals, None for the parameters with a failed
+            frame or residuals of another size
+        """
+
+        if self.__budget is not None:
+            self.__budget.record(len(parameters_list))
+
+        calculated_values_list = self.__package.compute_values_batch(
+            self.__commands_holder.compiled_commands, parameters_list,
+            self.__commands_holder.temp_directory)
+
+        residuals_list = []
+
+        for calculated_values in calculated_values_list:
+
+            try:
+                residuals = np.asarray(self.__package.compute_residuals(
+                    calculated_values, self.__training_dataset,
+                    self.__package_settings), dtype='f8')
+
+            # the residuals of a failed frame are not computable
+            except (AttributeError, KeyError, TypeError, ValueError):
+                residuals = None
+
+            if residuals is not None and (
+                    (size is not None and residuals.size != size) or
+                    not np.isfinite(residuals).all()):
+                residuals = None
+
+            residuals_list.append(residuals)
+
+        return residuals_list
+
+    def __set_values(self, parameters: Any, values: np.ndarray) -> Any:
+        """
+        Copy the parameters with the values of the active parameters
+
+        Parameters
+        ----------
+        parameters
+            parameters to be copied
+
+        values
+            values of the active parameters
+
+        Returns
+        -------
+        parameters
+            copy of the parameters
+        """
+
+        parameters = copy.deepcopy(parameters)
+
+        for (idx, array, _, _), value in zip(
+                self.__package.next_parameter_generator(
+                    parameters, self.__step_size, self.__constraints, True),
+                values):
+            array[idx] = value
+
+        return parameters
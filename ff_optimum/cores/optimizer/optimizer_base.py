@@ -65,6 +65,14 @@ class Optimizer(abc.ABC):
     _output_directory: str
         String object containing output directory
 
+    _training_frames: dict
+        Frames selected for training by the package, None if all the
+        frames are trained
+
+    _PREPARES_COMMANDS_HOLDER: bool
+        Whether the package prepares the commands holder for training,
+        False for the optimizers which do not evaluate themselves
+
     Methods
     -------
     optimize
@@ -78,7 +86,9 @@ class Optimizer(abc.ABC):
                  '__initial_parameters', '_parameters', '__initial_fitness',
                  '_constraints', '_commands_holder_train', '_training_dataset',
                  '__plot_information', '__commands_holder_test',
-                 '__test_dataset', '_output_directory']
+                 '__test_dataset', '_output_directory', '_training_frames']
+
+    _PREPARES_COMMANDS_HOLDER = True
 
     def __init__(self, number_of_processors: int, profile: str,
                  package_name: str, package_settings: dict,
@@ -96,8 +106,19 @@ class Optimizer(abc.ABC):
         self._package = importlib.import_module(f'ff_optimum.user_packages.'
                                                 f'{package_name.lower()}')
 
-        self._step_size = self.__get_step_size(
-            package_settings.pop("level"))
+        # frames and step size selected once for several optimizers,
+        # e.g. the islands of the island model
+        training_frames = package_settings.pop('training_frames', None)
+
+        step_size = package_settings.pop('step_size', None)
+
+        level = package_settings.pop("level")
+
+        self._step_size = (self.__get_step_size(level) if step_size is None
+                           else step_size)
+
+        self.__set_parameters_precision(
+            package_settings.pop("precision", None))
 
         self._package_setting_train = copy.deepcopy(package_settings)
 
@@ -126,6 +147,16 @@ class Optimizer(abc.ABC):
 
         self._output_directory = output_directory
 
+        self._training_frames = None
+
+        self.__reduce_training_frames(training_frames)
+
+        if step_size is None:
+            self.__select_step_size()
+
+        if self._PREPARES_COMMANDS_HOLDER:
+            self.__prepare_commands_holder()
+
     @staticmethod
     def __enable_parallel_client(
             number_of_processors: int, profile: Optional[str]) -> None:
@@ -264,6 +295,101 @@ class Optimizer(abc.ABC):
     def __get_step_size(self, inputs):
         return self._package.get_default_step_size(inputs)
 
+    def __set_parameters_precision(self, precision: Any) -> None:
+        """
+        Set the precision of the parameters written for evaluation
+        if the package supports it
+
+        Arguments
+        ---------
+        precision
+            precision of the parameters, None for the package default
+
+        Returns
+        -------
+        None
+        """
+
+        if hasattr(self._package, 'set_parameters_precision'):
+
+            logger.info(f'Parameters precision: {precision}')
+
+            self._package.set_parameters_precision(precision)
+
+    def __reduce_training_frames(self, frames: Optional[dict]=None) -> None:
+        """
+        Let the package select a reduced subset of the training frames if
+        the package supports it, the commands holder and the dataset for
+        testing keep all the frames
+
+        Arguments
+        ---------
+        frames
+            frames already selected, selected by the package if None
+
+        Returns
+        -------
+        None
+        """
+
+        if not (hasattr(self._package, 'reduce_training_frames') and
+                hasattr(self._package, 'select_training_frames')):
+            return
+
+        if frames is None:
+            frames = self._package.reduce_training_frames(
+                self._commands_holder_train, self._training_dataset,
+                self._package_setting_train, self._parameters,
+                self._step_size, self._constraints)
+
+        if frames is None:
+            return
+
+        self._training_frames = frames
+
+        self._commands_holder_train.compiled_commands = (
+            self._package.select_training_frames(
+                self._commands_holder_train.compiled_commands, frames))
+
+        self._training_dataset = self._package.select_training_frames(
+            self._training_dataset, frames)
+
+    def __select_step_size(self) -> None:
+        """
+        Let the package trim the step size to the parameters the errors
+        are sensitive to if the package supports it
+
+        Returns
+        -------
+        None
+        """
+
+        if not hasattr(self._package, 'select_step_size'):
+            return
+
+        step_size = self._package.select_step_size(
+            self._commands_holder_train, self._training_dataset,
+            self._package_setting_train, self._parameters, self._step_size,
+            self._constraints)
+
+        if step_size is not None:
+            self._step_size = step_size
+
+    def __prepare_commands_holder(self) -> None:
+        """
+        Let the package prepare the commands holder for training, e.g.
+        select the evaluator, if the package supports it
+
+        Returns
+        -------
+        None
+        """
+
+        if hasattr(self._package, 'prepare_commands_holder'):
+            self._package.prepare_commands_holder(
+                self._commands_holder_train, self._package_setting_train,
+                self._parameters)
+
     def _evaluate_fitness(self, calculated_values: dict,
                           training_datas: dict,
                           settings: Optional[dict]=None) -> Any:
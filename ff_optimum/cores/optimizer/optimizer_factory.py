@@ -1,6 +1,14 @@
 # -*- coding: utf-8 -*-
-from ff_optimum.cores.utilities import ConfigReader
+import importlib
+from typing import Optional
 
+from ff_optimum.cores.utilities import (
+    ConfigReader, EvaluationClient, EventLogger, file_create_directory,
+    file_set_path, is_worker_pool_ready, set_worker_pool)
+
+from .evolution_strategy import (
+    CovarianceMatrixAdaptationEvolutionStrategyOptimizer)
+from .island_model import IslandModelOptimizer
 from .simulated_annealing import (
     DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer,
     SimulatedAnnealingOptimizer)
@@ -8,6 +16,8 @@ from .simulated_annealing import (
 
 __all__ = ['OptimizerFactory']
 
+logger = EventLogger(__name__)
+
 
 class OptimizerFactory(object):
 
@@ -17,6 +27,12 @@ class OptimizerFactory(object):
     Methods
     -------
     create_optimizer_from_config(config_path)
+
+    resume_optimizer_from_checkpoint(config_path, checkpoint_path)
+
+    create_island_from_config(config_path, index, frames, step_size)
+
+    create_job_from_config(config_path, index)
     """
 
     @classmethod
@@ -41,29 +57,302 @@ class OptimizerFactory(object):
         config_reader.config_reader.ConfigReader
         """
 
+        return cls.__create_optimizer(ConfigReader(config_path), config_path)
+
+    @classmethod
+    def resume_optimizer_from_checkpoint(
+            cls, config_path: str,
+            checkpoint_path: Optional[str]=None) -> object:
+        """
+        Create the optimizer from the config and restore the state of the
+        run from the checkpoint, calling optimize of the optimizer continues
+        from the last completed temperature step
+
+        Parameters
+        ----------
+        config_path
+              string contain the file path of the config file
+
+        checkpoint_path
+              string contain the file path of the checkpoint, the checkpoint
+              in the output directory of the config is used if it is None
+
+        Returns
+        -------
+        Optimizer
+              Optimizer object base on the config and the checkpoint
+
+        Raises
+        ValueError
+              If the algorithm is not found or the checkpoint is saved by
+              another algorithm
+
+        See Also
+        --------
+        config_reader.config_reader.ConfigReader
+        SimulatedAnnealingBase._save_checkpoint
+        """
+
+        reader = ConfigReader(config_path)
+
+        if checkpoint_path is None:
+            checkpoint_path = file_set_path(
+                reader.output_directory,
+                reader.alogrithm_parameters.get('checkpoint_file',
+                                                'checkpoint.pkl'))
+
+        reader.alogrithm_parameters['resume_from'] = checkpoint_path
+
+        return cls.__create_optimizer(reader, config_path)
+
+    @classmethod
+    def create_island_from_config(cls, config_path: str, index: int,
+                                  frames: Optional[dict]=None,
+                                  step_size: Optional[object]=None
+                                  ) -> object:
+        """
+        Create the optimizer of one island of the island model, the island
+        writes its outputs and its temporary files to the directory
+        island_{index} inside the output directory
+
+        The optimization level of the island is picked from levels and the
+        island evaluates with the profile picked from profiles in the
+        islands section of the algorithm parameters, the island evaluates
+        serially if profiles are not given
+
+        Parameters
+        ----------
+        config_path
+              string contain the file path of the config file
+
+        index
+              index of the island
+
+        frames
+              training frames selected by the island model, selected by the
+              island if None
+
+        step_size
+              step size selected by the island model, selected by the island
+              if None
+
+        Returns
+        -------
+        Optimizer
+              Optimizer object of the island
+
+        See Also
+        --------
+        island_model.IslandModelOptimizer
+        """
+
         reader = ConfigReader(config_path)
 
+        islands = reader.alogrithm_parameters.pop('islands')
+
+        directory = file_set_path(reader.output_directory, f'island_{index}')
+
+        file_create_directory(directory)
+
+        if islands.get('levels'):
+            reader.package_settings['level'] = (
+                islands['levels'][index % len(islands['levels'])])
+
+        if frames is not None:
+            reader.package_settings['training_frames'] = frames
+
+        if step_size is not None:
+            reader.package_settings['step_size'] = step_size
+
+        number_of_processors, profile = 1, None
+
+        if islands.get('profiles'):
+
+            number_of_processors = max(1, reader.number_of_processors //
+                                       len(islands['profiles']))
+
+            profile = islands['profiles'][index % len(islands['profiles'])]
+
+        package = importlib.import_module(f'ff_optimum.user_packages.'
+                                          f'{reader.package_name.lower()}')
+
+        if hasattr(package, 'relocate_commands_holder'):
+            package.relocate_commands_holder(reader.commands_holder_train,
+                                             directory)
+        else:
+            logger.warning(f'Temporary directory of {reader.package_name} '
+                           f'is shared by the islands')
+
+        return cls.__create_optimizer(
+            reader, None, (number_of_processors, profile), directory)
+
+    @classmethod
+    def create_job_from_config(cls, config_path: str, index: int) -> object:
+        """
+        Create the optimizer of one job of the job runner, the job evaluates
+        by the worker pool shared by the jobs instead of its own ipyparallel
+        cluster and writes its temporary files to the directory job_{index}
+        inside the temporary directory of the config
+
+        Parameters
+        ----------
+        config_path
+              string contain the file path of the config file
+
+        index
+              index of the job
+
+        Returns
+        -------
+        Optimizer
+              Optimizer object of the job
+
+        See Also
+        --------
+        job_runner.JobRunner
+        """
+
+        reader = ConfigReader(config_path)
+
+        if reader.alogrithm_parameters.pop('islands', None):
+            logger.warning(f'Islands of job {index} are not supported by '
+                           f'the job runner, the job runs one island')
+
+        package = importlib.import_module(f'ff_optimum.user_packages.'
+                                          f'{reader.package_name.lower()}')
+
+        directory = file_set_path(
+            reader.commands_holder_train.temp_directory, f'job_{index}')
+
+        file_create_directory(directory)
+
+        if hasattr(package, 'relocate_commands_holder'):
+            package.relocate_commands_holder(reader.commands_holder_train,
+                                             directory)
+        else:
+            logger.warning(f'Temporary directory of {reader.package_name} '
+                           f'is shared by the jobs')
+
+        return cls.__create_optimizer(reader, None, (1, None))
+
+    @staticmethod
+    def __create_optimizer(
+            reader: ConfigReader, config_path: Optional[str]=None,
+            processors_setting: Optional[tuple]=None,
+            output_directory: Optional[str]=None) -> object:
+        """
+        Parameters
+        ----------
+        reader
+              ConfigReader object of the config file
+
+        config_path
+              string contain the file path of the config file, the island
+              model is created from it if the islands are set
+
+        processors_setting
+              number of processors and profile replacing the ones of the
+              config
+
+        output_directory
+              output directory replacing the one of the config
+
+        Returns
+        -------
+        Optimizer
+              Optimizer object base on the config
+
+        Raises
+        ValueError
+              If the algorithm is not found
+        """
+
         mosa = 'dominance_based_multiobjective_simulated_annealing'
 
-        if mosa in reader.algorithm_name:
+        number_of_processors, profile = (
+            processors_setting or (reader.number_of_processors,
+                                   reader.profile))
+
+        if (reader.server and not is_worker_pool_ready() and
+                OptimizerFactory.__connect_server(reader.server)):
+            number_of_processors, profile = 1, None
+
+        output_directory = output_directory or reader.output_directory
+
+        if (config_path is not None and
+                'simulated_annealing' in reader.algorithm_name and
+                reader.alogrithm_parameters.get('islands')):
+            return IslandModelOptimizer(
+                config_path, reader.algorithm_name,
+                reader.package_name, reader.package_settings,
+                reader.param_initial_values,
+                reader.constraints_source, reader.constraints_input,
+                reader.commands_holder_train, reader.training_data,
+                reader.plot_information, reader.alogrithm_parameters,
+                output_directory)
+
+        elif mosa in reader.algorithm_name:
             return DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
-                reader.number_of_processors, reader.profile,
+                number_of_processors, profile,
                 reader.package_name, reader.package_settings,
                 reader.param_initial_values,
                 reader.constraints_source, reader.constraints_input,
                 reader.commands_holder_train, reader.training_data,
                 reader.plot_information, reader.alogrithm_parameters,
-                reader.output_directory)
+                output_directory)
 
         elif 'simulated_annealing' in reader.algorithm_name:
             return SimulatedAnnealingOptimizer(
-                reader.number_of_processors, reader.profile,
+                number_of_processors, profile,
+                reader.package_name, reader.package_settings,
+                reader.param_initial_values,
+                reader.constraints_source, reader.constraints_input,
+                reader.commands_holder_train, reader.training_data,
+                reader.plot_information, reader.alogrithm_parameters,
+                output_directory)
+
+        elif reader.algorithm_name in ('cma_es', 'covariance_matrix_'
+                                       'adaptation_evolution_strategy'):
+            return CovarianceMatrixAdaptationEvolutionStrategyOptimizer(
+                number_of_processors, profile,
                 reader.package_name, reader.package_settings,
                 reader.param_initial_values,
                 reader.constraints_source, reader.constraints_input,
                 reader.commands_holder_train, reader.training_data,
                 reader.plot_information, reader.alogrithm_parameters,
-                reader.output_directory)
+                output_directory)
 
         else:
             raise ValueError('No such algorithm')
+
+    @staticmethod
+    def __connect_server(server: dict) -> bool:
+        """
+        Connect to the evaluation server, the evaluations of the process
+        are sent to the server afterward
+
+        Parameters
+        ----------
+        server
+              dictionary containing the address and the authkey of the
+              evaluation server
+
+        Returns
+        -------
+        connected
+              False if the server is not reachable, the evaluations are then
+              computed by the process
+        """
+
+        try:
+            set_worker_pool(EvaluationClient(server['address'],
+                                             server.get('authkey', None)))
+
+        except OSError as e:
+
+            logger.warning(f'Evaluation server {server["address"]} is not '
+                           f'reachable, evaluating locally: {e}')
+
+            return False
+
+        return True
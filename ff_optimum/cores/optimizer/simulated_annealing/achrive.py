@@ -7,7 +7,8 @@ import numpy as np
 
 from ff_optimum.cores.compute_builtin import Fitness
 from ff_optimum.cores.utilities import (
-    EventLogger, file_set_path, get_client, is_client_ready)
+    EventLogger, file_set_path, get_client, is_client_ready,
+    save_parameters_snapshot)
 
 __all__ = ['Achrive']
 
@@ -30,6 +31,11 @@ class Achrive(object):
     __number_of_save: int
         count of number of save
 
+    __save_format: str
+        'snapshot' for saving the solutions to one binary snapshot per save,
+        'text' for saving one parameters file and one fitness file
+        per solution
+
     Methods
     -------
     capacity
@@ -38,11 +44,16 @@ class Achrive(object):
     push_solution
     pop_dominated_solution
     dimension_reduction
+    get_solutions
     """
 
-    __slots__ = ['__capacity', '__solutions', '__number_of_save']
+    __slots__ = ['__capacity', '__solutions', '__number_of_save',
+                 '__save_format']
+
+    def __init__(self, capacity: int=50, save_format: str='snapshot'):
 
-    def __init__(self, capacity: int=50):
+        if save_format not in ('snapshot', 'text'):
+            raise ValueError(f'Unknown achrive format: {save_format}')
 
         self.__capacity = capacity
 
@@ -50,6 +61,8 @@ class Achrive(object):
 
         self.__number_of_save = 0
 
+        self.__save_format = save_format
+
     @property
     def capacity(self) -> int:
         return self.__capacity
@@ -401,6 +414,20 @@ class Achrive(object):
 
         return objectives_names_to_be_poped
 
+    def get_solutions(self) -> list:
+        """
+        Get the solutions with parameters, the attainment elements are not
+        included
+
+        Returns
+        -------
+        solutions
+            list of the solutions
+        """
+
+        return [solution for solution in self.__solutions
+                if solution.get('parameter', None) is not None]
+
     def count_being_dominated_in_achrive(self, fitness: Fitness) -> int:
         """
         See Also
@@ -551,11 +578,12 @@ class Achrive(object):
         Returns
         -------
         None
-        """
-
-        count = 0
 
-        directory = file_set_path(directory, f'save_{self.__number_of_save}')
+        See Also
+        --------
+        Achrive.__dump_parameters_to_snapshot
+        Achrive.__dump_parameters_to_text
+        """
 
         solutions_copy = [solution for solution in self.__solutions]
 
@@ -566,6 +594,81 @@ class Achrive(object):
         if self.get_achrive_size == 0:
             self.__solutions = solutions_copy
 
+        if self.__save_format == 'snapshot':
+            count = self.__dump_parameters_to_snapshot(
+                package, file_set_path(directory,
+                                       f'save_{self.__number_of_save}.npz'))
+        else:
+            count = self.__dump_parameters_to_text(
+                package, file_set_path(directory,
+                                       f'save_{self.__number_of_save}'))
+
+        logger.info(f'Number of solution saved: {count}')
+
+        self.__number_of_save += 1
+
+    def __dump_parameters_to_snapshot(self, package: callable,
+                                      file_path: str) -> int:
+        """
+        Save the parameters and the fitness of the solutions to one snapshot
+
+        Parameters
+        ----------
+        package
+            module of the user package
+
+        file_path
+            file path of the snapshot
+
+        Returns
+        -------
+        count
+            number of solutions saved
+
+        See Also
+        --------
+        cores.utilities.parameters_snapshot.save_parameters_snapshot
+        cores.utilities.parameters_snapshot.export_parameters_snapshot
+        """
+
+        solutions = [solution for solution in self.__solutions
+                     if solution.get('parameter', None) is not None]
+
+        if not solutions:
+            return 0
+
+        save_parameters_snapshot(
+            file_path,
+            np.vstack([package.flatten_parameters(solution['parameter'])
+                       for solution in solutions]),
+            package.get_parameters_layout(solutions[0]['parameter']),
+            np.vstack([solution['fitness'].objectives_values
+                       for solution in solutions]),
+            solutions[0]['fitness'].objectives_names)
+
+        return len(solutions)
+
+    def __dump_parameters_to_text(self, package: callable,
+                                  directory: str) -> int:
+        """
+        Save the parameters and the fitness of each solution to files
+
+        Parameters
+        ----------
+        package
+            module of the user package
+
+        directory
+            file directory of the parameters to be saved
+
+        Returns
+        -------
+        count
+            number of solutions saved
+        """
+
+        count = 0
+
         for solution in self.__solutions:
 
             parameters = solution.get('parameter', None)
@@ -583,21 +686,18 @@ class Achrive(object):
 
                 with open(fitness_path, 'w+') as fp:
 
-                    np.set_printoptions(
-                        formatter={'float_kind': lambda x: '%8.6f' % x})
-
                     for name in fitness.objectives_names:
                         fp.write(f'{name} ')
                     fp.write('\n')
-                    fp.write(str(fitness.objectives_values))
+                    fp.write(np.array2string(
+                        fitness.objectives_values,
+                        formatter={'float_kind': lambda x: '%8.6f' % x}))
 
                 count += 1
 
                 logger.info(f'Save achrive to {file_path} sucess')
 
-        logger.info(f'Number of solution saved: {count}')
-
-        self.__number_of_save += 1
+        return count
 
 
 def generate_attainment_surface_one(
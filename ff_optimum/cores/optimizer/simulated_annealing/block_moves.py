@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+from typing import Optional
+
+import numpy as np
+
+from ff_optimum.cores.utilities import EventLogger
+
+__all__ = ['ParameterBlocks']
+
+logger = EventLogger(__name__)
+
+SIGNIFICANCE_LEVEL = 0.05
+
+
+class ParameterBlocks(object):
+
+    """
+    Class holding the blocks of the parameters moved jointly by one trial
+    and drawing the correlated moves of the blocks
+
+    A move of a block is the relative change of its parameters in units of
+    their step sizes, i.e. every component is in [-1, 1] as the move of a
+    single parameter. The moves of a block are drawn uncorrelated until the
+    block is accepted, then drawn from the correlation of the accepted
+    moves shrunk toward the prior correlation of the block.
+
+    If the blocks are learned, the relative changes of all the parameters
+    between the temperature steps are recorded and the parameters whose
+    changes are correlated more than the correlation threshold are merged
+    into blocks of at most maximum_size parameters. The correlation of the
+    changes is the prior correlation of the learned blocks. A correlation
+    is only used if it is significant among all the pairs of the
+    parameters, i.e. larger than sqrt(2 ln(2 m / SIGNIFICANCE_LEVEL) /
+    (n - 1)) for m pairs and n changes, which bounds the probability of
+    merging any uncorrelated pair by SIGNIFICANCE_LEVEL.
+
+    Attributes
+    ----------
+    __blocks: list
+        list of the positions of the parameters of every block
+
+    __learn: bool
+        whether the blocks are learned from the changes between the
+        temperature steps
+
+    __minimum_moves: int
+        number of accepted moves weighted equally with the prior
+
+    __correlation: float
+        threshold of the correlation for merging the parameters
+
+    __maximum_size: int
+        maximum number of parameters of a learned block
+
+    __capacity: int
+        maximum number of the stored moves and changes
+
+    __priors: list
+        prior correlation of every block
+
+    __moves: list
+        accepted moves of every block
+
+    __changes: list
+        relative changes of all the parameters between the temperature
+        steps
+
+    Methods
+    -------
+    draw(number)
+        draw the move of a block
+
+    record(number, move)
+        store an accepted move of a block
+
+    record_change(change)
+        store the relative change of all the parameters of a step
+
+    regroup()
+        learn the blocks from the stored changes
+
+    get_state()
+        get the blocks and the stored moves for the checkpoint
+
+    set_state(state)
+        restore the blocks and the stored moves from the checkpoint
+    """
+
+    __slots__ = ['__blocks', '__learn', '__minimum_moves', '__correlation',
+                 '__maximum_size', '__capacity', '__priors', '__moves',
+                 '__changes']
+
+    def __init__(self, blocks: list, learn: bool=False,
+                 minimum_moves: int=10, correlation: float=0.5,
+                 maximum_size: int=4, capacity: int=100) -> None:
+
+        self.__learn = learn
+
+        self.__minimum_moves = minimum_moves
+
+        self.__correlation = correlation
+
+        self.__maximum_size = maximum_size
+
+        self.__capacity = capacity
+
+        self.__changes = []
+
+        self.__set_blocks(blocks, [np.eye(len(block)) for block in blocks])
+
+    @property
+    def blocks(self) -> list:
+        return self.__blocks
+
+    def __set_blocks(self, blocks: list, priors: list) -> None:
+
+        self.__blocks, self.__priors = blocks, priors
+
+        self.__moves = [[] for _ in blocks]
+
+    def draw(self, number: int) -> np.ndarray:
+        """
+        Draw the move of a block
+
+        Parameters
+        ----------
+        number
+            number of the block
+
+        Returns
+        -------
+        move
+            relative change of the parameters in units of their step sizes
+        """
+
+        size = len(self.__blocks[number])
+
+        moves = self.__moves[number]
+
+        if size == 1 or not moves and np.allclose(self.__priors[number],
+                                                  np.eye(size)):
+            return np.random.uniform(-1, 1, size)
+
+        weight = len(moves) / (len(moves) + self.__minimum_moves)
+
+        correlation = (1 - weight) * self.__priors[number]
+
+        if moves:
+            correlation = correlation + weight * self.__get_correlation(
+                np.array(moves))
+
+        cholesky = np.linalg.cholesky(correlation + 1.0e-8 * np.eye(size))
+
+        return np.clip(cholesky.dot(np.random.randn(size)) / np.sqrt(3),
+                       -1, 1)
+
+    def record(self, number: int, move: np.ndarray) -> None:
+        """
+        Store an accepted move of a block, the oldest move is dropped when
+        the capacity is reached
+
+        Parameters
+        ----------
+        number
+            number of the block
+
+        move
+            accepted move
+
+        Returns
+        -------
+        None
+        """
+
+        moves = self.__moves[number]
+
+        moves.append(move)
+
+        if len(moves) > self.__capacity:
+            del moves[0]
+
+    def record_change(self, change: np.ndarray) -> None:
+        """
+        Store the relative change of all the parameters in units of their
+        step sizes between two temperature steps
+
+        Parameters
+        ----------
+        change
+            relative change in the order of next_parameter_generator
+
+        Returns
+        -------
+        None
+        """
+
+        if not self.__learn:
+            return
+
+        self.__changes.append(change)
+
+        if len(self.__changes) > self.__capacity:
+            del self.__changes[0]
+
+    def regroup(self) -> bool:
+        """
+        Learn the blocks from the correlation of the stored changes, the
+        most correlated parameters are merged first, the correlations below
+        the significance threshold of the number of changes are ignored
+
+        Returns
+        -------
+        regrouped
+            True if the blocks are changed
+        """
+
+        if not self.__learn or len(self.__changes) < self.__minimum_moves:
+            return False
+
+        correlation = self.__get_correlation(np.array(self.__changes))
+
+        size = correlation.shape[0]
+
+        threshold = max(self.__correlation, self.__get_significance_threshold(
+            len(self.__changes), size * (size - 1) // 2))
+
+        group = list(range(size))
+
+        members = {position: [position] for position in range(size)}
+
+        upper = np.triu_indices(size, 1)
+
+        strength = np.abs(correlation[upper])
+
+        for order in np.argsort(-strength):
+
+            if strength[order] < threshold:
+                break
+
+            first, second = (group[upper[0][order]],
+                             group[upper[1][order]])
+
+            if (first == second or len(members[first]) +
+                    len(members[second]) > self.__maximum_size):
+                continue
+
+            members[first].extend(members.pop(second))
+
+            for position in members[first]:
+                group[position] = first
+
+        blocks = sorted(sorted(block) for block in members.values())
+
+        if blocks == self.__blocks:
+            return False
+
+        self.__set_blocks(blocks, [correlation[np.ix_(block, block)]
+                                   for block in blocks])
+
+        logger.info(f'Blocks learned, number of blocks: {len(blocks)} '
+                    f'largest block: {max(len(b) for b in blocks)}')
+
+        return True
+
+    @staticmethod
+    def __get_significance_threshold(number_of_samples: int,
+                                     number_of_pairs: int) -> float:
+        """
+        Compute the correlation exceeded by any of the uncorrelated pairs
+        with a probability of at most SIGNIFICANCE_LEVEL, from the tail
+        bound 2 exp(-(n - 1) r^2 / 2) of the sample correlation and the
+        union bound over the pairs
+
+        Parameters
+        ----------
+        number_of_samples
+            number of the samples of the correlation
+
+        number_of_pairs
+            number of the pairs tested
+
+        Returns
+        -------
+        threshold
+            significant absolute correlation, larger than 1 if no
+            correlation is significant
+        """
+
+        if number_of_samples < 2 or number_of_pairs < 1:
+            return np.inf
+
+        return np.sqrt(2 * np.log(2 * number_of_pairs / SIGNIFICANCE_LEVEL) /
+                       (number_of_samples - 1))
+
+    @staticmethod
+    def __get_correlation(samples: np.ndarray) -> np.ndarray:
+        """
+        Compute the correlation of the samples, the correlation of the
+        components without variance is zero
+
+        Parameters
+        ----------
+        samples
+            one sample per row
+
+        Returns
+        -------
+        correlation
+        """
+
+        deviation = samples - samples.mean(axis=0)
+
+        scale = np.sqrt(np.square(deviation).sum(axis=0))
+
+        scale[scale == 0] = np.inf
+
+        normalized = deviation / scale
+
+        correlation = normalized.T.dot(normalized)
+
+        np.fill_diagonal(correlation, 1)
+
+        return correlation
+
+    def get_state(self) -> dict:
+        return {'blocks': self.__blocks, 'priors': self.__priors,
+                'moves': self.__moves, 'changes': self.__changes}
+
+    def set_state(self, state: Optional[dict]) -> None:
+
+        if state is None:
+            return
+
+        self.__blocks, self.__priors = state['blocks'], state['priors']
+
+        self.__moves, self.__changes = state['moves'], state['changes']
@@ -32,10 +32,21 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
     save_parameters_to_file
         save the solution in the achrive to file
 
+    get_solutions
+        get the solutions in the achrive
+
     """
 
     __slots__ = ['__achrive']
 
+    _SCREENING_MOLECULES_SUPPORTED = False
+
+    _MINIBATCH_SUPPORTED = False
+
+    _SURROGATE_SUPPORTED = False
+
+    _RESPONSE_MODEL_SUPPORTED = False
+
     def __init__(self, number_of_processors: int, profile: str,
                  package_name: str, package_settings: dict,
                  parameters: Union[dict, np.ndarray],
@@ -56,11 +67,22 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
 
         __achrive_size = alogrithm_parameters.get('achrive_size', 50)
 
+        __achrive_format = alogrithm_parameters.get('achrive_format',
+                                                    'snapshot')
+
         logger.info(f'Achrive size: {__achrive_size}')
 
-        self.__achrive = Achrive(__achrive_size)
+        logger.info(f'Achrive format: {__achrive_format}')
+
+        if self._resume_state is None:
+
+            self.__achrive = Achrive(__achrive_size, __achrive_format)
+
+            self.__fill_achrive(
+                alogrithm_parameters.get('reduction', ["", 0]))
 
-        self.__fill_achrive(alogrithm_parameters.get('reduction', ["", 0]))
+        else:
+            self.__achrive = self._resume_state['state']['achrive']
 
     def optimize(self) -> None:
         """
@@ -75,9 +97,18 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
         _one_epoch
         """
 
-        for epoch in range(self._number_of_epoch):
+        for epoch in range(self._current_epoch, self._number_of_epoch):
+
+            self._current_epoch = epoch
+
             self._one_epoch()
 
+            self._completed_steps = 0
+
+            if (epoch + 1 >= self._number_of_epoch or
+                    self._is_budget_exhausted()):
+                break
+
     def _one_epoch(self):
         """
         run one epoch of optimization
@@ -92,39 +123,50 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
             object containing non-dominated solutions
         """
 
-        next_parameter_generator = self._package.next_parameter_generator
+        state = self._resume_from_checkpoint()
+
+        if state is None:
 
-        logger.info(f'Optimization starts')
+            logger.info(f'Optimization starts')
 
-        current_parameters_value = copy.deepcopy(self._parameters)
+            current_parameters_value = copy.deepcopy(self._parameters)
 
-        __calcaulated_values = (
-            self._commands_holder_train.execute_commands(
-                current_parameters_value))
+            current_fitness = self._evaluate_parameters(
+                current_parameters_value)
 
-        current_fitness = self._evaluate_fitness(
-            __calcaulated_values, self._training_dataset)
+            consecutive_stop = 0
+
+        else:
 
-        consecutive_stop = 0
+            logger.info('Optimization resumes')
 
-        for current_temperature, step in self._temperature_generator():
+            current_parameters_value = state['current_parameters']
+
+            current_fitness = state['current_fitness']
+
+            consecutive_stop = state['consecutive_stop']
+
+        for current_temperature, step in self._temperature_generator(
+                self._completed_steps):
 
             logger.info(f'Temperature: {current_temperature:.4f}')
 
             number_of_acceptance, number_of_trial = 0, 0
 
-            for idx, parameter, step_size, constraint in (
-                next_parameter_generator(
-                    current_parameters_value, self._step_size,
-                    self._constraints, True)):
+            number_of_no_change = 0
+
+            for number, block in self._parameter_block_generator(
+                    current_parameters_value):
 
                 number_of_trial += 1
 
                 accepted, current_parameters_value, current_fitness = (
                     self.__one_move(current_parameters_value,
-                                    current_fitness, idx,
-                                    current_temperature, parameter,
-                                    step_size, constraint))
+                                    current_fitness, number, block,
+                                    current_temperature))
+
+                for position, *_ in block:
+                    self._record_step_acceptance(position, accepted)
 
                 logger.info(f'Temperature: {current_temperature} '
                             f'Step: {step} '
@@ -133,9 +175,22 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
 
                 logger.info(f'{current_fitness.objectives_values}')
 
-                if accepted:
+                if accepted is None:
+                    number_of_no_change += 1
+
+                elif accepted:
                     number_of_acceptance += 1
 
+            logger.info(f'Temperature: {current_temperature} '
+                        f'Step: {step} '
+                        f'Number of trial: {number_of_trial} '
+                        f'Number of acceptance: {number_of_acceptance} '
+                        f'Number of no change: {number_of_no_change}')
+
+            self._log_screening_statistics()
+
+            self._log_qeq_statistics()
+
             if number_of_acceptance == 0:
 
                 consecutive_stop += 1
@@ -148,69 +203,113 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
             else:
                 consecutive_stop = 0
 
-            if self._beta is None or self._beta < 1e-9:
-                self._find_beta(number_of_trial, self._changes_in_error)
+            if ((self._beta is None or self._beta < 1e-9) and
+                    number_of_trial > number_of_no_change):
+                self._find_beta(number_of_trial - number_of_no_change,
+                                self._changes_in_error)
+
+            self._update_temperature(number_of_acceptance)
+
+            self._completed_steps += 1
+
+            self._adapt_step_sizes()
+
+            self._update_blocks(current_parameters_value)
+
+            self.__receive_immigrants()
+
+            # the schedule is planned by the budget before it is saved
+            exhausted = self._is_budget_exhausted(current_temperature)
+
+            self._save_checkpoint({
+                'current_parameters': current_parameters_value,
+                'current_fitness': current_fitness,
+                'consecutive_stop': consecutive_stop,
+                'achrive': self.__achrive})
+
+            if exhausted:
+                break
 
         logger.info('Optimization finishes')
 
         return self.__achrive
 
     def __one_move(self, current_parameters_value: np.ndarray,
-                   current_fitness: object, idx: int,
-                   current_temperature: float,
-                   parameter: np.ndarray, step_size: float,
-                   constraint: tuple) -> Union[bool, np.ndarray, float]:
+                   current_fitness: object, number: int, block: list,
+                   current_temperature: float
+                   ) -> Union[bool, np.ndarray, float]:
         """
-        Move one parameter and then evaluate fitness.
+        Move one parameter or one block of the parameters jointly and then
+        evaluate fitness.
         If the number of being dominated in the achrive is lower than
         the current solution, or the new solution is accepted by the
         metrophoils criterion, update the current solution as new solution
         Add the new parameter set to the achrive if it is not dominated
         by any solution in the achrive
 
+        If the trials are screened, the dominance of the screening fitness
+        decides first, only the trial accepted by the screening is
+        evaluated in full, both decisions share one random number
+
         Parameters
         ----------
         current_parameters_value
             the whole current parameter set
         current_fitness
             fitness value of the current solution
-        idx
-            index of the parameter inside the array
+        number
+            number of the block
+        block
+            block from _parameter_block_generator
         current_temperature
             current temperature for metrophils criterion
-        parameter
-            the array of parameter to be moved
-        step_size
-            step size of the parameter
-        constraint
-            maximum and minimum value of the parameter
 
         Returns
         -------
         accepted
-            whether the solution is accepted by metorphoils criterion
+            whether the solution is accepted by metorphoils criterion,
+            None if the move does not change the written parameters and
+            the trial is resolved without evaluation
         current_parameters_value
             the updated parameter set
         current_fitness
             the updated fitness
         """
 
-        rollback_value = parameter[idx]
+        rollback_values = [parameter[idx] for _, idx, parameter, _, _ in block]
 
-        parameter[idx] *= 1 + (np.random.uniform(-1, 1) * step_size)
+        if not self._perturb_block(number, block):
+            return None, current_parameters_value, current_fitness
 
-        parameter[idx] = min(max(parameter[idx], constraint[0]),
-                             constraint[1])
+        current_energy = self.__achrive.count_being_dominated_in_achrive(
+            current_fitness)
 
-        new_calculated_value = (
-            self._commands_holder_train.execute_commands(
-                current_parameters_value))
+        random_number = None
 
-        new_fitness = self._evaluate_fitness(new_calculated_value,
-                                             self._training_dataset)
+        if self._is_screening():
 
-        current_energy = self.__achrive.count_being_dominated_in_achrive(
-            current_fitness)
+            random_number = np.random.rand()
+
+            screening_energy = (
+                self.__achrive.count_being_dominated_in_achrive(
+                    self._evaluate_parameters(current_parameters_value,
+                                              screening=True)))
+
+            change_in_energy = ((screening_energy - current_energy) /
+                                self.__achrive.get_achrive_size())
+
+            self._screening_statistics['screened'] += 1
+
+            if (self._beta is None or self._beta < 1e-9 or
+                    self._is_adaptive_cooling()):
+                self._changes_in_error.append(change_in_energy)
+
+            if not self._metropolis_criteria(
+                    change_in_energy, current_temperature, random_number):
+                self._restore_block(block, rollback_values)
+                return False, current_parameters_value, current_fitness
+
+        new_fitness = self._evaluate_parameters(current_parameters_value)
 
         new_energy = self.__achrive.count_being_dominated_in_achrive(
             new_fitness)
@@ -218,12 +317,18 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
         change_in_energy = ((new_energy - current_energy) /
                             self.__achrive.get_achrive_size())
 
-        accepted = self._metropolis_criteria(change_in_energy,
-                                             current_temperature)
+        accepted = self._metropolis_criteria(
+            change_in_energy, current_temperature, random_number)
 
-        if self._beta is None or self._beta < 1e-9:
+        if self._is_screening():
+            self._record_promotion(accepted)
+
+        elif (self._beta is None or self._beta < 1e-9 or
+              self._is_adaptive_cooling()):
             self._changes_in_error.append(change_in_energy)
 
+        self._record_block_move(number, block, accepted)
+
         if accepted:
 
             current_fitness = new_fitness
@@ -243,16 +348,48 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
                 self.__achrive.generate_attainment_surface()
 
         else:
-            parameter[idx] = rollback_value
+            self._restore_block(block, rollback_values)
 
         return accepted, current_parameters_value, current_fitness
 
+    def __receive_immigrants(self) -> None:
+        """
+        Exchange the solutions of the achrive with the other islands, the
+        immigrants not dominated by the achrive are added to the achrive
+
+        Returns
+        -------
+        None
+        """
+
+        immigrants = self._exchange_solutions(self.__achrive.get_solutions())
+
+        for solution in immigrants:
+
+            if (self.__achrive.count_being_dominated_in_achrive(
+                    solution['fitness']) or
+                    self.__achrive.is_inside_achrive(solution['parameter'],
+                                                     self._package)):
+                continue
+
+            logger.info('Immigrant is added to the achrive')
+
+            self.__achrive.pop_dominated_solution(solution)
+
+            self.__achrive.push_solution(solution)
+
+            self.__achrive.generate_attainment_surface()
+
+    def get_solutions(self) -> list:
+        return self.__achrive.get_solutions()
+
     def save_error_to_file(self):
         pass
 
     def save_parameters_to_file(self, filename: str) -> None:
         """
-        Save the parameters in the achrive to file
+        Save the parameters in the achrive to file, the adapted step sizes
+        are saved as well if the step sizes are adaptive
 
         Parameters
         ----------
@@ -271,9 +408,13 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
         self.__achrive.dump_parameters_to_file(
             self._package, self._output_directory)
 
+        self.save_step_sizes_to_file()
+
     def __fill_achrive(self, reduction: list, target_step: int=5) -> None:
         """
-        Fill in the achrive by running number of target step
+        Fill in the achrive by running number of target step, the
+        evaluations are counted by the budget and the filling stops when
+        the budget is exhausted
 
         Parameters
         ----------
@@ -291,6 +432,7 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
         --------
         __dimension_reduction
         Achrive.push_solution
+        SimulatedAnnealingBase._evaluate_parameters
         """
 
         logger.info('Start filling achrive')
@@ -306,16 +448,11 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
                     parameters, self._step_size,
                     self._constraints, True)):
 
-                parameter[idx] *= 1 + (np.random.uniform(-1, 1) * step_size)
-
-                parameter[idx] = min(max(parameter[idx], constraint[0]),
-                                     constraint[1])
+                if not self._perturb_parameter(parameter, idx, step_size,
+                                               constraint):
+                    continue
 
-                __calcaulated_values = (
-                    self._commands_holder_train.execute_commands(parameters))
-
-                fitness = self._evaluate_fitness(
-                    __calcaulated_values, self._training_dataset)
+                fitness = self._evaluate_parameters(parameters, full=True)
 
                 solution = {'parameter': copy.deepcopy(parameters),
                             'fitness': fitness}
@@ -324,6 +461,9 @@ class DominanceBasedMultiobjectiveSimulatedAnnealingOptimizer(
 
             logger.info('One step is computed')
 
+            if self._is_budget_exhausted():
+                break
+
         if reduction[1]:
             self.__dimension_reduction(reduction)
 
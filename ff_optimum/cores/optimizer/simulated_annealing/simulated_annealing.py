@@ -6,6 +6,8 @@ from typing import Any, Union
 import numpy as np
 
 from .simulated_annealing_base import SimulatedAnnealingBase
+from ff_optimum.cores.optimizer.levenberg_marquardt import (
+    LevenbergMarquardtRefinement)
 from ff_optimum.cores.utilities import EventLogger, file_set_path
 
 __all__ = ['SimulatedAnnealingOptimizer']
@@ -22,9 +24,13 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
     ----------
     __errors_trace: list
         List object contraining the error against temperature and steps
+
+    __refinement_options: dict
+        options of the Levenberg-Marquardt refinement after annealing,
+        None if the best parameters are not refined
     """
 
-    __slots__ = ['__errors_trace']
+    __slots__ = ['__errors_trace', '__refinement_options']
 
     def __init__(self, number_of_processors: int, profile: str,
                  package_name: str, package_settings: dict,
@@ -44,6 +50,9 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
 
         self.__errors_trace = list()
 
+        self.__refinement_options = algorithm_parameter.get('refinement',
+                                                            None)
+
     def optimize(self) -> Union[float, dict]:
         """
         Run the simulated annealing algorithm
@@ -59,37 +68,125 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
         See Also
         -------
         _one_epoch
+        __refine
         """
 
-        for epoch in range(self._number_of_epoch):
+        for epoch in range(self._current_epoch, self._number_of_epoch):
+
+            self._current_epoch = epoch
+
             best_err, best_param = self._one_epoch()
 
+            self._completed_steps = 0
+
+            if (epoch + 1 >= self._number_of_epoch or
+                    self._is_budget_exhausted()):
+                break
+
+        if self.__refinement_options and not self._is_budget_exhausted():
+            best_err, best_param = self.__refine(best_err, best_param)
+
         return best_err, best_param
 
+    def __refine(self, best_error: float,
+                 best_param_values: Any) -> Union[float, Any]:
+        """
+        Refine the best parameters by the Levenberg-Marquardt method, the
+        refined parameters are kept only if their error is smaller and the
+        annealed parameters are returned if the refinement fails
+
+        Parameters
+        ----------
+        best_error
+            error of the best parameters
+
+        best_param_values
+            best parameters searched by annealing
+
+        Returns
+        -------
+        best_error
+            error of the best parameters
+
+        best_param_values
+            best parameters after refinement
+
+        See Also
+        --------
+        cores.optimizer.levenberg_marquardt.LevenbergMarquardtRefinement
+        """
+
+        if not (hasattr(self._package, 'compute_values_batch') and
+                hasattr(self._package, 'compute_residuals')):
+            logger.warning(f'Refinement is not supported by '
+                           f'{self._package_name}')
+            return best_error, best_param_values
+
+        options = self.__refinement_options
+
+        refinement = LevenbergMarquardtRefinement(
+            self._package, self._commands_holder_train,
+            self._training_dataset, self._package_setting_train,
+            self._step_size, self._constraints,
+            int(options.get('max_iterations', 10)),
+            float(options.get('finite_difference', 1.0e-2)),
+            float(options.get('damping', 1.0e-3)),
+            float(options.get('tolerance', 1.0e-4)), self._budget)
+
+        try:
+            refined_param_values, _ = refinement.refine(best_param_values)
+
+            refined_error = self._evaluate_parameters(refined_param_values,
+                                                      full=True)
+
+        # the annealed parameters are kept whatever fails in the refinement
+        except Exception as e:
+            logger.warning(f'Refinement failed, annealing result is kept: '
+                           f'{e}')
+            return best_error, best_param_values
+
+        logger.info(f'Refinement finish error: {refined_error:.4f} '
+                    f'annealing error: {best_error:.4f}')
+
+        if refined_error >= best_error:
+            return best_error, best_param_values
+
+        self._parameters = copy.deepcopy(refined_param_values)
+
+        return refined_error, refined_param_values
+
     def __one_move(self, current_parameters_value: np.ndarray,
-                   current_fitness: float, idx: int,
-                   current_temperature: float,
-                   parameter: np.ndarray,
-                   step_size: float,
-                   constraint: tuple) -> Union[bool, np.ndarray, float]:
+                   current_fitness: float, number: int, block: list,
+                   current_temperature: float
+                   ) -> Union[bool, np.ndarray, float]:
         """
-        Move one of the parameter, evaluate the fitness and decide whether
-        the new set of parameters to be accepted or not
+        Move one of the parameter or one block of the parameters jointly,
+        evaluate the fitness and decide whether the new set of parameters
+        to be accepted or not
+
+        If the trials are pre-screened by the surrogate or the response
+        model, the new set of parameters is rejected without evaluation
+        when its predicted rejection is near certain. If the trials are
+        screened, the new set of parameters is evaluated by the cheap
+        screening first and only evaluated in full if it is accepted by the
+        screening. All the decisions share one random number
 
         Parameters
         ----------
         current_parameters_value: dict
         current_fitness: float
-        idx: int
+        number: int
+            number of the block
+        block: list
+            block from _parameter_block_generator
         current_temperature: float
-        parameter: dict
-        step_size: dict
-        constraint: dict
 
         Returns
         -------
         accepted
             True if the new set of parameters is accepted
+            None if the move does not change the written parameters and
+            the trial is resolved without evaluation
             Otherwise False
 
         current_parameters_value
@@ -101,39 +198,197 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
             Otherwise pervious fitness
         """
 
-        rollback_value = parameter[idx]
+        rollback_values = [parameter[idx] for _, idx, parameter, _, _ in block]
+
+        if not self._perturb_block(number, block):
+            return None, current_parameters_value, current_fitness
 
-        parameter[idx] *= 1 + (np.random.uniform(-1, 1) * step_size)
+        random_number, screening_fitness, prediction = None, None, None
 
-        parameter[idx] = min(max(parameter[idx], constraint[0]),
-                             constraint[1])
+        response_prediction = None
 
-        new_calculated_value = (
-            self._commands_holder_train.execute_commands(
-                current_parameters_value))
+        if (self._is_surrogate() or self._is_response_model() or
+                self._is_screening()):
+            random_number = np.random.rand()
 
-        new_fitness = self._evaluate_fitness(new_calculated_value,
-                                             self._training_dataset)
+        if self._is_surrogate():
+
+            rejected, prediction = self._is_rejection_predicted(
+                current_parameters_value, current_fitness,
+                current_temperature, random_number)
+
+            if rejected:
+                self._restore_block(block, rollback_values)
+                return False, current_parameters_value, current_fitness
+
+        if self._is_response_model():
+
+            rejected, response_prediction = self._is_rejection_by_response(
+                current_parameters_value, current_fitness,
+                current_temperature, random_number)
+
+            if rejected:
+                self._restore_block(block, rollback_values)
+                return False, current_parameters_value, current_fitness
+
+        if self._is_screening():
+
+            screening_fitness = self._evaluate_parameters(
+                current_parameters_value, screening=True)
+
+            change_in_energy = screening_fitness - self._screening_fitness
+
+            self._screening_statistics['screened'] += 1
+
+            if self._beta is None or self._is_adaptive_cooling():
+                self._changes_in_error.append(change_in_energy)
+
+            if not self._metropolis_criteria(
+                    change_in_energy, current_temperature, random_number):
+                self._restore_block(block, rollback_values)
+                return False, current_parameters_value, current_fitness
+
+        new_fitness = self._evaluate_parameters(current_parameters_value)
+
+        self._record_evaluation(current_parameters_value, new_fitness,
+                                prediction)
 
         change_in_energy = new_fitness - current_fitness
 
-        accepted = self._metropolis_criteria(change_in_energy,
-                                             current_temperature)
+        accepted = self._metropolis_criteria(
+            change_in_energy, current_temperature, random_number)
+
+        self._record_response(accepted, new_fitness, response_prediction)
+
+        if self._is_screening():
+            self._record_promotion(accepted, screening_fitness)
 
-        if self._beta is None:
+        elif self._beta is None or self._is_adaptive_cooling():
             self._changes_in_error.append(change_in_energy)
 
+        self._record_block_move(number, block, accepted)
+
         if accepted:
             current_fitness = new_fitness
         else:
-            parameter[idx] = rollback_value
+            self._restore_block(block, rollback_values)
 
         return accepted, current_parameters_value, current_fitness
 
+    def __receive_immigrants(
+            self, current_parameters_value: Any, current_error: float,
+            best_param_values: Any, best_error: float) -> tuple:
+        """
+        Exchange the best solution with the other islands, the current
+        solution moves to an immigrant better than the best solution of the
+        island. The immigrant is evaluated again so the screening, the
+        surrogate and the response model follow the move
+
+        Parameters
+        ----------
+        current_parameters_value
+            current parameters
+        current_error
+            current error
+        best_param_values
+            best parameters
+        best_error
+            best error
+
+        Returns
+        -------
+        current_parameters_value
+        current_error
+        best_param_values
+        best_error
+        """
+
+        immigrants = self._exchange_solutions([
+            {'parameter': best_param_values, 'fitness': best_error}])
+
+        if not immigrants:
+            return (current_parameters_value, current_error,
+                    best_param_values, best_error)
+
+        immigrant = min(immigrants, key=lambda solution: solution['fitness'])
+
+        if immigrant['fitness'] >= best_error:
+            return (current_parameters_value, current_error,
+                    best_param_values, best_error)
+
+        current_parameters_value = copy.deepcopy(immigrant['parameter'])
+
+        current_error = self._evaluate_parameters(current_parameters_value,
+                                                  full=True)
+
+        if self._is_screening():
+            self._screening_fitness = self._evaluate_parameters(
+                current_parameters_value, screening=True, full=True)
+
+        self._record_evaluation(current_parameters_value, current_error)
+
+        self._record_response(True)
+
+        logger.info(f'Immigrant is received, error: {current_error:.4f}')
+
+        if current_error < best_error:
+            best_param_values = copy.deepcopy(current_parameters_value)
+            best_error = current_error
+
+        return (current_parameters_value, current_error, best_param_values,
+                best_error)
+
+    def __evaluate_candidates_in_full(
+            self, candidates: list, best_param_values: Any,
+            best_error: float) -> Union[Any, float]:
+        """
+        Evaluate the candidates of the best solution found on the
+        mini-batches with all the frames, the best solution is replaced by
+        the candidate with a smaller error
+
+        Parameters
+        ----------
+        candidates
+            list of the candidate parameters
+
+        best_param_values
+            parameters of the best solution
+
+        best_error
+            error of the best solution evaluated with all the frames
+
+        Returns
+        -------
+        best_param_values
+            parameters of the best solution
+
+        best_error
+            error of the best solution evaluated with all the frames
+        """
+
+        for candidate in candidates:
+
+            error = self._evaluate_parameters(candidate, full=True)
+
+            if best_error > error:
+                best_param_values, best_error = candidate, error
+
+        logger.info(f'Full evaluation of {len(candidates)} candidates, '
+                    f'best error: {best_error:.4f}')
+
+        return best_param_values, best_error
+
     def _one_epoch(self):
         """
         Run one epoch of simulated annealing
 
+        If the trials are evaluated on mini-batches, the current error is
+        the error on the mini-batch of the temperature step. The accepted
+        solution with the smallest error of every temperature step is kept
+        as a candidate, the candidates and the current solution are
+        evaluated with all the frames periodically and the best error is
+        always the error with all the frames.
+
         Returns
         -------
         best_error
@@ -145,41 +400,78 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
         See Also
         --------
         __one_move
+        __evaluate_candidates_in_full
         """
 
         error_dictionary = {'Temperature': [], 'Step': [], 'Trial': [],
                             'Error': []}
 
+        candidates = []
+
         try:
 
-            next_parameter_generator = self._package.next_parameter_generator
+            state = self._resume_from_checkpoint()
 
-            current_parameters_value = copy.deepcopy(self._parameters)
+            if state is None:
 
-            current_calculated_value = (
-                self._commands_holder_train.execute_commands(
-                    current_parameters_value))
+                current_parameters_value = copy.deepcopy(self._parameters)
 
-            current_error = self._evaluate_fitness(current_calculated_value,
-                                                   self._training_dataset)
+                current_error = self._evaluate_parameters(
+                    current_parameters_value, full=True)
 
-            logger.info(f'Optimization starts, '
-                        f'initial error: {current_error:.4f}')
+                if self._is_screening():
+                    self._screening_fitness = self._evaluate_parameters(
+                        current_parameters_value, screening=True, full=True)
 
-            best_param_values = copy.deepcopy(current_parameters_value)
+                self._record_evaluation(current_parameters_value,
+                                        current_error)
 
-            best_error = current_error
+                self._record_response(True)
+
+                logger.info(f'Optimization starts, '
+                            f'initial error: {current_error:.4f}')
+
+                best_param_values = copy.deepcopy(current_parameters_value)
+
+                best_error = current_error
+
+            else:
+
+                current_parameters_value = state['current_parameters']
+
+                current_error = state['current_error']
+
+                best_param_values = state['best_parameters']
+
+                best_error = state['best_error']
 
-            for current_temperature, step in self._temperature_generator():
+                error_dictionary = state['error_dictionary']
+
+                self.__errors_trace = state['errors_trace']
+
+                candidates = state.get('minibatch_candidates', [])
+
+                logger.info(f'Optimization resumes, '
+                            f'current error: {current_error:.4f} '
+                            f'best error: {best_error:.4f}')
+
+            for current_temperature, step in self._temperature_generator(
+                    self._completed_steps):
 
                 logger.info(f'Temperature: {current_temperature:.4f}')
 
+                if self._is_minibatch():
+                    current_error = self._resample_minibatch(
+                        current_parameters_value)
+
+                step_candidate, step_candidate_error = None, None
+
                 number_of_acceptance, number_of_trial = 0, 0
 
-                for idx, parameter, step_size, constraint in (
-                    next_parameter_generator(
-                        current_parameters_value, self._step_size,
-                        self._constraints, True)):
+                number_of_no_change = 0
+
+                for number, block in self._parameter_block_generator(
+                        current_parameters_value):
 
                     if best_error < self._threshold:
                         raise StopIteration(
@@ -190,9 +482,11 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
 
                     accepted, current_parameters_value, current_error = (
                         self.__one_move(current_parameters_value,
-                                        current_error, idx,
-                                        current_temperature, parameter,
-                                        step_size, constraint))
+                                        current_error, number, block,
+                                        current_temperature))
+
+                    for position, *_ in block:
+                        self._record_step_acceptance(position, accepted)
 
                     error_dictionary['Temperature'].append(current_temperature)
 
@@ -206,11 +500,22 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
                                 f'Step: {step} Trial: {number_of_trial} '
                                 f'Error: {current_error:.4f}')
 
-                    if accepted:
+                    if accepted is None:
+
+                        number_of_no_change += 1
+
+                    elif accepted:
 
                         number_of_acceptance += 1
 
-                        if best_error > current_error:
+                        if self._is_minibatch():
+                            if (step_candidate_error is None or
+                                    step_candidate_error > current_error):
+                                step_candidate = copy.deepcopy(
+                                    current_parameters_value)
+                                step_candidate_error = current_error
+
+                        elif best_error > current_error:
                             if isinstance(best_param_values, np.ndarray):
                                 np.copyto(best_param_values,
                                           current_parameters_value)
@@ -220,8 +525,70 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
 
                             best_error = current_error
 
-                if self._beta is None:
-                    self._find_beta(number_of_trial, self._changes_in_error)
+                logger.info(f'Temperature: {current_temperature:.4f} '
+                            f'Step: {step} '
+                            f'Number of trial: {number_of_trial} '
+                            f'Number of acceptance: {number_of_acceptance} '
+                            f'Number of no change: {number_of_no_change}')
+
+                self._log_screening_statistics()
+
+                self._log_surrogate_statistics()
+
+                self._log_response_statistics()
+
+                self._log_qeq_statistics()
+
+                if (self._beta is None and
+                        number_of_trial > number_of_no_change):
+                    self._find_beta(number_of_trial - number_of_no_change,
+                                    self._changes_in_error)
+
+                self._update_temperature(number_of_acceptance)
+
+                self._completed_steps += 1
+
+                self._adapt_step_sizes()
+
+                self._update_blocks(current_parameters_value)
+
+                (current_parameters_value, current_error, best_param_values,
+                 best_error) = self.__receive_immigrants(
+                    current_parameters_value, current_error,
+                    best_param_values, best_error)
+
+                if step_candidate is not None:
+                    candidates.append(step_candidate)
+
+                if self._is_minibatch() and self._is_full_evaluation_due():
+
+                    best_param_values, best_error = (
+                        self.__evaluate_candidates_in_full(
+                            candidates + [
+                                copy.deepcopy(current_parameters_value)],
+                            best_param_values, best_error))
+
+                    candidates = []
+
+                # the schedule is planned by the budget before it is saved
+                exhausted = self._is_budget_exhausted(current_temperature)
+
+                self._save_checkpoint({
+                    'current_parameters': current_parameters_value,
+                    'current_error': current_error,
+                    'best_parameters': best_param_values,
+                    'best_error': best_error,
+                    'error_dictionary': error_dictionary,
+                    'errors_trace': self.__errors_trace,
+                    'minibatch_candidates': candidates})
+
+                if exhausted:
+                    break
+
+            if candidates:
+                best_param_values, best_error = (
+                    self.__evaluate_candidates_in_full(
+                        candidates, best_param_values, best_error))
 
         except StopIteration as e:
 
@@ -240,6 +607,8 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
 
             self.__errors_trace.append(error_dictionary)
 
+            self._save_best_parameters(best_param_values)
+
             return best_error, copy.deepcopy(best_param_values)
 
     def save_error_to_file(self):
@@ -275,7 +644,8 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
 
     def save_parameters_to_file(self, filename='ffield_out') -> None:
         """
-        Save the parameter to the file
+        Save the parameter to the file, the adapted step sizes are saved
+        as well if the step sizes are adaptive
 
         Parameters
         ----------
@@ -291,3 +661,5 @@ class SimulatedAnnealingOptimizer(SimulatedAnnealingBase):
         file_path = file_set_path(self._output_directory, filename)
 
         self._package.save_parameters_to_file(self._parameters, file_path)
+
+        self.save_step_sizes_to_file()
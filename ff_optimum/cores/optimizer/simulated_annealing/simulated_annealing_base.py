@@ -2,12 +2,18 @@
 import abc
 from functools import reduce
 import operator
-from typing import Any, Union, Generator
+import pickle
+from typing import Any, Generator, Optional, Union
 
 import numpy as np
 
 from ff_optimum.cores.optimizer.optimizer_base import Optimizer
-from ff_optimum.cores.utilities import EventLogger
+from .block_moves import ParameterBlocks
+from .surrogate import GaussianProcessSurrogate
+from ff_optimum.cores.utilities import (EvaluationBudget, EventLogger,
+                                        file_atomic_write,
+                                        file_is_file_path_valid,
+                                        file_set_path)
 
 __all__ = ['SimulatedAnnealingBase']
 
@@ -45,15 +51,265 @@ class SimulatedAnnealingBase(Optimizer):
     _beta
         control parameter for controlling the acceptance propability
 
+    _current_epoch
+        index of the running epoch
+
+    _completed_steps
+        number of temperature steps completed in the running epoch
+
+    __checkpoint_interval
+        number of temperature steps between two checkpoints,
+        checkpoint is disabled if it is not positive
+
+    __checkpoint_path
+        file path of the checkpoint
+
+    _resume_state
+        checkpoint to be resumed, None if the run is not resumed
+
+    __screening_options
+        options of the cheap screening evaluation, None if the trials are
+        not screened
+
+    __screening_settings
+        package settings of the screening evaluation, None for the training
+        settings
+
+    _screening_fitness
+        screening fitness of the current solution
+
+    _screening_statistics
+        numbers of the screened trials, the trials promoted to the full
+        evaluation and the promoted trials rejected by the full evaluation
+
+    _SCREENING_MOLECULES_SUPPORTED
+        whether the screening can evaluate a subset of the molecules
+
+    __minibatch_options
+        options of the mini-batch evaluation, None if the trials are
+        evaluated on all the frames
+
+    _minibatch_frames
+        frames of the current mini-batch, None before the first sampling
+
+    __minibatch_training_dataset
+        training data of the frames of the current mini-batch
+
+    _MINIBATCH_SUPPORTED
+        whether the trials can be evaluated on mini-batches
+
+    __surrogate
+        surrogate model of the error, None if the trials are not
+        pre-screened by the surrogate
+
+    __surrogate_skip_probability
+        predicted acceptance probability below which a trial is skipped
+
+    _surrogate_statistics
+        numbers of the predicted and the skipped trials and the absolute
+        errors of the predictions of the evaluated trials
+
+    _SURROGATE_SUPPORTED
+        whether the trials can be pre-screened by the surrogate
+
+    __response_model
+        first order response model of the calculated values, None if the
+        values of the trials are not predicted
+
+    __response_margin
+        relative margin above the acceptance threshold within which the
+        trial is evaluated in full
+
+    _response_statistics
+        numbers of the predicted, the skipped and the unpredictable trials
+        and the absolute errors of the predictions of the evaluated trials
+
+    _RESPONSE_MODEL_SUPPORTED
+        whether the values of the trials can be predicted by the response
+        model
+
+    __adaptive_step_options
+        options of the adaptive step sizes, None if the step sizes are
+        fixed
+
+    _step_scales
+        scales of the step sizes of the trials in the order of
+        next_parameter_generator
+
+    _step_acceptance
+        numbers of the accepted trials and the trials of every step size
+        since the last adaptation
+
+    __cooling_options
+        options of the adaptive cooling schedule, None if the temperature
+        is cooled geometrically
+
+    __schedule_state
+        temperature, step, number of stagnant steps, number of reheats and
+        the last temperature with acceptance of the adaptive schedule
+
+    __temperature_state
+        temperature and step running in the geometric schedule, the
+        resumed run continues after it
+
+    _budget
+        wall time and evaluation budget of the run, None if the run is
+        not budgeted
+
+    __budget_options
+        minimum number of temperatures of an epoch and the file name of
+        the best parameters written when the budget is exhausted
+
+    __budget_step_start
+        number of evaluations at the start of the temperature step
+
+    __budget_step_evaluations
+        number of evaluations of the last temperature step
+
+    __parameter_blocks
+        blocks of the parameters moved jointly by one trial, None if every
+        trial moves one parameter
+
+    __block_options
+        interval of the temperature steps for learning the blocks
+
+    __block_move
+        move of the last perturbed block
+
+    __block_reference
+        values of the active parameters at the last temperature step
+
+    __migration
+        migration exchanging the solutions with the other islands of the
+        island model, None if the run is not an island
+
     Methods
     -------
+    _perturb_parameter(parameter, idx, step_size, constraint)
+        move one parameter and report whether the written value is changed
+
+    _save_checkpoint(state)
+        save the state of the run to the checkpoint
+
+    _resume_from_checkpoint()
+        restore the state of the run from the checkpoint
+
+    _is_screening()
+        whether the trials are screened
+
+    _evaluate_parameters(parameters, screening)
+        evaluate the fitness of the parameters
+
+    _record_promotion(accepted, screening_fitness)
+        count the trial promoted to the full evaluation
+
+    _is_minibatch()
+        whether the trials are evaluated on mini-batches
+
+    _resample_minibatch(parameters)
+        sample a new mini-batch and evaluate the current solution on it
+
+    _is_full_evaluation_due()
+        whether the solutions are evaluated on all the frames after the
+        completed temperature step
+
+    _is_surrogate()
+        whether the trials are pre-screened by the surrogate
+
+    _is_rejection_predicted(parameters, current_fitness, temperature,
+                            random_number)
+        predict whether the trial is rejected by the surrogate
+
+    _record_evaluation(parameters, fitness, prediction)
+        train the surrogate with the evaluated parameters
+
+    _is_response_model()
+        whether the values of the trials are predicted by the response
+        model
+
+    _is_rejection_by_response(parameters, current_fitness, temperature,
+                              random_number)
+        predict whether the trial is rejected by the response model
+
+    _record_response(accepted, fitness, prediction)
+        move the reference of the response model to the accepted trial
+
+    _get_step_size(position, step_size, value, constraint)
+        get the adapted step size of the trial
+
+    _record_step_acceptance(position, accepted)
+        count the trial of the step size
+
+    _adapt_step_sizes()
+        adapt the step sizes toward the target acceptance ratio
+
+    save_step_sizes_to_file(filename)
+        save the adapted step sizes to the file
+
+    _is_adaptive_cooling()
+        whether the temperature is cooled adaptively
+
+    _update_temperature(number_of_acceptance)
+        update the temperature of the adaptive schedule after a step
+
+    _is_budget_exhausted(temperature)
+        whether the budget is exhausted, the schedule is planned from the
+        measured cost after a temperature step
+
+    _save_best_parameters(parameters)
+        save the best parameters safely to the output directory
+
+    _parameter_block_generator(parameters)
+        generate the blocks of the parameters moved by the trials
+
+    _perturb_block(number, block)
+        move the parameters of a block jointly
+
+    _restore_block(block, values)
+        restore the parameters of a block
+
+    _record_block_move(number, block, accepted)
+        store the move of an accepted block
+
+    _update_blocks(parameters)
+        record the change of the parameters after a temperature step and
+        learn the blocks
 
+    set_migration(migration)
+        set the migration of the island
+
+    _exchange_solutions(emigrants)
+        send the emigrants to and receive the immigrants from the other
+        islands
     """
 
     __slots__ = ['_number_of_epoch', '__initial_temperature',
                  '__final_temperature', '__cooling_rate', '__number_of_steps',
-                 '_number_of_stops', '_aceptance_ratio', '_threshold', '_beta',
-                 '_changes_in_error']
+                 '_number_of_stops', '_acceptance_probability', '_threshold',
+                 '_beta', '_changes_in_error', '_current_epoch',
+                 '_completed_steps', '__checkpoint_interval',
+                 '__checkpoint_path', '_resume_state',
+                 '__screening_options', '__screening_settings',
+                 '_screening_fitness', '_screening_statistics',
+                 '__minibatch_options', '_minibatch_frames',
+                 '__minibatch_training_dataset', '__surrogate',
+                 '__surrogate_skip_probability', '_surrogate_statistics',
+                 '__response_model', '__response_margin',
+                 '_response_statistics', '__adaptive_step_options',
+                 '_step_scales', '_step_acceptance', '__cooling_options',
+                 '__schedule_state', '__temperature_state', '_budget',
+                 '__budget_options', '__budget_step_start',
+                 '__budget_step_evaluations', '__parameter_blocks',
+                 '__block_options', '__block_move', '__block_reference',
+                 '__migration']
+
+    _SCREENING_MOLECULES_SUPPORTED = True
+
+    _MINIBATCH_SUPPORTED = True
+
+    _SURROGATE_SUPPORTED = True
+
+    _RESPONSE_MODEL_SUPPORTED = True
 
     def __init__(self, number_of_processors: int, profile: str,
                  package_name: str, package_settings: dict,
@@ -63,6 +319,9 @@ class SimulatedAnnealingBase(Optimizer):
                  plot_information: dict, alogrithm_parameters: dict,
                  output_directory: str):
 
+        self._budget = EvaluationBudget.from_config(
+            alogrithm_parameters.get('budget', None))
+
         self._number_of_epoch = int(alogrithm_parameters.get('epoch', 1))
 
         self.__initial_temperature = float(
@@ -89,6 +348,13 @@ class SimulatedAnnealingBase(Optimizer):
 
         self._changes_in_error = list()
 
+        self._current_epoch, self._completed_steps = 0, 0
+
+        self.__checkpoint_interval = \
+            int(alogrithm_parameters.get('checkpoint_interval', 1))
+
+        self._resume_state = None
+
         logger.info(f'Number of epoch {self._number_of_epoch}')
         logger.info(f'Initial temperature: {self.__initial_temperature:.4f}')
         logger.info(f'Final temperature: {self.__final_temperature:.4f}')
@@ -98,6 +364,13 @@ class SimulatedAnnealingBase(Optimizer):
         logger.info(f'Acceptance probability: '
                     f'{self._acceptance_probability:.4f}')
         logger.info(f'Threshold: {self._threshold:.4f}')
+        logger.info(f'Checkpoint interval: {self.__checkpoint_interval}')
+
+        checkpoint = None
+
+        if alogrithm_parameters.get('resume_from', None):
+            checkpoint = self.__read_checkpoint(
+                alogrithm_parameters['resume_from'], package_settings)
 
         super(SimulatedAnnealingBase, self).__init__(
             number_of_processors, profile, package_name, package_settings,
@@ -105,67 +378,1802 @@ class SimulatedAnnealingBase(Optimizer):
             command_holder_train, training_data, plot_information,
             output_directory)
 
+        self.__checkpoint_path = file_set_path(
+            self._output_directory,
+            alogrithm_parameters.get('checkpoint_file', 'checkpoint.pkl'))
+
+        self.__screening_options, self.__screening_settings = None, None
+
+        self._screening_fitness = None
+
+        self._screening_statistics = {'screened': 0, 'promoted': 0,
+                                      'disagreed': 0}
+
+        self.__set_screening(alogrithm_parameters.get('screening', None))
+
+        self.__minibatch_options, self._minibatch_frames = None, None
+
+        self.__minibatch_training_dataset = None
+
+        self.__set_minibatch(alogrithm_parameters.get('minibatch', None))
+
+        self.__surrogate, self.__surrogate_skip_probability = None, None
+
+        self._surrogate_statistics = {'predicted': 0, 'skipped': 0,
+                                      'evaluated': 0, 'absolute_error': 0.0}
+
+        self.__set_surrogate(alogrithm_parameters.get('surrogate', None))
+
+        self.__response_model, self.__response_margin = None, None
+
+        self._response_statistics = {'predicted': 0, 'skipped': 0,
+                                     'unpredictable': 0, 'evaluated': 0,
+                                     'absolute_error': 0.0}
+
+        self.__set_response_model(
+            alogrithm_parameters.get('response_model', None))
+
+        self.__adaptive_step_options = None
+
+        self._step_scales, self._step_acceptance = None, None
+
+        self.__set_adaptive_step(
+            alogrithm_parameters.get('adaptive_step', None))
+
+        self.__cooling_options, self.__schedule_state = None, None
+
+        self.__temperature_state = None
+
+        self.__set_adaptive_cooling(
+            alogrithm_parameters.get('adaptive_cooling', None))
+
+        budget = alogrithm_parameters.get('budget', None) or {}
+
+        self.__budget_options = {
+            'minimum_temperatures': max(
+                1, int(budget.get('minimum_temperatures', 3))),
+            'output_file': budget.get('output_file', 'ffield_budget')}
+
+        self.__budget_step_start, self.__budget_step_evaluations = 0, 0
+
+        if self._budget is not None:
+            logger.info(f'Budget: {budget}')
+
+        self.__parameter_blocks, self.__block_options = None, None
+
+        self.__block_move, self.__block_reference = None, None
+
+        self.__set_block_moves(alogrithm_parameters.get('block_moves', None))
+
+        self.__migration = None
+
+        if checkpoint is not None:
+            self.__load_checkpoint(checkpoint,
+                                   alogrithm_parameters['resume_from'])
+
     @abc.abstractclassmethod
     def _one_epoch(self):
         pass
 
-    def _temperature_generator(self) -> Generator:
+    def __set_screening(self, screening: Optional[dict]) -> None:
         """
-        Generate temperature base on the initial temperature ,final temperature
-        and the number of steps in the algorithm parameters
+        Set the cheap screening evaluation of the trials, the trials are
+        evaluated with a looser charge equilibration tolerance and
+        optionally a subset of the molecules first, only the trials
+        accepted by the screening are evaluated in full
+
+        Parameters
+        ----------
+        screening
+            dictionary containing qeq_tolerance and molecules,
+            None if the trials are not screened
+
+        Returns
+        -------
+        None
+        """
+
+        if not screening:
+            return
+
+        options = {}
+
+        if screening.get('qeq_tolerance', None) is not None:
+            options['qeq_tolerance'] = float(screening['qeq_tolerance'])
+
+        molecules = screening.get('molecules', None)
+
+        select_training_molecules = getattr(
+            self._package, 'select_training_molecules', None)
+
+        if molecules and not self._SCREENING_MOLECULES_SUPPORTED:
+
+            logger.warning(f'Screening with a subset of molecules is not '
+                           f'supported by {type(self).__name__}, '
+                           f'all molecules are screened')
+
+        elif molecules and select_training_molecules is None:
+
+            logger.warning(f'Screening with a subset of molecules is not '
+                           f'supported by {self._package_name}, '
+                           f'all molecules are screened')
+
+        elif molecules:
+
+            self.__screening_settings, options['molecules'] = (
+                select_training_molecules(self._package_setting_train,
+                                          molecules))
+
+        self.__screening_options = options
+
+        logger.info(f'Screening: {options}')
+
+    def _is_screening(self) -> bool:
+        return self.__screening_options is not None
+
+    def __set_minibatch(self, minibatch: Optional[dict]) -> None:
+        """
+        Set the mini-batch evaluation of the trials, the trials are
+        evaluated on a stratified random subset of the frames of every
+        molecule which is sampled again every temperature step
+
+        Parameters
+        ----------
+        minibatch
+            dictionary containing fraction, minimum_frames and
+            full_evaluation_interval, None if the trials are evaluated on
+            all the frames
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            when the fraction is not in (0, 1]
+        """
+
+        if not minibatch:
+            return
+
+        if not self._MINIBATCH_SUPPORTED:
+            logger.warning(f'Mini-batch is not supported by '
+                           f'{type(self).__name__}, all frames are evaluated')
+            return
+
+        if not (hasattr(self._package, 'sample_training_frames') and
+                hasattr(self._package, 'select_training_frames')):
+            logger.warning(f'Mini-batch is not supported by '
+                           f'{self._package_name}, all frames are evaluated')
+            return
+
+        options = {
+            'fraction': float(minibatch.get('fraction', 0.25)),
+            'minimum_frames': int(minibatch.get('minimum_frames', 2)),
+            'full_evaluation_interval': max(
+                1, int(minibatch.get('full_evaluation_interval', 1)))}
+
+        if not 0 < options['fraction'] <= 1:
+            raise ValueError(f'Mini-batch fraction {options["fraction"]} '
+                             f'is not in (0, 1]')
+
+        self.__minibatch_options = options
+
+        logger.info(f'Mini-batch: {options}')
+
+    def _is_minibatch(self) -> bool:
+        return self.__minibatch_options is not None
+
+    def _resample_minibatch(self, parameters: Any) -> Any:
+        """
+        Sample a new mini-batch of the training data and evaluate the
+        current solution on it, the screening fitness of the current
+        solution is evaluated on the new mini-batch as well
+
+        Parameters
+        ----------
+        parameters
+            parameters of the current solution
+
+        Returns
+        -------
+        fitness
+            fitness of the current solution on the new mini-batch
+        """
+
+        self._minibatch_frames = self._package.sample_training_frames(
+            self._training_dataset, self.__minibatch_options['fraction'],
+            self.__minibatch_options['minimum_frames'])
+
+        self.__minibatch_training_dataset = (
+            self._package.select_training_frames(self._training_dataset,
+                                                 self._minibatch_frames))
+
+        if self._is_screening():
+            self._screening_fitness = self._evaluate_parameters(
+                parameters, screening=True)
+
+        return self._evaluate_parameters(parameters)
+
+    def _is_full_evaluation_due(self) -> bool:
+        return (self._completed_steps %
+                self.__minibatch_options['full_evaluation_interval'] == 0)
+
+    def __set_surrogate(self, surrogate: Optional[dict]) -> None:
+        """
+        Set the surrogate pre-screening of the trials, the surrogate is
+        trained with every evaluated trial and the trials whose predicted
+        acceptance probability is below skip_probability are rejected
+        without evaluation
+
+        Parameters
+        ----------
+        surrogate
+            dictionary containing skip_probability, capacity and
+            minimum_points, None if the trials are not pre-screened
+
+        Returns
+        -------
+        None
+        """
+
+        if not surrogate:
+            return
+
+        if not self._SURROGATE_SUPPORTED:
+            logger.warning(f'Surrogate is not supported by '
+                           f'{type(self).__name__}, all trials are evaluated')
+            return
+
+        if self._is_minibatch():
+            logger.warning('Surrogate is not supported with mini-batch, '
+                           'all trials are evaluated')
+            return
+
+        scale = np.array([
+            step_size * (abs(parameter[idx]) or 1.0)
+            for idx, parameter, step_size, _ in (
+                self._package.next_parameter_generator(
+                    self._parameters, self._step_size, self._constraints,
+                    True))])
+
+        self.__surrogate = GaussianProcessSurrogate(
+            scale, int(surrogate.get('capacity', 200)),
+            int(surrogate.get('minimum_points', 20)))
+
+        self.__surrogate_skip_probability = float(
+            surrogate.get('skip_probability', 0.01))
+
+        logger.info(f'Surrogate: {surrogate}')
+
+    def _is_surrogate(self) -> bool:
+        return self.__surrogate is not None
+
+    def __get_active_values(self, parameters: Any) -> np.ndarray:
+        return np.array([
+            parameter[idx] for idx, parameter, _, _ in (
+                self._package.next_parameter_generator(
+                    parameters, self._step_size, self._constraints, True))])
+
+    def _is_rejection_predicted(
+            self, parameters: Any, current_fitness: float,
+            temperature: float,
+            random_number: float) -> Union[bool, Optional[float]]:
+        """
+        Predict whether the trial is rejected by the metropolis criteria
+        with the random number, the trial is rejected if the predicted
+        probability of the error below the acceptance threshold is smaller
+        than the skip probability
+
+        Nothing is predicted before beta is found or enough trials are
+        evaluated.
+
+        Parameters
+        ----------
+        parameters
+            parameters of the trial
+
+        current_fitness
+            fitness of the current solution
 
-        Yields
-        -----
         temperature
-            the current temperature for the algorithm
+            current temperature
 
-        step
-            the number of step for the algorithm
+        random_number
+            random number shared with the metropolis criteria of the trial
+
+        Returns
+        -------
+        rejected
+            True if the trial is rejected without evaluation
+
+        prediction
+            predicted error of the trial, None if it is not predicted
         """
 
-        temperature = self.__initial_temperature
+        if self._beta is None or not self.__surrogate.is_ready():
+            return False, None
 
-        while temperature > self.__final_temperature:
+        values = self.__get_active_values(parameters)
 
-            for step in range(self.__number_of_steps):
-                yield temperature, step
+        threshold = self._get_acceptance_threshold(
+            current_fitness, temperature, random_number)
 
-            temperature *= self.__cooling_rate
+        prediction, _ = self.__surrogate.predict(values)
 
-    def _metropolis_criteria(self, change_in_error: float,
-                             temperature: float) -> bool:
+        self._surrogate_statistics['predicted'] += 1
+
+        if (self.__surrogate.probability_below(values, threshold) <
+                self.__surrogate_skip_probability):
+
+            self._surrogate_statistics['skipped'] += 1
+
+            return True, prediction
+
+        return False, prediction
+
+    def _record_evaluation(self, parameters: Any, fitness: float,
+                           prediction: Optional[float]=None) -> None:
         """
-        determine whether the new solution is accepted by the metropholis
-        criteria
+        Train the surrogate with the evaluated parameters and record the
+        accuracy of the prediction
 
         Parameters
         ----------
-        change_in_error
-            the difference of error between new solution and current solution
+        parameters
+            evaluated parameters
+
+        fitness
+            evaluated fitness
+
+        prediction
+            predicted error of the parameters, None if it is not predicted
+
+        Returns
+        -------
+        None
+        """
+
+        if not self._is_surrogate():
+            return
+
+        self.__surrogate.add(self.__get_active_values(parameters), fitness)
+
+        if prediction is not None:
+
+            self._surrogate_statistics['evaluated'] += 1
+
+            self._surrogate_statistics['absolute_error'] += abs(
+                prediction - fitness)
+
+    def _get_acceptance_threshold(self, current_fitness: float,
+                                  temperature: float,
+                                  random_number: float) -> float:
+        """
+        Get the largest error of the trial accepted by the metropolis
+        criteria with the random number after beta is found
+
+        Parameters
+        ----------
+        current_fitness
+            fitness of the current solution
+
         temperature
-            the current temperature in the simulated annealing algorithm
+            current temperature
+
+        random_number
+            random number shared with the metropolis criteria of the trial
 
         Returns
         -------
-        True
-            If the change in error is smaller than zero or
-            p_accept is greater than a random number
-            between zero and one
+        threshold
+        """
 
-        False
-            Otherwise
+        return current_fitness - (self._beta * temperature *
+                                  np.log(max(random_number, 1.0e-300)))
+
+    def _log_surrogate_statistics(self) -> None:
         """
+        Log the numbers of the predicted and the skipped trials and the
+        mean absolute error of the predictions
 
-        if change_in_error <= 0:
-            return True
+        Returns
+        -------
+        None
+        """
 
-        if self._beta is None:
-            p_accept = self._acceptance_probability
-        else:
-            p_accept = min(
-                np.exp(-1 * change_in_error / self._beta / temperature), 1)
+        if not self._is_surrogate():
+            return
+
+        statistics = self._surrogate_statistics
+
+        skip_rate = (statistics['skipped'] / statistics['predicted']
+                     if statistics['predicted'] else 0.0)
+
+        mean_absolute_error = (
+            statistics['absolute_error'] / statistics['evaluated']
+            if statistics['evaluated'] else 0.0)
+
+        logger.info(f'Number of predicted: {statistics["predicted"]} '
+                    f'Number of skipped: {statistics["skipped"]} '
+                    f'Skip rate: {skip_rate:.4f} '
+                    f'Surrogate mean absolute error: '
+                    f'{mean_absolute_error:.4f}')
+
+    def _evaluate_parameters(self, parameters: Any, screening: bool=False,
+                             full: bool=False) -> Any:
+        """
+        Evaluate the fitness of the parameters on the training data, only
+        the frames of the current mini-batch are evaluated if the trials
+        are evaluated on mini-batches
+
+        Parameters
+        ----------
+        parameters
+            parameters to be evaluated
+
+        screening
+            evaluate with the cheap screening options if True
+
+        full
+            evaluate on all the frames if True
+
+        Returns
+        -------
+        fitness
+        """
+
+        options, training_dataset = {}, self._training_dataset
+
+        if self._budget is not None:
+            self._budget.record()
+
+        if self._minibatch_frames is not None and not full:
+
+            options['frames'] = self._minibatch_frames
+
+            training_dataset = self.__minibatch_training_dataset
+
+        if not screening:
+
+            calculated_values = (
+                self._commands_holder_train.execute_commands(parameters,
+                                                             **options))
+
+            if self._is_response_model():
+                self.__response_model.record(parameters, calculated_values)
+
+            return self._evaluate_fitness(calculated_values,
+                                          training_dataset)
+
+        calculated_values = self._commands_holder_train.execute_commands(
+            parameters, **self.__screening_options, **options)
+
+        return self._evaluate_fitness(calculated_values,
+                                      training_dataset,
+                                      self.__screening_settings)
+
+    def _record_promotion(self, accepted: bool,
+                          screening_fitness: Any=None) -> None:
+        """
+        Count the trial accepted by the screening and promoted to the full
+        evaluation, keep the screening fitness of the accepted trial as
+        the one of the current solution
+
+        Parameters
+        ----------
+        accepted
+            whether the trial is accepted by the full evaluation
+
+        screening_fitness
+            screening fitness of the trial
+
+        Returns
+        -------
+        None
+        """
+
+        self._screening_statistics['promoted'] += 1
+
+        if accepted:
+            self._screening_fitness = screening_fitness
+        else:
+            self._screening_statistics['disagreed'] += 1
+
+    def _log_screening_statistics(self) -> None:
+        """
+        Log the numbers of the screened trials, promoted trials and the
+        promoted trials rejected by the full evaluation
+
+        Returns
+        -------
+        None
+        """
+
+        if not self._is_screening():
+            return
+
+        statistics = self._screening_statistics
+
+        disagreement = (statistics['disagreed'] / statistics['promoted']
+                        if statistics['promoted'] else 0.0)
+
+        logger.info(f'Number of screened: {statistics["screened"]} '
+                    f'Number of promoted: {statistics["promoted"]} '
+                    f'Number of disagreement: {statistics["disagreed"]} '
+                    f'Disagreement rate: {disagreement:.4f}')
+
+    def __set_response_model(self, response_model: Optional[dict]) -> None:
+        """
+        Set the first order response model of the calculated values, the
+        values of the trials are predicted by a Taylor step and the trials
+        whose predicted error is above the acceptance threshold by more
+        than the margin are rejected without evaluation
+
+        Parameters
+        ----------
+        response_model
+            dictionary containing margin and staleness, None if the values
+            of the trials are not predicted
+
+        Returns
+        -------
+        None
+        """
+
+        if not response_model:
+            return
+
+        if not self._RESPONSE_MODEL_SUPPORTED:
+            logger.warning(f'Response model is not supported by '
+                           f'{type(self).__name__}, all trials are evaluated')
+            return
+
+        if not hasattr(self._package, 'create_response_model'):
+            logger.warning(f'Response model is not supported by '
+                           f'{self._package_name}, all trials are evaluated')
+            return
+
+        if self._is_minibatch():
+            logger.warning('Response model is not supported with '
+                           'mini-batch, all trials are evaluated')
+            return
+
+        self.__response_model = self._package.create_response_model(
+            self._step_size, self._constraints,
+            int(response_model.get('staleness', 20)))
+
+        self.__response_margin = float(response_model.get('margin', 0.05))
+
+        logger.info(f'Response model: {response_model}')
+
+    def _is_response_model(self) -> bool:
+        return self.__response_model is not None
+
+    def _is_rejection_by_response(
+            self, parameters: Any, current_fitness: float,
+            temperature: float,
+            random_number: float) -> Union[bool, Optional[float]]:
+        """
+        Predict the values of the trial by the response model and decide
+        whether the trial is rejected by the metropolis criteria with the
+        random number without evaluation
+
+        Nothing is predicted before beta is found.
+
+        Parameters
+        ----------
+        parameters
+            parameters of the trial
+
+        current_fitness
+            fitness of the current solution
+
+        temperature
+            current temperature
+
+        random_number
+            random number shared with the metropolis criteria of the trial
+
+        Returns
+        -------
+        rejected
+            True if the trial is rejected without evaluation
+
+        prediction
+            predicted error of the trial, None if it is not predicted
+        """
+
+        if self._beta is None:
+            return False, None
+
+        predicted_values = self.__response_model.predict(parameters)
+
+        if predicted_values is None:
+            self._response_statistics['unpredictable'] += 1
+            return False, None
+
+        prediction = self._evaluate_fitness(predicted_values,
+                                            self._training_dataset)
+
+        self._response_statistics['predicted'] += 1
+
+        threshold = self._get_acceptance_threshold(
+            current_fitness, temperature, random_number)
+
+        if prediction > threshold + self.__response_margin * abs(threshold):
+
+            self._response_statistics['skipped'] += 1
+
+            return True, prediction
+
+        return False, prediction
+
+    def _record_response(self, accepted: bool,
+                         fitness: Optional[float]=None,
+                         prediction: Optional[float]=None) -> None:
+        """
+        Move the reference of the response model to the last evaluation if
+        it is accepted and record the accuracy of the prediction
+
+        Parameters
+        ----------
+        accepted
+            whether the last evaluation is accepted
+
+        fitness
+            evaluated fitness
+
+        prediction
+            predicted error of the last evaluation, None if it is not
+            predicted
+
+        Returns
+        -------
+        None
+        """
+
+        if not self._is_response_model():
+            return
+
+        if accepted:
+            self.__response_model.accept()
+
+        if prediction is not None:
+
+            self._response_statistics['evaluated'] += 1
+
+            self._response_statistics['absolute_error'] += abs(
+                prediction - fitness)
+
+    def _log_response_statistics(self) -> None:
+        """
+        Log the numbers of the predicted, the skipped and the unpredictable
+        trials and the mean absolute error of the predictions
+
+        Returns
+        -------
+        None
+        """
+
+        if not self._is_response_model():
+            return
+
+        statistics = self._response_statistics
+
+        skip_rate = (statistics['skipped'] / statistics['predicted']
+                     if statistics['predicted'] else 0.0)
+
+        mean_absolute_error = (
+            statistics['absolute_error'] / statistics['evaluated']
+            if statistics['evaluated'] else 0.0)
+
+        logger.info(f'Number of response predicted: '
+                    f'{statistics["predicted"]} '
+                    f'Number of response skipped: {statistics["skipped"]} '
+                    f'Number of unpredictable: '
+                    f'{statistics["unpredictable"]} '
+                    f'Response skip rate: {skip_rate:.4f} '
+                    f'Response mean absolute error: '
+                    f'{mean_absolute_error:.4f}')
+
+    def _log_qeq_statistics(self) -> None:
+        """
+        Log the average number of charge equilibration iterations per
+        frame of the evaluations since the last log, if the package reports
+        it
+
+        Returns
+        -------
+        None
+        """
+
+        if not hasattr(self._package, 'pop_qeq_statistics'):
+            return
+
+        statistics = self._package.pop_qeq_statistics()
+
+        if statistics['frames']:
+            logger.info(f'Number of QEq frames: {statistics["frames"]} '
+                        f'Average QEq iterations per frame: '
+                        f'{statistics["average_iterations"]:.2f}')
+
+    def __set_adaptive_step(self, adaptive_step: Optional[dict]) -> None:
+        """
+        Set the adaptive step sizes, the step size of every trial in the
+        order of next_parameter_generator is scaled toward the target
+        acceptance ratio as proposed by Corana et al.
+
+        Parameters
+        ----------
+        adaptive_step
+            dictionary containing target_acceptance, adaptation_factor,
+            interval, minimum_scale and maximum_scale, None if the step
+            sizes are fixed
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            when the target acceptance is not in (0, 1)
+        """
+
+        if not adaptive_step:
+            return
+
+        options = {
+            'target_acceptance': float(
+                adaptive_step.get('target_acceptance', 0.5)),
+            'adaptation_factor': float(
+                adaptive_step.get('adaptation_factor', 2.0)),
+            'interval': max(1, int(adaptive_step.get('interval', 5))),
+            'minimum_scale': float(adaptive_step.get('minimum_scale',
+                                                     1.0e-2)),
+            'maximum_scale': float(adaptive_step.get('maximum_scale',
+                                                     1.0e1))}
+
+        if not 0 < options['target_acceptance'] < 1:
+            raise ValueError(f'Target acceptance '
+                             f'{options["target_acceptance"]} '
+                             f'is not in (0, 1)')
+
+        number_of_trials = sum(1 for _ in (
+            self._package.next_parameter_generator(
+                self._parameters, self._step_size, self._constraints, True)))
+
+        if self._step_scales is None:
+
+            self._step_scales = np.ones(number_of_trials)
+
+            self._step_acceptance = np.zeros((2, number_of_trials),
+                                             dtype='i8')
+
+        self.__adaptive_step_options = options
+
+        logger.info(f'Adaptive step: {options}')
+
+    def _is_adaptive_step(self) -> bool:
+        return self.__adaptive_step_options is not None
+
+    def _get_step_size(self, position: int, step_size: float, value: float,
+                       constraint: tuple) -> float:
+        """
+        Get the adapted step size of the trial, the move is limited to the
+        range of the constraint
+
+        Parameters
+        ----------
+        position
+            position of the trial in the order of next_parameter_generator
+
+        step_size
+            step size of the parameter
+
+        value
+            current value of the parameter
+
+        constraint
+            minimum and maximum value of the parameter
+
+        Returns
+        -------
+        step_size
+            adapted step size
+        """
+
+        if not self._is_adaptive_step():
+            return step_size
+
+        step_size *= self._step_scales[position]
+
+        if value:
+            step_size = min(step_size,
+                            (constraint[1] - constraint[0]) / abs(value))
+
+        return step_size
+
+    def _record_step_acceptance(self, position: int,
+                                accepted: Optional[bool]) -> None:
+        """
+        Count the trial of the step size, the trials resolved without
+        evaluation are not counted
+
+        Parameters
+        ----------
+        position
+            position of the trial in the order of next_parameter_generator
+
+        accepted
+            whether the trial is accepted, None if it is resolved without
+            evaluation
+
+        Returns
+        -------
+        None
+        """
+
+        if not self._is_adaptive_step() or accepted is None:
+            return
+
+        self._step_acceptance[0, position] += int(accepted)
+
+        self._step_acceptance[1, position] += 1
+
+    def _adapt_step_sizes(self) -> None:
+        """
+        Adapt the step sizes every interval of the completed temperature
+        steps, the scale of a step size is enlarged if its acceptance ratio
+        is above the target acceptance ratio by more than 0.1 and reduced
+        if it is below by more than 0.1
+
+        Returns
+        -------
+        None
+        """
+
+        if (not self._is_adaptive_step() or self._completed_steps %
+                self.__adaptive_step_options['interval']):
+            return
+
+        options = self.__adaptive_step_options
+
+        accepted, trials = self._step_acceptance
+
+        ratio = np.divide(accepted, trials, out=np.full(trials.size, np.nan),
+                          where=trials > 0)
+
+        target = options['target_acceptance']
+
+        factor = options['adaptation_factor']
+
+        with np.errstate(invalid='ignore'):
+
+            upper = ratio > target + 0.1
+
+            lower = ratio < target - 0.1
+
+        self._step_scales[upper] *= (
+            1 + factor * (ratio[upper] - target - 0.1) / (0.9 - target))
+
+        self._step_scales[lower] /= (
+            1 + factor * (target - 0.1 - ratio[lower]) / (target - 0.1)
+            if target > 0.1 else 1 + factor)
+
+        np.clip(self._step_scales, options['minimum_scale'],
+                options['maximum_scale'], out=self._step_scales)
+
+        self._step_acceptance[:] = 0
+
+        logger.info(f'Step sizes adapted, enlarged: {np.sum(upper)} '
+                    f'reduced: {np.sum(lower)} '
+                    f'scale min: {self._step_scales.min():.4f} '
+                    f'mean: {self._step_scales.mean():.4f} '
+                    f'max: {self._step_scales.max():.4f}')
+
+    def save_step_sizes_to_file(self, filename: str='step_sizes') -> None:
+        """
+        Save the adapted step sizes of the trials in the order of
+        next_parameter_generator to the file
+
+        Parameters
+        ----------
+        filename
+            filename of the step sizes to be saved
+
+        Returns
+        -------
+        None
+        """
+
+        if not self._is_adaptive_step():
+            return
+
+        file_path = file_set_path(self._output_directory, filename)
+
+        with open(file_path, 'w') as fp:
+
+            fp.write('# trial step_size scale adapted_step_size\n')
+
+            for position, (_, _, step_size, _) in enumerate(
+                    self._package.next_parameter_generator(
+                        self._parameters, self._step_size,
+                        self._constraints, True)):
+                fp.write(f'{position + 1} {step_size} '
+                         f'{self._step_scales[position]} '
+                         f'{step_size * self._step_scales[position]}\n')
+
+        logger.info(f'Save step sizes to {file_path}')
+
+    def __set_adaptive_cooling(self, adaptive_cooling: Optional[dict]) -> None:
+        """
+        Set the adaptive cooling schedule, the temperature is updated after
+        every step from the standard deviation of the changes in error of
+        the step as proposed by Aarts and van Laarhoven, and reheated when
+        nothing is accepted for a number of steps
+
+        Parameters
+        ----------
+        adaptive_cooling
+            dictionary containing distance, minimum_cooling_rate,
+            stagnation_steps, reheating_factor and maximum_reheats, None if
+            the temperature is cooled geometrically
+
+        Returns
+        -------
+        None
+        """
+
+        if not adaptive_cooling:
+            return
+
+        self.__cooling_options = {
+            'distance': float(adaptive_cooling.get('distance', 0.1)),
+            'minimum_cooling_rate': float(
+                adaptive_cooling.get('minimum_cooling_rate', 0.5)),
+            'stagnation_steps': max(
+                1, int(adaptive_cooling.get('stagnation_steps', 3))),
+            'reheating_factor': float(
+                adaptive_cooling.get('reheating_factor', 2.0)),
+            'maximum_reheats': int(adaptive_cooling.get('maximum_reheats',
+                                                        2))}
+
+        logger.info(f'Adaptive cooling: {self.__cooling_options}')
+
+    def _is_adaptive_cooling(self) -> bool:
+        return self.__cooling_options is not None
+
+    def _update_temperature(self, number_of_acceptance: int) -> None:
+        """
+        Update the temperature of the adaptive schedule after a step from
+        the changes in error of the step, the changes in error are cleared.
+        The temperature is cooled at least as fast as the geometric
+        schedule of the cooling rate spread over the number of steps and
+        at most by the minimum cooling rate per step
+
+        The temperature is reheated to the reheating factor times the last
+        temperature with acceptance if nothing is accepted for
+        stagnation_steps steps, the schedule stops when it stagnates again
+        after maximum_reheats reheats.
+
+        Parameters
+        ----------
+        number_of_acceptance
+            number of the accepted trials of the step
+
+        Returns
+        -------
+        None
+        """
+
+        if not self._is_adaptive_cooling():
+            return
+
+        options, state = self.__cooling_options, self.__schedule_state
+
+        changes_in_error = np.array(self._changes_in_error, dtype='f8')
+
+        self._changes_in_error = list()
+
+        state['step'] += 1
+
+        temperature = state['temperature']
+
+        if number_of_acceptance:
+            state['stagnation'], state['accepting_temperature'] = (
+                0, temperature)
+        else:
+            state['stagnation'] += 1
+
+        if state['stagnation'] >= options['stagnation_steps']:
+
+            if state['reheats'] >= options['maximum_reheats']:
+
+                state['stopped'] = True
+
+                logger.info(f'Schedule stops at temperature: '
+                            f'{temperature:.4f}, no acceptance after '
+                            f'{state["reheats"]} reheats')
+
+                return
+
+            state['temperature'] = min(
+                self.__initial_temperature,
+                state['accepting_temperature'] * options['reheating_factor'])
+
+            state['reheats'] += 1
+
+            state['stagnation'] = 0
+
+            logger.info(f'Reheat from temperature: {temperature:.4f} '
+                        f'to {state["temperature"]:.4f}')
+
+            return
+
+        deviation = (changes_in_error.std() if changes_in_error.size > 1
+                     else 0.0)
+
+        cooling_rate = self.__cooling_rate**(1 / self.__number_of_steps)
+
+        if self._beta is None or deviation <= 0:
+            state['temperature'] = temperature * cooling_rate
+            return
+
+        state['temperature'] = temperature * min(max(
+            1 / (1 + self._beta * temperature *
+                 np.log(1 + options['distance']) / (3 * deviation)),
+            options['minimum_cooling_rate']), cooling_rate)
+
+        logger.info(f'Temperature cooled from {temperature:.4f} to '
+                    f'{state["temperature"]:.4f}, standard deviation of '
+                    f'changes in error: {deviation:.4f}')
+
+    def _is_budget_exhausted(self, temperature: Optional[float]=None) -> bool:
+        """
+        Check whether the budget is exhausted, i.e. another temperature step
+        at the measured number of evaluations per step is not affordable
+
+        After a temperature step, the number of evaluations of the step is
+        measured and the schedule is planned from the affordable steps.
+        The epochs which can not run minimum_temperatures temperatures are
+        dropped and the cooling rate is set so that the current epoch and
+        the remaining epochs reach the final temperature within the budget.
+        The cooling rate is not planned with the adaptive cooling schedule.
+
+        Parameters
+        ----------
+        temperature
+            temperature of the completed step, None if it is checked
+            between the steps
+
+        Returns
+        -------
+        exhausted
+            True if the run is to be stopped
+        """
+
+        if self._budget is None:
+            return False
+
+        if temperature is not None:
+
+            self.__budget_step_evaluations = (
+                self._budget.number_of_evaluations -
+                self.__budget_step_start)
+
+            self.__budget_step_start = self._budget.number_of_evaluations
+
+        remaining = self._budget.remaining_evaluations()
+
+        evaluations = max(self.__budget_step_evaluations, 1)
+
+        if remaining < evaluations:
+
+            logger.info(f'Budget is exhausted, evaluations: '
+                        f'{self._budget.number_of_evaluations} '
+                        f'elapsed time: {self._budget.elapsed_time():.1f} s')
+
+            return True
+
+        if temperature is not None:
+            self.__plan_schedule(remaining / evaluations, temperature)
+
+        return False
+
+    def __plan_schedule(self, number_of_steps: float,
+                        temperature: float) -> None:
+        """
+        Plan the number of epochs and the cooling rate from the number of
+        temperature steps affordable within the budget
+
+        Parameters
+        ----------
+        number_of_steps
+            number of temperature steps affordable
+
+        temperature
+            current temperature
+
+        Returns
+        -------
+        None
+        """
+
+        minimum_steps = (self.__number_of_steps *
+                         self.__budget_options['minimum_temperatures'])
+
+        future_epochs = self._number_of_epoch - self._current_epoch - 1
+
+        affordable_epochs = max(int(number_of_steps // minimum_steps) - 1, 0)
+
+        if future_epochs > affordable_epochs:
+
+            self._number_of_epoch = (self._current_epoch + 1 +
+                                     affordable_epochs)
+
+            future_epochs = affordable_epochs
+
+            logger.info(f'Number of epoch is planned to '
+                        f'{self._number_of_epoch} by the budget')
+
+        if (self._is_adaptive_cooling() or
+                temperature <= self.__final_temperature):
+            return
+
+        temperatures = max(1.0, number_of_steps / (1 + future_epochs) /
+                           self.__number_of_steps)
+
+        self.__cooling_rate = min(max(
+            (self.__final_temperature / temperature)**(1 / temperatures),
+            0.5), 0.99)
+
+        logger.info(f'Cooling rate is planned to {self.__cooling_rate:.4f} '
+                    f'by the budget, affordable steps: '
+                    f'{number_of_steps:.1f}')
+
+    def _save_best_parameters(self, parameters: Any) -> None:
+        """
+        Save the best parameters of a budgeted run to the output directory,
+        the package saves the parameters atomically so an interrupted run
+        keeps the previous file
+
+        Parameters
+        ----------
+        parameters
+            best parameters
+
+        Returns
+        -------
+        None
+        """
+
+        if self._budget is None:
+            return
+
+        file_path = file_set_path(self._output_directory,
+                                  self.__budget_options['output_file'])
+
+        self._package.save_parameters_to_file(parameters, file_path)
+
+        logger.info(f'Save best parameters to {file_path}')
+
+    def __set_block_moves(self, block_moves: Optional[dict]) -> None:
+        """
+        Set the block moves, every trial moves a block of the parameters
+        jointly. The blocks are the configured groups of the parameter
+        names of every entry if the package supports them, the moves of a
+        block are correlated as its accepted moves. Without the groups, the
+        blocks are learned from the changes of the parameters between the
+        temperature steps every interval of the steps
+
+        Parameters
+        ----------
+        block_moves
+            dictionary containing groups, minimum_moves, correlation,
+            maximum_size, capacity and interval, None if every trial moves
+            one parameter
+
+        Returns
+        -------
+        None
+        """
+
+        if not block_moves:
+            return
+
+        groups = block_moves.get('groups', None)
+
+        if groups and not hasattr(self._package, 'get_parameter_blocks'):
+            logger.warning(f'Groups of parameters are not supported by '
+                           f'{self._package_name}, every trial moves one '
+                           f'parameter')
+            return
+
+        if groups:
+            blocks = self._package.get_parameter_blocks(
+                self._parameters, self._step_size, groups)
+
+        else:
+            blocks = [[position] for position in range(sum(
+                1 for _ in self._package.next_parameter_generator(
+                    self._parameters, self._step_size, self._constraints,
+                    True)))]
+
+        self.__parameter_blocks = ParameterBlocks(
+            blocks, not groups, int(block_moves.get('minimum_moves', 10)),
+            float(block_moves.get('correlation', 0.5)),
+            int(block_moves.get('maximum_size', 4)),
+            int(block_moves.get('capacity', 100)))
+
+        self.__block_options = {
+            'interval': max(1, int(block_moves.get('interval', 5)))}
+
+        logger.info(f'Block moves: {block_moves}, '
+                    f'number of blocks: {len(blocks)}')
+
+    def _is_block_moves(self) -> bool:
+        return self.__parameter_blocks is not None
+
+    def _parameter_block_generator(self, parameters: Any) -> Generator:
+        """
+        Generator generating the blocks of the parameters moved by the
+        trials, every block is a single parameter if the block moves are
+        not set
+
+        Parameters
+        ----------
+        parameters
+            parameters to be moved
+
+        Yields
+        ------
+        number
+            number of the block
+
+        block
+            list of the position in the order of next_parameter_generator,
+            index, array, step size and constraint of the parameters
+        """
+
+        trials = list(self._package.next_parameter_generator(
+            parameters, self._step_size, self._constraints, True))
+
+        if not self._is_block_moves():
+
+            for position, trial in enumerate(trials):
+                yield position, [(position, *trial)]
+
+            return
+
+        for number, block in enumerate(self.__parameter_blocks.blocks):
+            yield number, [(position, *trials[position])
+                           for position in block]
+
+    def _perturb_block(self, number: int, block: list) -> bool:
+        """
+        Move the parameters of a block jointly by the move drawn from the
+        block, a block of one parameter is moved as a single parameter
+
+        Parameters
+        ----------
+        number
+            number of the block
+
+        block
+            block from _parameter_block_generator
+
+        Returns
+        -------
+        True
+            If the written value of any parameter is changed
+
+        False
+            Otherwise, the parameters are restored to the previous values
+        """
+
+        if len(block) == 1:
+
+            position, idx, parameter, step_size, constraint = block[0]
+
+            return self._perturb_parameter(
+                parameter, idx, self._get_step_size(
+                    position, step_size, parameter[idx], constraint),
+                constraint)
+
+        self.__block_move = self.__parameter_blocks.draw(number)
+
+        return any([
+            self._perturb_parameter(
+                parameter, idx, self._get_step_size(
+                    position, step_size, parameter[idx], constraint),
+                constraint, move)
+            for move, (position, idx, parameter, step_size, constraint) in
+            zip(self.__block_move, block)])
+
+    @staticmethod
+    def _restore_block(block: list, values: list) -> None:
+        for (_, idx, parameter, _, _), value in zip(block, values):
+            parameter[idx] = value
+
+    def _record_block_move(self, number: int, block: list,
+                           accepted: Optional[bool]) -> None:
+        """
+        Store the move of an accepted block of more than one parameter
+
+        Parameters
+        ----------
+        number
+            number of the block
+
+        block
+            block from _parameter_block_generator
+
+        accepted
+            whether the trial is accepted
+
+        Returns
+        -------
+        None
+        """
+
+        if accepted and len(block) > 1:
+            self.__parameter_blocks.record(number, self.__block_move)
+
+    def _update_blocks(self, parameters: Any) -> None:
+        """
+        Record the relative change of the active parameters in units of
+        their step sizes since the last temperature step and learn the
+        blocks every interval of the steps
+
+        Parameters
+        ----------
+        parameters
+            current parameters
+
+        Returns
+        -------
+        None
+        """
+
+        if not self._is_block_moves():
+            return
+
+        values, step_size = (np.array(array, dtype='f8') for array in zip(*(
+            (parameter[idx], step) for idx, parameter, step, _ in (
+                self._package.next_parameter_generator(
+                    parameters, self._step_size, self._constraints,
+                    True)))))
+
+        if self.__block_reference is not None:
+
+            reference = self.__block_reference
+
+            self.__parameter_blocks.record_change(
+                (values - reference) /
+                (step_size * np.where(reference != 0, np.abs(reference),
+                                      1.0)))
+
+        self.__block_reference = values
+
+        if not self._completed_steps % self.__block_options['interval']:
+            self.__parameter_blocks.regroup()
+
+    def set_migration(self, migration: object) -> None:
+        """
+        Set the migration of the island, the solutions are exchanged with
+        the other islands after the temperature steps
+
+        Parameters
+        ----------
+        migration
+            object exchanging the solutions, e.g. RingMigration
+
+        Returns
+        -------
+        None
+        """
+
+        self.__migration = migration
+
+    def _exchange_solutions(self, emigrants: list) -> list:
+        """
+        Send the emigrants to and receive the immigrants from the other
+        islands after a temperature step
+
+        Parameters
+        ----------
+        emigrants
+            list of the solutions containing parameter and fitness
+
+        Returns
+        -------
+        immigrants
+            list of the solutions received, empty if the run is not an
+            island or the migration is not due
+        """
+
+        if self.__migration is None:
+            return []
+
+        return self.__migration.exchange(self._completed_steps, emigrants)
+
+    def __adaptive_temperature_generator(self, skip: int=0) -> Generator:
+        """
+        Generate temperature of the adaptive schedule until the temperature
+        is below the final temperature or the schedule stops, the schedule
+        is restarted unless the steps are skipped for resuming
+
+        Parameters
+        ----------
+        skip
+            number of temperature steps already completed
+
+        Yields
+        -----
+        temperature
+            the current temperature for the algorithm
+
+        step
+            the number of step for the algorithm
+        """
+
+        if skip == 0 or self.__schedule_state is None:
+            self.__schedule_state = {
+                'temperature': self.__initial_temperature, 'step': 0,
+                'stagnation': 0, 'reheats': 0, 'stopped': False,
+                'accepting_temperature': self.__initial_temperature}
+
+        state = self.__schedule_state
+
+        while (state['temperature'] > self.__final_temperature and
+               not state['stopped']):
+
+            step = state['step']
+
+            yield state['temperature'], step
+
+            if state['step'] == step:
+                self._update_temperature(0)
+
+    def _temperature_generator(self, skip: int=0) -> Generator:
+        """
+        Generate temperature base on the initial temperature ,final temperature
+        and the number of steps in the algorithm parameters, the adaptive
+        schedule is used if it is set
+
+        Parameters
+        ----------
+        skip
+            number of temperature steps already completed,
+            e.g. the completed steps of the resumed epoch
+
+        Yields
+        -----
+        temperature
+            the current temperature for the algorithm
+
+        step
+            the number of step for the algorithm
+        """
+
+        if self._is_adaptive_cooling():
+            yield from self.__adaptive_temperature_generator(skip)
+            return
+
+        temperature, first_step = self.__initial_temperature, 0
+
+        if skip > 0 and self.__temperature_state is not None:
+
+            # continue after the last completed step instead of replaying
+            # the steps, the cooling rate may be planned during them
+            temperature, first_step = self.__temperature_state
+
+            first_step, skip = first_step + 1, 0
+
+            if first_step == self.__number_of_steps:
+                temperature, first_step = (
+                    temperature * self.__cooling_rate, 0)
+
+        while temperature > self.__final_temperature:
+
+            for step in range(first_step, self.__number_of_steps):
+
+                if skip > 0:
+                    skip -= 1
+                else:
+                    self.__temperature_state = (temperature, step)
+                    yield temperature, step
+
+            temperature *= self.__cooling_rate
+
+            first_step = 0
+
+    def _save_checkpoint(self, state: dict) -> None:
+        """
+        Save the state of the run to the checkpoint atomically every
+        checkpoint interval of the completed temperature steps
+
+        Parameters
+        ----------
+        state
+            state of the running epoch from the subclass
+
+        Returns
+        -------
+        None
+
+        See Also
+        --------
+        cores.utilities.file_path.file_atomic_write
+        """
+
+        if (self.__checkpoint_interval <= 0 or
+                self._completed_steps % self.__checkpoint_interval):
+            return
+
+        checkpoint = {
+            'algorithm': type(self).__name__,
+            'epoch': self._current_epoch,
+            'completed_steps': self._completed_steps,
+            'beta': self._beta,
+            'changes_in_error': self._changes_in_error,
+            'random_state': np.random.get_state(),
+            'parameters': self._parameters,
+            'package_setting_train': self._package_setting_train,
+            'screening_fitness': self._screening_fitness,
+            'screening_statistics': self._screening_statistics,
+            'step_scales': self._step_scales,
+            'step_acceptance': self._step_acceptance,
+            'schedule_state': self.__schedule_state,
+            'temperature_state': self.__temperature_state,
+            'cooling_rate': self.__cooling_rate,
+            'number_of_epoch': self._number_of_epoch,
+            'parameter_blocks': (
+                None if self.__parameter_blocks is None else
+                self.__parameter_blocks.get_state()),
+            'molecules': list(
+                self._commands_holder_train.compiled_commands.keys()),
+            'training_frames': self._training_frames,
+            'step_size': self._step_size,
+            'state': state}
+
+        file_atomic_write(
+            self.__checkpoint_path,
+            lambda fp: pickle.dump(checkpoint, fp, pickle.HIGHEST_PROTOCOL))
+
+        logger.info(f'Save checkpoint to {self.__checkpoint_path}, '
+                    f'epoch: {self._current_epoch} '
+                    f'completed steps: {self._completed_steps}')
+
+    def __read_checkpoint(self, checkpoint_path: str,
+                          package_settings: dict) -> dict:
+        """
+        Read the checkpoint before the optimizer is initialized, the frames
+        and the step size selected by the run are passed in the package
+        settings so that they are not selected again
+
+        Parameters
+        ----------
+        checkpoint_path
+            file path of the checkpoint
+
+        package_settings
+            package settings of the optimizer
+
+        Returns
+        -------
+        checkpoint
+            content of the checkpoint
+
+        Raises
+        ------
+        ValueError
+            when the checkpoint is saved by another algorithm
+        """
+
+        file_is_file_path_valid(checkpoint_path)
+
+        with open(checkpoint_path, 'rb') as fp:
+            checkpoint = pickle.load(fp)
+
+        if checkpoint['algorithm'] != type(self).__name__:
+            raise ValueError(f'Checkpoint {checkpoint_path} is saved by '
+                             f'{checkpoint["algorithm"]}')
+
+        for key in ('training_frames', 'step_size'):
+            if checkpoint.get(key) is not None:
+                package_settings[key] = checkpoint[key]
+
+        return checkpoint
+
+    def __load_checkpoint(self, checkpoint: dict,
+                          checkpoint_path: str) -> None:
+        """
+        Restore the state shared by the simulated annealing algorithms from
+        the checkpoint, the state of the running epoch is kept in
+        _resume_state until _resume_from_checkpoint is called
+
+        Parameters
+        ----------
+        checkpoint
+            content of the checkpoint
+
+        checkpoint_path
+            file path of the checkpoint
+
+        Returns
+        -------
+        None
+        """
+
+        self._current_epoch = checkpoint['epoch']
+
+        self._completed_steps = checkpoint['completed_steps']
+
+        self._beta = checkpoint['beta']
+
+        self._changes_in_error = checkpoint['changes_in_error']
+
+        self._parameters = checkpoint['parameters']
+
+        self._package_setting_train = checkpoint['package_setting_train']
+
+        self._screening_fitness = checkpoint['screening_fitness']
+
+        self._screening_statistics = checkpoint['screening_statistics']
+
+        if checkpoint.get('step_scales') is not None:
+
+            self._step_scales = checkpoint['step_scales']
+
+            self._step_acceptance = checkpoint['step_acceptance']
+
+        self.__schedule_state = checkpoint.get('schedule_state')
+
+        self.__temperature_state = checkpoint.get('temperature_state')
+
+        self.__cooling_rate = checkpoint.get('cooling_rate',
+                                             self.__cooling_rate)
+
+        self._number_of_epoch = checkpoint.get('number_of_epoch',
+                                               self._number_of_epoch)
+
+        if self.__parameter_blocks is not None:
+            self.__parameter_blocks.set_state(
+                checkpoint.get('parameter_blocks'))
+
+        compiled_commands = self._commands_holder_train.compiled_commands
+
+        for molecule in set(compiled_commands) - set(checkpoint['molecules']):
+            compiled_commands.pop(molecule)
+
+        self._resume_state = checkpoint
+
+        logger.info(f'Resume from checkpoint {checkpoint_path}, '
+                    f'epoch: {self._current_epoch} '
+                    f'completed steps: {self._completed_steps}')
+
+    def _resume_from_checkpoint(self) -> Optional[dict]:
+        """
+        Restore the random state and return the state of the running epoch
+        saved in the checkpoint, the checkpoint is consumed once
+
+        Returns
+        -------
+        state
+            state of the running epoch from the subclass,
+            None if the run is not resumed
+        """
+
+        if self._resume_state is None:
+            return None
+
+        np.random.set_state(self._resume_state['random_state'])
+
+        state, self._resume_state = self._resume_state['state'], None
+
+        return state
+
+    def _perturb_parameter(self, parameter: np.ndarray, idx: int,
+                           step_size: float, constraint: tuple,
+                           move: Optional[float]=None) -> bool:
+        """
+        Move one parameter randomly within the step size and clamp it to the
+        constraint, the move is rolled back if the value written for the
+        evaluation is identical to the previous one, e.g. the move is rounded
+        away by the output precision or clamped back to the same bound
+
+        Parameters
+        ----------
+        parameter
+            the array of parameter to be moved
+
+        idx
+            index of the parameter inside the array
+
+        step_size
+            step size of the parameter
+
+        constraint
+            minimum and maximum value of the parameter
+
+        move
+            relative change in units of the step size in [-1, 1], drawn
+            uniformly if None
+
+        Returns
+        -------
+        True
+            If the written value of the parameter is changed
+
+        False
+            Otherwise, the parameter is restored to the previous value
+        """
+
+        rollback_value = parameter[idx]
+
+        if move is None:
+            move = np.random.uniform(-1, 1)
+
+        parameter[idx] *= 1 + (move * step_size)
+
+        parameter[idx] = min(max(parameter[idx], constraint[0]),
+                             constraint[1])
+
+        is_written_value_equal = getattr(
+            self._package, 'is_written_value_equal', operator.eq)
+
+        if is_written_value_equal(parameter[idx], rollback_value):
+            parameter[idx] = rollback_value
+            return False
+
+        return True
+
+    def _metropolis_criteria(self, change_in_error: float,
+                             temperature: float,
+                             random_number: Optional[float]=None) -> bool:
+        """
+        determine whether the new solution is accepted by the metropholis
+        criteria
+
+        Parameters
+        ----------
+        change_in_error
+            the difference of error between new solution and current solution
+        temperature
+            the current temperature in the simulated annealing algorithm
+        random_number
+            the random number between zero and one to be compared,
+            drawn if None, e.g. the screening and the full evaluation of
+            a trial share the same random number
+
+        Returns
+        -------
+        True
+            If the change in error is smaller than zero or
+            p_accept is greater than a random number
+            between zero and one
+
+        False
+            Otherwise
+        """
+
+        if change_in_error <= 0:
+            return True
+
+        if self._beta is None:
+            p_accept = self._acceptance_probability
+        else:
+            p_accept = min(
+                np.exp(-1 * change_in_error / self._beta / temperature), 1)
+
+        if random_number is None:
+            random_number = np.random.rand()
 
-        if (np.random.rand() < p_accept):
+        if (random_number < p_accept):
             return True
 
         return False
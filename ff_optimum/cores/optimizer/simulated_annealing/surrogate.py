@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+import math
+from typing import Union
+
+import numpy as np
+
+from ff_optimum.cores.utilities import EventLogger
+
+__all__ = ['GaussianProcessSurrogate']
+
+logger = EventLogger(__name__)
+
+
+class GaussianProcessSurrogate(object):
+
+    """
+    Class predicting the error of the parameters by a Gaussian process
+    regression trained online on the evaluated parameters
+
+    The inputs are the values of the active parameters divided by their
+    scale, the kernel is the squared exponential kernel whose length scale
+    is the median distance between the stored points. Only the latest
+    points are stored and the process is fitted again lazily before the
+    first prediction after new points are added.
+
+    Attributes
+    ----------
+    __scale: np.ndarray
+        scale of the active parameters
+
+    __capacity: int
+        maximum number of points to be stored
+
+    __minimum_points: int
+        minimum number of points for predicting
+
+    __noise: float
+        noise variance relative to the variance of the errors
+
+    __inputs: list
+        stored inputs
+
+    __errors: list
+        stored errors
+
+    __model: dict
+        fitted process, None if it is to be fitted again
+
+    Methods
+    -------
+    is_ready()
+        whether enough points are stored for predicting
+
+    add(values, error)
+        store an evaluated point
+
+    predict(values)
+        predict the mean and the standard deviation of the error
+
+    probability_below(values, threshold)
+        predict the probability of the error below the threshold
+    """
+
+    __slots__ = ['__scale', '__capacity', '__minimum_points', '__noise',
+                 '__inputs', '__errors', '__model']
+
+    def __init__(self, scale: np.ndarray, capacity: int=200,
+                 minimum_points: int=20, noise: float=1.0e-4) -> None:
+
+        self.__scale = np.asarray(scale, dtype='f8')
+
+        self.__capacity = capacity
+
+        self.__minimum_points = minimum_points
+
+        self.__noise = noise
+
+        self.__inputs, self.__errors = [], []
+
+        self.__model = None
+
+    def is_ready(self) -> bool:
+        return len(self.__errors) >= self.__minimum_points
+
+    def add(self, values: np.ndarray, error: float) -> None:
+        """
+        Store an evaluated point, the oldest point is dropped when the
+        capacity is reached
+
+        Parameters
+        ----------
+        values
+            values of the active parameters
+
+        error
+            evaluated error
+
+        Returns
+        -------
+        None
+        """
+
+        if not np.isfinite(error):
+            return
+
+        self.__inputs.append(np.asarray(values, dtype='f8') / self.__scale)
+
+        self.__errors.append(float(error))
+
+        if len(self.__errors) > self.__capacity:
+            del self.__inputs[0], self.__errors[0]
+
+        self.__model = None
+
+    def predict(self, values: np.ndarray) -> Union[float, float]:
+        """
+        Predict the error of the values
+
+        Parameters
+        ----------
+        values
+            values of the active parameters
+
+        Returns
+        -------
+        mean
+            predicted error
+
+        standard_deviation
+            standard deviation of the predicted error
+        """
+
+        if self.__model is None:
+            self.__model = self.__fit()
+
+        model = self.__model
+
+        kernel = model['variance'] * np.exp(
+            -0.5 * np.square(model['inputs'] -
+                             np.asarray(values, dtype='f8') /
+                             self.__scale).sum(axis=1) /
+            model['length_scale']**2)
+
+        mean = model['offset'] + kernel.dot(model['alpha'])
+
+        projection = np.linalg.solve(model['cholesky'], kernel)
+
+        variance = model['variance'] - projection.dot(projection)
+
+        return float(mean), math.sqrt(max(variance,
+                                          self.__noise * model['variance']))
+
+    def probability_below(self, values: np.ndarray,
+                          threshold: float) -> float:
+        """
+        Predict the probability of the error of the values below the
+        threshold
+
+        Parameters
+        ----------
+        values
+            values of the active parameters
+
+        threshold
+            threshold of the error
+
+        Returns
+        -------
+        probability
+        """
+
+        mean, standard_deviation = self.predict(values)
+
+        return 0.5 * math.erfc((mean - threshold) /
+                               (math.sqrt(2) * standard_deviation))
+
+    def __fit(self) -> dict:
+        """
+        Fit the process to the stored points
+
+        Returns
+        -------
+        model
+            dictionary containing the fitted process
+        """
+
+        inputs = np.array(self.__inputs)
+
+        errors = np.array(self.__errors)
+
+        distances = np.square(inputs[:, None, :] -
+                              inputs[None, :, :]).sum(axis=-1)
+
+        nonzero = distances[np.triu_indices(errors.size, 1)]
+
+        nonzero = nonzero[nonzero > 0]
+
+        length_scale = math.sqrt(np.median(nonzero)) if nonzero.size else 1.0
+
+        variance = max(float(errors.var()), np.finfo('f8').eps)
+
+        covariance = variance * (np.exp(-0.5 * distances / length_scale**2) +
+                                 self.__noise * np.eye(errors.size))
+
+        cholesky = np.linalg.cholesky(covariance)
+
+        offset = float(errors.mean())
+
+        alpha = np.linalg.solve(cholesky.T,
+                                np.linalg.solve(cholesky, errors - offset))
+
+        return {'inputs': inputs, 'length_scale': length_scale,
+                'variance': variance, 'cholesky': cholesky,
+                'offset': offset, 'alpha': alpha}
@@ -2,17 +2,31 @@
 from .argument_type_check import argument_type_check
 from .command_holder import CommandsHolder
 from .config_reader import ConfigReader
+from .evaluation_budget import EvaluationBudget
+from .evaluation_server import *
 from .event_logging import EventLogger
 from .exceptions import FileEmptyError, XmlNodeNotFoundError
 from .file_path import *
+from .mpi_world import *
 from .parallel_singleton import *
+from .parameters_snapshot import *
+from .worker_pool import *
 from .xml_parse import *
 
 __all__ = ['argument_type_check', 'CommandsHolder', 'ConfigReader',
-           'EventLogger', 'FileEmptyError', 'XmlNodeNotFoundError']
+           'EvaluationBudget', 'EventLogger', 'FileEmptyError',
+           'XmlNodeNotFoundError']
+
+__all__.extend(evaluation_server.__all__)
 
 __all__.extend(file_path.__all__)
 
+__all__.extend(mpi_world.__all__)
+
 __all__.extend(parallel_singleton.__all__)
 
+__all__.extend(parameters_snapshot.__all__)
+
+__all__.extend(worker_pool.__all__)
+
 __all__.extend(xml_parse.__all__)
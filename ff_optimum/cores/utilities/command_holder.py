@@ -18,7 +18,7 @@ class CommandsHolder(object):
 
     Methods
     -------
-    execute_commands(inputs)
+    execute_commands(inputs, **options)
         execute the compiled commands
 
     """
@@ -81,7 +81,7 @@ class CommandsHolder(object):
     def temp_directory(self, temp_directory) -> None:
         self.__temp_directory = temp_directory
 
-    def execute_commands(self, inputs: Any) -> Any:
+    def execute_commands(self, inputs: Any, **options: Any) -> Any:
         """
         The execute the executor function stored in the instance
 
@@ -90,10 +90,14 @@ class CommandsHolder(object):
         inputs
             extra inputs for the executor function
 
+        options
+            keyword options of the executor function, e.g. the fidelity
+            of the evaluation
+
         Returns
         -------
         the return values of the executor function
 
         """
         return self.__excutor(self.compiled_commands, inputs,
-                              self.__temp_directory)
+                              self.__temp_directory, **options)
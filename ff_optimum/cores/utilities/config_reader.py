@@ -15,7 +15,8 @@ logger = EventLogger(__name__)
 
 class ConfigReader(object):
 
-    __slots__ = ['__number_of_processors', '__profile', '__package_name',
+    __slots__ = ['__number_of_processors', '__profile', '__server',
+                 '__package_name',
                  '__package_settings', '__directory', '__temp_directory',
                  '__param_initial_values',
                  '__constraints_source', '__constraints_input',
@@ -34,6 +35,10 @@ class ConfigReader(object):
     profile: str
         The profile name for running ipyparallel
 
+    server: dict
+        The address and the authkey of the evaluation server, None if the
+        evaluations are computed by the optimizer process
+
     package_name: str
         The name of the package to be used during optimization
 
@@ -79,6 +84,7 @@ class ConfigReader(object):
 
         self.__number_of_processors = None
         self.__profile = None
+        self.__server = None
 
         self.__package_name = None
         self.__package_settings = None
@@ -111,6 +117,10 @@ class ConfigReader(object):
     def profile(self) -> str:
         return self.__profile
 
+    @property
+    def server(self) -> Optional[dict]:
+        return self.__server
+
     @property
     def package_name(self) -> str:
         return self.__package_name
@@ -282,10 +292,20 @@ class ConfigReader(object):
 
         else:
 
-            self.__number_of_processors = setting['number_of_processors']
+            self.__server = setting.get('server', None)
+
+            if isinstance(self.__server, str):
+                self.__server = {'address': self.__server}
+
+            self.__number_of_processors = setting.get(
+                'number_of_processors', 1 if self.__server else None)
 
             self.__profile = setting.get('profile', None)
 
+            if self.__number_of_processors is None:
+                raise ValueError('Number of processors is missing please '
+                                 'check the config')
+
         if self.__number_of_processors > 1 and self.__profile is None:
             raise ValueError('Profile is missing please check the config')
 
@@ -294,6 +314,9 @@ class ConfigReader(object):
         logger.info(f'number of processors: {self.__number_of_processors}, '
                     f'profile: {self.__profile}')
 
+        if self.__server:
+            logger.info(f'evaluation server: {self.__server["address"]}')
+
     def __read_package_setting(self, setting: dict) -> None:
         """
         Read package setting
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+import time
+from typing import Optional
+
+__all__ = ['EvaluationBudget']
+
+
+class EvaluationBudget(object):
+
+    """
+    Class tracking the wall time and the number of evaluations of an
+    optimization run against a budget
+
+    The cost of an evaluation is measured as the wall time since the first
+    evaluation is recorded divided by the number of evaluations, so the
+    overhead of the optimizer between the evaluations is included while
+    the setup before the first evaluation is not. A fraction of the wall
+    time is kept as the safety margin for writing the results.
+
+    Attributes
+    ----------
+    __wall_time: float
+        budget of the wall time in seconds, None if unlimited
+
+    __maximum_evaluations: int
+        budget of the number of evaluations, None if unlimited
+
+    __safety_margin: float
+        fraction of the wall time reserved for writing the results
+
+    __start_time: float
+        time the budget starts
+
+    __first_time: float
+        time the first evaluation is recorded
+
+    __number_of_evaluations: int
+        number of evaluations recorded
+
+    Methods
+    -------
+    from_config(options)
+        create the budget from the algorithm parameters
+
+    record(number_of_evaluations)
+        record evaluations
+
+    remaining_time()
+        wall time left before the safety margin
+
+    remaining_evaluations()
+        number of evaluations affordable within the budget
+    """
+
+    __slots__ = ['__wall_time', '__maximum_evaluations', '__safety_margin',
+                 '__start_time', '__first_time', '__number_of_evaluations']
+
+    def __init__(self, wall_time: Optional[float]=None,
+                 maximum_evaluations: Optional[int]=None,
+                 safety_margin: float=0.05) -> None:
+
+        self.__wall_time = wall_time
+
+        self.__maximum_evaluations = maximum_evaluations
+
+        self.__safety_margin = safety_margin
+
+        self.__start_time = time.time()
+
+        self.__first_time = None
+
+        self.__number_of_evaluations = 0
+
+    @classmethod
+    def from_config(cls, options: Optional[dict]) -> Optional[object]:
+        """
+        Create the budget from the budget section of the algorithm
+        parameters
+
+        Parameters
+        ----------
+        options
+            dictionary containing wall_time in seconds, evaluations and
+            safety_margin, None if the run is not budgeted
+
+        Returns
+        -------
+        EvaluationBudget
+            None if neither the wall time nor the evaluations are set
+        """
+
+        if not options or (options.get('wall_time') is None and
+                           options.get('evaluations') is None):
+            return None
+
+        wall_time, evaluations = (options.get('wall_time'),
+                                  options.get('evaluations'))
+
+        return cls(None if wall_time is None else float(wall_time),
+                   None if evaluations is None else int(evaluations),
+                   float(options.get('safety_margin', 0.05)))
+
+    @property
+    def number_of_evaluations(self) -> int:
+        return self.__number_of_evaluations
+
+    def elapsed_time(self) -> float:
+        return time.time() - self.__start_time
+
+    def average_cost(self) -> Optional[float]:
+        if not self.__number_of_evaluations:
+            return None
+
+        return ((time.time() - self.__first_time) /
+                self.__number_of_evaluations)
+
+    def record(self, number_of_evaluations: int=1) -> None:
+        if self.__first_time is None:
+            self.__first_time = time.time()
+
+        self.__number_of_evaluations += number_of_evaluations
+
+    def remaining_time(self) -> float:
+        """
+        Wall time left before the safety margin
+
+        Returns
+        -------
+        remaining_time
+            seconds left, infinity if the wall time is unlimited
+        """
+
+        if self.__wall_time is None:
+            return float('inf')
+
+        return (self.__wall_time * (1 - self.__safety_margin) -
+                self.elapsed_time())
+
+    def remaining_evaluations(self) -> float:
+        """
+        Number of evaluations affordable within the budget at the measured
+        cost of an evaluation
+
+        Returns
+        -------
+        remaining_evaluations
+            infinity if the budget is unlimited or nothing is measured
+        """
+
+        remaining = float('inf')
+
+        if self.__maximum_evaluations is not None:
+            remaining = (self.__maximum_evaluations -
+                         self.__number_of_evaluations)
+
+        cost = self.average_cost()
+
+        if self.__wall_time is not None and cost:
+            remaining = min(remaining, self.remaining_time() / cost)
+
+        return max(remaining, 0.0)
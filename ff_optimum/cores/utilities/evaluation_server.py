@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+import itertools
+from multiprocessing.connection import Client, Listener
+import os
+import signal
+import threading
+from typing import Callable, Optional, Union
+
+from ff_optimum.cores.utilities.event_logging import EventLogger
+from ff_optimum.cores.utilities.worker_pool import WorkerPool
+
+__all__ = ['EvaluationClient', 'EvaluationServer', 'parse_server_address']
+
+logger = EventLogger(__name__)
+
+
+def parse_server_address(address: str) -> Union[str, tuple]:
+    """
+    Parse the address of the evaluation server, host:port is the address
+    on localhost and any other string is the path of the Unix socket
+
+    Parameters
+    ----------
+    address
+        string of the address
+
+    Returns
+    -------
+    address
+        tuple of the host and the port or the path of the Unix socket
+    """
+
+    host, _, port = address.rpartition(':')
+
+    if host and port.isdigit():
+        return host, int(port)
+
+    return address
+
+
+class EvaluationServer(object):
+
+    """
+    Class of the local evaluation service owning the worker pool, the
+    optimizer processes connect to it and send their evaluations instead
+    of computing them
+
+    Every connection is served by its own thread mapping the tasks of its
+    requests on the pool, so the connected optimizers are scheduled round
+    robin and their identical tasks are computed once. One request carries
+    all the frames of an evaluation. The workers live as long as the server,
+    the LAMMPS instances of the frames are kept warm by the workers across
+    the optimizer runs and a new run starts from the resident frames.
+
+    The requests contain pickled functions, the server only listens on a
+    Unix socket only accessible by its owner or on localhost with the
+    authkey.
+
+    Attributes
+    ----------
+    __address: str or tuple
+        path of the Unix socket or tuple of the host and the port
+
+    __authkey: bytes
+        key authenticating the connections, None if not authenticated
+
+    __pool: WorkerPool
+        worker pool computing the tasks
+
+    __listener: Listener
+        listener accepting the connections
+
+    __counter: count
+        counter of the connections
+
+    Methods
+    -------
+    serve_forever()
+        start the pool and serve the connections until interrupted
+    """
+
+    __slots__ = ['__address', '__authkey', '__pool', '__listener',
+                 '__counter']
+
+    def __init__(self, address: str, number_of_workers: Optional[int]=None,
+                 authkey: Optional[str]=None) -> None:
+
+        self.__address = parse_server_address(address)
+
+        self.__authkey = None if authkey is None else authkey.encode()
+
+        if isinstance(self.__address, tuple):
+
+            if self.__address[0] not in ('localhost', '127.0.0.1'):
+                raise ValueError('Evaluation server only listens on '
+                                 'localhost')
+
+            if self.__authkey is None:
+                raise ValueError('Evaluation server on localhost requires '
+                                 'authkey')
+
+        self.__pool = WorkerPool(number_of_workers or os.cpu_count())
+
+        self.__listener = None
+
+        self.__counter = itertools.count()
+
+    def serve_forever(self) -> None:
+        """
+        Start the pool and accept the connections until the server is
+        interrupted or terminated, the pool and the socket are closed
+        afterward
+
+        Returns
+        -------
+        None
+        """
+
+        if isinstance(self.__address, str) and os.path.exists(
+                self.__address):
+            os.remove(self.__address)
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        self.__pool.start()
+
+        if isinstance(self.__address, str):
+
+            # the socket is created accessible by the owner only
+            mask = os.umask(0o177)
+
+            try:
+                self.__listener = Listener(self.__address,
+                                           authkey=self.__authkey)
+
+            finally:
+                os.umask(mask)
+
+            os.chmod(self.__address, 0o600)
+
+        else:
+            self.__listener = Listener(self.__address, authkey=self.__authkey)
+
+        logger.info(f'Evaluation server listens on {self.__address}')
+
+        try:
+
+            while True:
+
+                try:
+                    connection = self.__listener.accept()
+
+                except (OSError, EOFError) as e:
+                    logger.warning(f'Connection refused: {e}')
+                    continue
+
+                threading.Thread(
+                    name=f'client_{next(self.__counter)}',
+                    target=self.__serve_connection, args=(connection,),
+                    daemon=True).start()
+
+        except KeyboardInterrupt:
+            logger.info('Evaluation server is interrupted')
+
+        finally:
+
+            self.__listener.close()
+
+            self.__pool.shutdown()
+
+    def __serve_connection(self, connection: object) -> None:
+        """
+        Map the tasks of every request of the connection on the pool and
+        send the results back until the connection is closed
+
+        Parameters
+        ----------
+        connection
+            connection of an optimizer process
+
+        Returns
+        -------
+        None
+        """
+
+        name = threading.current_thread().name
+
+        logger.info(f'Evaluation server connected: {name}')
+
+        try:
+
+            while True:
+
+                function, arguments_list, keys, affinities = \
+                    connection.recv()
+
+                try:
+                    connection.send((True, self.__pool.map(
+                        function, arguments_list, keys, affinities)))
+
+                except RuntimeError as e:
+                    connection.send((False, str(e)))
+
+        except (EOFError, OSError):
+            logger.info(f'Evaluation server disconnected: {name}')
+
+        finally:
+            connection.close()
+
+
+class EvaluationClient(object):
+
+    """
+    Class of the connection of an optimizer process to the evaluation
+    server, it maps the tasks as the worker pool does so the evaluations
+    are sent to the server when the client is set as the worker pool
+
+    Attributes
+    ----------
+    __address: str or tuple
+        path of the Unix socket or tuple of the host and the port
+
+    __connection: Connection
+        connection to the server
+
+    __lock: Lock
+        lock of the connection shared by the threads of the process
+
+    Methods
+    -------
+    map(function, arguments_list, keys=None, affinities=None)
+        compute the tasks by the server and wait for their results
+
+    close()
+        close the connection
+    """
+
+    __slots__ = ['__address', '__connection', '__lock']
+
+    def __init__(self, address: str, authkey: Optional[str]=None) -> None:
+
+        self.__address = parse_server_address(address)
+
+        self.__connection = Client(
+            self.__address, authkey=None if authkey is None else
+            authkey.encode())
+
+        self.__lock = threading.Lock()
+
+        logger.info(f'Connected to evaluation server: {self.__address}')
+
+    def map(self, function: Callable, arguments_list: list,
+            keys: Optional[list]=None,
+            affinities: Optional[list]=None) -> list:
+        """
+        Send the tasks to the server as one request and wait for their
+        results
+
+        Parameters
+        ----------
+        function
+            picklable function of the tasks
+
+        arguments_list
+            list of the tuple of the arguments of every task
+
+        keys
+            hashable key of every task, the tasks with the same key have the
+            same result, None if the tasks are not shared
+
+        affinities
+            hashable affinity of every task, the tasks with the same
+            affinity run on the same worker, None if any worker is used
+
+        Returns
+        -------
+        results
+            list of the results in the order of the tasks, None for the
+            failed task
+
+        Raises
+        ------
+        RuntimeError
+            If the worker pool of the server fails
+        """
+
+        with self.__lock:
+
+            self.__connection.send((function, arguments_list, keys,
+                                    affinities))
+
+            succeeded, results = self.__connection.recv()
+
+        if not succeeded:
+            raise RuntimeError(f'Evaluation server failed: {results}')
+
+        return results
+
+    def close(self) -> None:
+        self.__connection.close()
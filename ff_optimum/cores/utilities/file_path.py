@@ -5,17 +5,72 @@ import os.path
 from pathlib import Path
 import platform
 import stat
-from typing import Optional, Union
+import tempfile
+from typing import Callable, Optional, Union
 
 from ff_optimum.cores.utilities.argument_type_check import argument_type_check
 from ff_optimum.cores.utilities.exceptions import FileEmptyError
 
-__all__ = ['file_create_directory', 'file_get_filenames_from_directory',
+__all__ = ['file_atomic_write', 'file_create_directory',
+           'file_get_filenames_from_directory',
            'file_get_filename_from_path', 'file_get_home_directory',
            'file_is_directory_valid', 'file_is_file_path_valid',
            'file_read_json', 'file_remove_file', 'file_set_path']
 
 
+def file_atomic_write(file_path: str, write: Callable,
+                      mode: str='wb') -> None:
+    """
+    Write the file atomically, the content is written to a temporary file in
+    the same directory which then replaces the target file, so that the
+    target file is either the previous one or the complete new one
+
+    Parameters
+    ----------
+    file_path
+          a string containing the file path
+
+    write
+          callable writing the content to the file object
+
+    mode
+          mode for opening the temporary file
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    utilities.file_system.file_path.file_create_directory
+    """
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+
+    file_create_directory(directory)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_')
+
+    try:
+
+        with os.fdopen(fd, mode) as fp:
+
+            write(fp)
+
+            fp.flush()
+
+            os.fsync(fp.fileno())
+
+        os.replace(temp_path, file_path)
+
+    except BaseException:
+
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        raise
+
+
 @argument_type_check
 def file_create_directory(directory: Union[str, Path]) -> None:
     """
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+import atexit
+import traceback
+from typing import Callable, Optional
+
+from ff_optimum.cores.utilities.event_logging import EventLogger
+
+__all__ = ['start_mpi_world', 'is_mpi_ready', 'get_mpi_communicator',
+           'run_on_mpi_ranks', 'shutdown_mpi_world']
+
+logger = EventLogger(__name__)
+
+_MPI = None
+
+_MPI_READY = False
+
+
+def start_mpi_world() -> bool:
+    """
+    Start the MPI world of the program launched by mpirun, the rank 0 runs
+    the optimizer and the other ranks serve the evaluations broadcast by
+    the rank 0 until the world is shut down
+
+    Returns
+    -------
+    is_root
+        True on the rank 0 or if the program is not launched by mpirun,
+        False on the other ranks after the world is shut down
+
+    Notes
+    -----
+    mpi4py is imported here, so MPI is only initialized by the programs
+    starting the world
+    """
+
+    global _MPI, _MPI_READY
+
+    try:
+        from mpi4py import MPI
+
+    except ImportError:
+        logger.warning('mpi4py is not found, evaluating without MPI')
+        return True
+
+    _MPI, comm = MPI, MPI.COMM_WORLD
+
+    if comm.Get_size() == 1:
+        return True
+
+    if comm.Get_rank() == 0:
+
+        _MPI_READY = True
+
+        logger.info(f'MPI world starts, number of ranks: {comm.Get_size()}')
+
+        return True
+
+    while True:
+
+        task = comm.bcast(None, root=0)
+
+        if task is None:
+            break
+
+        comm.gather(__call_function(*task), root=0)
+
+    return False
+
+
+def is_mpi_ready() -> bool:
+    """
+    Returns
+    -------
+    True on the rank 0 of the started MPI world otherwise False
+    """
+
+    return _MPI_READY
+
+
+def get_mpi_communicator(local: bool=False) -> Optional[object]:
+    """
+    Parameters
+    ----------
+    local
+        whether the communicator of the rank itself is returned
+
+    Returns
+    -------
+    communicator
+        the world or the rank itself, None if the world is not started
+    """
+
+    if _MPI is None:
+        return None
+
+    return _MPI.COMM_SELF if local else _MPI.COMM_WORLD
+
+
+def run_on_mpi_ranks(function: Callable, arguments: tuple) -> list:
+    """
+    Run the function on all the ranks of the MPI world including the
+    rank 0, the function decides the work of the rank by the rank number
+
+    Parameters
+    ----------
+    function
+        picklable function called collectively by the ranks
+
+    arguments
+        tuple of the arguments broadcast to the ranks
+
+    Returns
+    -------
+    results
+        list of the return values according to the rank
+
+    Raises
+    ------
+    RuntimeError
+        if the function raises on any rank, after all the ranks have
+        returned, with the tracebacks of the failed ranks
+    """
+
+    comm = _MPI.COMM_WORLD
+
+    comm.bcast((function, arguments), root=0)
+
+    outcomes = comm.gather(__call_function(function, arguments), root=0)
+
+    failures = [f'rank {rank}:\n{result}'
+                for rank, (succeeded, result) in enumerate(outcomes)
+                if not succeeded]
+
+    if failures:
+        raise RuntimeError(f'{function.__name__} failed on '
+                           f'{len(failures)} MPI ranks\n'
+                           + '\n'.join(failures))
+
+    return [result for _, result in outcomes]
+
+
+def __call_function(function: Callable, arguments: tuple) -> tuple:
+    """
+    Call the function on the rank, the exception is caught so the rank
+    still takes part in the gather and the world does not hang
+
+    Parameters
+    ----------
+    function
+        function called by the rank
+
+    arguments
+        tuple of the arguments of the function
+
+    Returns
+    -------
+    outcome
+        tuple of True and the return value, or False and the traceback
+    """
+
+    try:
+        return True, function(*arguments)
+
+    except Exception:
+        return False, traceback.format_exc()
+
+
+@atexit.register
+def shutdown_mpi_world() -> None:
+    """
+    Release the other ranks of the MPI world when the program terminates
+
+    Returns
+    -------
+    None
+    """
+
+    global _MPI_READY
+
+    if _MPI_READY:
+
+        _MPI_READY = False
+
+        _MPI.COMM_WORLD.bcast(None, root=0)
+
+        logger.info('MPI world shuts down')
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+from typing import Optional
+
+import numpy as np
+
+from ff_optimum.cores.utilities.event_logging import EventLogger
+from ff_optimum.cores.utilities.file_path import (file_atomic_write,
+                                                  file_is_file_path_valid,
+                                                  file_set_path)
+
+__all__ = ['save_parameters_snapshot', 'load_parameters_snapshot',
+           'export_parameters_snapshot']
+
+logger = EventLogger(__name__)
+
+
+def save_parameters_snapshot(file_path: str, parameters_matrix: np.ndarray,
+                             layout: tuple,
+                             objectives_values: Optional[np.ndarray]=None,
+                             objectives_names: Optional[list]=None) -> None:
+    """
+    Save a batch of flattened parameters and their objectives to one
+    binary snapshot file in npz format, the file is written atomically
+
+    Parameters
+    ----------
+    file_path
+        file path of the snapshot
+
+    parameters_matrix
+        matrix of the flattened parameters, one row per solution
+
+    layout
+        layout of the flattened parameters, tuple of
+        (category name, key, number of values)
+
+    objectives_values
+        matrix of the objectives values, one row per solution
+
+    objectives_names
+        names of the objectives
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    load_parameters_snapshot
+    cores.utilities.file_path.file_atomic_write
+    """
+
+    parameters_matrix = np.atleast_2d(np.asarray(parameters_matrix,
+                                                 dtype='f8'))
+
+    if objectives_values is None:
+        objectives_values = np.zeros((parameters_matrix.shape[0], 0))
+
+    if objectives_names is None:
+        objectives_names = []
+
+    categories, keys, sizes = (zip(*layout) if layout else ((), (), ()))
+
+    arrays = {
+        'parameters': parameters_matrix,
+        'layout_category': np.array(categories, dtype=str),
+        'layout_key': np.array(keys, dtype=str),
+        'layout_size': np.array(sizes, dtype=int),
+        'objectives_values': np.atleast_2d(
+            np.asarray(objectives_values, dtype='f8')),
+        'objectives_names': np.array(list(objectives_names), dtype=str)}
+
+    file_atomic_write(file_path, lambda fp: np.savez(fp, **arrays))
+
+    logger.info(f'Save {parameters_matrix.shape[0]} solutions to snapshot '
+                f'{file_path} sucess')
+
+
+def load_parameters_snapshot(file_path: str) -> dict:
+    """
+    Load the snapshot saved by save_parameters_snapshot
+
+    Parameters
+    ----------
+    file_path
+        file path of the snapshot
+
+    Returns
+    -------
+    snapshot
+        dictionary containing parameters, layout, objectives_values and
+        objectives_names
+
+    See Also
+    --------
+    save_parameters_snapshot
+    """
+
+    file_is_file_path_valid(file_path)
+
+    with np.load(file_path) as data:
+
+        layout = tuple(
+            (str(category), str(key), int(size)) for category, key, size in
+            zip(data['layout_category'], data['layout_key'],
+                data['layout_size']))
+
+        return {'parameters': data['parameters'], 'layout': layout,
+                'objectives_values': data['objectives_values'],
+                'objectives_names': data['objectives_names']}
+
+
+def export_parameters_snapshot(file_path: str, package: callable,
+                               directory: str) -> int:
+    """
+    Export the solutions in the snapshot to parameters files of the package
+    and the fitness files, i.e. ffield_k and fitness_k in the directory
+
+    Parameters
+    ----------
+    file_path
+        file path of the snapshot
+
+    package
+        module of the user package providing unflatten_parameters and
+        save_parameters_to_file
+
+    directory
+        directory of the exported files
+
+    Returns
+    -------
+    count
+        number of solutions exported
+
+    See Also
+    --------
+    load_parameters_snapshot
+    """
+
+    snapshot = load_parameters_snapshot(file_path)
+
+    names = ' '.join(snapshot['objectives_names'])
+
+    for count, (values, objectives) in enumerate(zip(
+            snapshot['parameters'], snapshot['objectives_values'])):
+
+        parameters = package.unflatten_parameters(values, snapshot['layout'])
+
+        package.save_parameters_to_file(
+            parameters, file_set_path(directory, f'ffield_{count}'))
+
+        if objectives.size:
+
+            with open(file_set_path(directory, f'fitness_{count}'),
+                      'w+') as fp:
+
+                fp.write(f'{names} \n')
+
+                fp.write(np.array2string(
+                    objectives,
+                    formatter={'float_kind': lambda x: '%8.6f' % x}))
+
+    logger.info(f'Export {len(snapshot["parameters"])} solutions from '
+                f'{file_path} to {directory}')
+
+    return len(snapshot['parameters'])
@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+import collections
+import copy
+import itertools
+import multiprocessing
+import threading
+from typing import Any, Callable, Optional
+
+from ff_optimum.cores.utilities.event_logging import EventLogger
+
+__all__ = ['WorkerPool', 'get_worker_pool', 'is_worker_pool_ready',
+           'set_worker_pool']
+
+logger = EventLogger(__name__)
+
+_WORKER_POOL = None
+
+
+def _serve_worker(number: int, tasks: object, results: object) -> None:
+    """
+    Run the tasks of one worker process until the sentinel None is received
+
+    Parameters
+    ----------
+    number
+        number of the worker
+
+    tasks
+        queue of the tasks of the worker, a task is the tuple of its key,
+        the function and the arguments
+
+    results
+        queue of the results of all the workers
+
+    Returns
+    -------
+    None
+    """
+
+    while True:
+
+        task = tasks.get()
+
+        if task is None:
+            break
+
+        key, function, arguments = task
+
+        try:
+            result = function(*arguments)
+
+        except Exception as e:
+
+            logger.error(f'Task failed on worker {number}: {e}')
+
+            result = None
+
+        results.put((number, key, result))
+
+
+class WorkerPool(object):
+
+    """
+    Class of the persistent worker processes shared by the optimization
+    jobs, the tasks of the jobs are scheduled fairly and the identical
+    tasks are computed once
+
+    Every job is the thread calling map, its pending tasks are queued
+    separately and the workers are fed round robin over the jobs, so a job
+    submitting many frames does not delay the other jobs. A task with an
+    affinity always runs on the same worker, e.g. a frame is kept warm by
+    one worker for all the jobs. A task with a key is shared by the jobs
+    submitting the same key while it is pending or running, and its result
+    is kept in a small cache for the jobs submitting it later.
+
+    Attributes
+    ----------
+    __number_of_workers: int
+        number of the worker processes
+
+    __capacity: int
+        number of the tasks sent to a worker before its results return
+
+    __cache_size: int
+        maximum number of the results kept in the cache
+
+    __processes: list
+        worker processes
+
+    __task_queues: list
+        task queue of every worker
+
+    __result_queue: Queue
+        result queue of all the workers
+
+    __collector: Thread
+        thread receiving the results
+
+    __condition: Condition
+        condition guarding the states below and notifying the jobs
+
+    __pending: OrderedDict
+        queue of the pending tasks according to the job
+
+    __waiting: dict
+        tickets waiting for the result according to the task key
+
+    __loads: list
+        number of the tasks sent to every worker
+
+    __cache: OrderedDict
+        cached results according to the task key
+
+    __counter: count
+        counter of the keys of the tasks without key
+
+    __statistics: Counter
+        number of the submitted, computed, shared and cached tasks
+
+    Methods
+    -------
+    start()
+        start the worker processes
+
+    shutdown()
+        stop the worker processes
+
+    map(function, arguments_list, keys=None, affinities=None)
+        compute the tasks and wait for their results
+    """
+
+    __slots__ = ['__number_of_workers', '__capacity', '__cache_size',
+                 '__processes', '__task_queues', '__result_queue',
+                 '__collector', '__condition', '__pending', '__waiting',
+                 '__loads', '__cache', '__counter', '__statistics']
+
+    def __init__(self, number_of_workers: int, capacity: int=2,
+                 cache_size: int=1024) -> None:
+
+        self.__number_of_workers = max(1, number_of_workers)
+
+        self.__capacity = max(1, capacity)
+
+        self.__cache_size = cache_size
+
+        self.__processes, self.__task_queues = [], []
+
+        self.__result_queue, self.__collector = None, None
+
+        self.__condition = threading.Condition()
+
+        self.__pending = collections.OrderedDict()
+
+        self.__waiting = {}
+
+        self.__loads = [0] * self.__number_of_workers
+
+        self.__cache = collections.OrderedDict()
+
+        self.__counter = itertools.count()
+
+        self.__statistics = collections.Counter()
+
+    @property
+    def number_of_workers(self) -> int:
+        return self.__number_of_workers
+
+    @property
+    def statistics(self) -> dict:
+        return dict(self.__statistics)
+
+    def start(self) -> None:
+        """
+        Start the worker processes and the thread receiving their results
+
+        Returns
+        -------
+        None
+        """
+
+        context = multiprocessing.get_context('spawn')
+
+        self.__result_queue = context.Queue()
+
+        for number in range(self.__number_of_workers):
+
+            tasks = context.Queue()
+
+            process = context.Process(
+                target=_serve_worker, name=f'worker_{number}',
+                args=(number, tasks, self.__result_queue), daemon=True)
+
+            process.start()
+
+            self.__task_queues.append(tasks)
+
+            self.__processes.append(process)
+
+        self.__collector = threading.Thread(
+            name='collector', target=self.__collect, daemon=True)
+
+        self.__collector.start()
+
+        logger.info(f'Worker pool starts, number of workers: '
+                    f'{self.__number_of_workers}')
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes after their sent tasks are finished
+
+        Returns
+        -------
+        None
+        """
+
+        for tasks in self.__task_queues:
+            tasks.put(None)
+
+        for process in self.__processes:
+            process.join()
+
+        if self.__collector is not None:
+            self.__result_queue.put(None)
+            self.__collector.join()
+
+        self.__processes, self.__task_queues = [], []
+
+        logger.info(f'Worker pool shuts down, tasks: {self.statistics}')
+
+    def map(self, function: Callable, arguments_list: list,
+            keys: Optional[list]=None,
+            affinities: Optional[list]=None) -> list:
+        """
+        Compute the tasks by the workers and wait for their results, the
+        calling thread is the job the tasks are scheduled for
+
+        Parameters
+        ----------
+        function
+            picklable function of the tasks
+
+        arguments_list
+            list of the tuple of the arguments of every task
+
+        keys
+            hashable key of every task, the tasks with the same key have the
+            same result, None if the tasks are not shared
+
+        affinities
+            hashable affinity of every task, the tasks with the same
+            affinity run on the same worker, None if any worker is used
+
+        Returns
+        -------
+        results
+            list of the results in the order of the tasks, None for the
+            failed task
+        """
+
+        job = threading.current_thread().name
+
+        keys = keys or [None] * len(arguments_list)
+
+        affinities = affinities or [None] * len(arguments_list)
+
+        tickets = [{'done': False, 'result': None} for _ in arguments_list]
+
+        with self.__condition:
+
+            for ticket, arguments, key, affinity in zip(
+                    tickets, arguments_list, keys, affinities):
+                self.__submit(job, ticket, function, arguments, key,
+                              affinity)
+
+            self.__dispatch()
+
+            while not all(ticket['done'] for ticket in tickets):
+
+                if not self.__condition.wait(10) and not all(
+                        process.is_alive() for process in self.__processes):
+                    raise RuntimeError('Worker process of the pool died')
+
+        return [ticket['result'] for ticket in tickets]
+
+    def __submit(self, job: str, ticket: dict, function: Callable,
+                 arguments: tuple, key: Any, affinity: Any) -> None:
+        """
+        Queue a task of the job, the ticket is completed from the cache or
+        attached to the task with the same key if there is one, the task
+        without key is given a unique key
+
+        Returns
+        -------
+        None
+        """
+
+        self.__statistics['submitted'] += 1
+
+        shared = key is not None
+
+        key = (shared, key if shared else next(self.__counter))
+
+        if key in self.__cache:
+
+            self.__cache.move_to_end(key)
+
+            ticket['result'] = copy.deepcopy(self.__cache[key])
+
+            ticket['done'] = True
+
+            self.__statistics['cached'] += 1
+
+            return
+
+        elif key in self.__waiting:
+
+            self.__waiting[key].append(ticket)
+
+            self.__statistics['shared'] += 1
+
+            return
+
+        self.__waiting[key] = [ticket]
+
+        worker = (None if affinity is None else
+                  hash(affinity) % self.__number_of_workers)
+
+        self.__pending.setdefault(job, collections.deque()).append(
+            (key, function, arguments, worker))
+
+    def __dispatch(self) -> None:
+        """
+        Send the pending tasks to the workers with free capacity, the jobs
+        are served round robin and the served job is moved to the end
+
+        Returns
+        -------
+        None
+        """
+
+        sent = True
+
+        while sent and self.__pending:
+
+            sent = False
+
+            for job in list(self.__pending.keys()):
+
+                tasks = self.__pending[job]
+
+                for position, (key, function, arguments,
+                               worker) in enumerate(tasks):
+
+                    if worker is None:
+                        worker = min(range(self.__number_of_workers),
+                                     key=self.__loads.__getitem__)
+
+                    if self.__loads[worker] < self.__capacity:
+                        break
+
+                else:
+                    continue
+
+                del tasks[position]
+
+                self.__task_queues[worker].put((key, function, arguments))
+
+                self.__loads[worker] += 1
+
+                self.__pending.move_to_end(job)
+
+                if not tasks:
+                    del self.__pending[job]
+
+                sent = True
+
+                break
+
+    def __collect(self) -> None:
+        """
+        Receive the results of the workers, complete the waiting tickets and
+        send the next pending tasks
+
+        Returns
+        -------
+        None
+        """
+
+        while True:
+
+            message = self.__result_queue.get()
+
+            if message is None:
+                break
+
+            worker, key, result = message
+
+            with self.__condition:
+
+                self.__loads[worker] -= 1
+
+                self.__statistics['computed'] += 1
+
+                tickets = self.__waiting.pop(key, [])
+
+                for number, ticket in enumerate(tickets):
+
+                    ticket['result'] = (copy.deepcopy(result) if number
+                                        else result)
+
+                    ticket['done'] = True
+
+                if key[0] and result is not None and self.__cache_size:
+
+                    self.__cache[key] = copy.deepcopy(result)
+
+                    if len(self.__cache) > self.__cache_size:
+                        self.__cache.popitem(last=False)
+
+                self.__dispatch()
+
+                self.__condition.notify_all()
+
+
+def set_worker_pool(pool: Optional[object]) -> None:
+    """
+    Set the worker pool computing the evaluations of the process, None to
+    stop using it
+
+    Parameters
+    ----------
+    pool
+        started worker pool shared by the optimization jobs or the client
+        of the evaluation server
+
+    Returns
+    -------
+    None
+    """
+
+    global _WORKER_POOL
+
+    _WORKER_POOL = pool
+
+
+def get_worker_pool() -> Optional[object]:
+    return _WORKER_POOL
+
+
+def is_worker_pool_ready() -> bool:
+    """
+    Returns
+    -------
+    True if the worker pool is set otherwise False
+    """
+
+    return _WORKER_POOL is not None
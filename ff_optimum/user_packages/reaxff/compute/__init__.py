@@ -1,13 +1,50 @@
 # -*- coding: utf-8 -*-
 from .compute_angles_distances_volumes import *
-from .compute_errors import compute_error_reaxff
-from .compute_values import compute_values_lammps
+from .compute_charges import (ChargeEquilibrationSolver,
+                              prepare_reaxff_commands_holder)
+from .compute_errors import compute_error_reaxff, compute_residuals_reaxff
+from .compute_sensitivities import (compute_parameters_sensitivities,
+                                    select_reaxff_step_size, trim_step_size)
+from .compute_values import (compute_average_qeq_iterations,
+                             compute_values_lammps,
+                             compute_values_lammps_batch, pop_qeq_statistics,
+                             relocate_lammps_commands_holder)
+from .frame_geometry import FrameGeometry
+from .frame_scheduling import estimate_frame_cost, plan_frame_ranks
+from .frame_selection import (ActiveFrameSelector,
+                              reduce_reaxff_training_frames)
+from .response_model import (FirstOrderResponseModel,
+                             create_reaxff_response_model)
+from .result_block import SharedResultBlock, get_shared_result_block
 from .simulation_box import SimulationBox
 
-__all__ = ['compute_values', 'compute_errors', 'SimulationBox']
+__all__ = ['compute_values', 'compute_errors', 'SimulationBox',
+           'FrameGeometry', 'ChargeEquilibrationSolver',
+           'prepare_commands_holder', 'compute_average_qeq_iterations',
+           'ActiveFrameSelector', 'reduce_training_frames',
+           'compute_values_batch', 'compute_parameters_sensitivities',
+           'trim_step_size', 'select_step_size', 'compute_residuals',
+           'FirstOrderResponseModel', 'create_response_model',
+           'relocate_commands_holder', 'estimate_frame_cost',
+           'plan_frame_ranks', 'SharedResultBlock',
+           'get_shared_result_block', 'pop_qeq_statistics']
 
 __all__.extend(compute_angles_distances_volumes.__all__)
 
 compute_values = compute_values_lammps
 
+compute_values_batch = compute_values_lammps_batch
+
 compute_errors = compute_error_reaxff
+
+compute_residuals = compute_residuals_reaxff
+
+prepare_commands_holder = prepare_reaxff_commands_holder
+
+reduce_training_frames = reduce_reaxff_training_frames
+
+select_step_size = select_reaxff_step_size
+
+create_response_model = create_reaxff_response_model
+
+relocate_commands_holder = relocate_lammps_commands_holder
@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+import functools
+from typing import Any, Optional
+
+import numpy as np
+
+from ff_optimum.cores.utilities import EventLogger
+from ff_optimum.user_packages.reaxff.compute.compute_values import (
+    compute_values_lammps)
+from ff_optimum.user_packages.reaxff.io.write_force_field import (
+    get_reactive_force_field_precision)
+from ff_optimum.user_packages.reaxff.optimization_setting.parameters import (
+    REAXFF_TYPE_PARAMS)
+
+__all__ = ['ChargeEquilibrationSolver', 'prepare_reaxff_commands_holder']
+
+logger = EventLogger(__name__)
+
+QEQ_CUTOFF = 10.0
+
+QEQ_COULOMB_CONSTANT = 14.4
+
+QEQ_VALIDATION_TOLERANCE = 1.0e-3
+
+QEQ_PARAMS_INDICES = {name: REAXFF_TYPE_PARAMS.index(name)
+                      for name in ('gammaEEM', 'chiEEM', 'etaEEM')}
+
+
+class ChargeEquilibrationSolver(object):
+
+    """
+    Class solving the charge equilibration (QEq) of all the frames with
+    numpy, equivalent to fix qeq/reax of LAMMPS used in the compiled
+    commands
+
+    The pair distances within the cutoff, periodic images included, are
+    taken once from the precomputed frame geometries. For each evaluation
+    only the shielded Coulomb matrices are rebuilt and the frames of the
+    same size are solved as one batch of linear systems.
+
+    The instance can be used as the excutor of CommandsHolder.
+
+    Attributes
+    ----------
+    __cutoff: float
+        cutoff of the taper function
+
+    __systems: list
+        list of dictionaries storing the precomputed pair data of the frames
+        grouped by molecule and number of atoms
+
+    Methods
+    -------
+    compute_charges(parameters)
+        compute the charges of all the frames
+
+    validate(compiled_commands, parameters, temp_directory)
+        compare the charges with the charges calculated by LAMMPS
+    """
+
+    __slots__ = ['__cutoff', '__systems']
+
+    def __init__(self, compiled_commands: dict,
+                 cutoff: float=QEQ_CUTOFF) -> None:
+
+        self.__cutoff = cutoff
+
+        self.__systems = self.__precompute_systems(compiled_commands)
+
+    def __call__(self, compiled_commands: dict, parameters: dict,
+                 temp_directory: str, molecules: Optional[list]=None,
+                 frames: Optional[dict]=None, **options: Any) -> dict:
+        return self.compute_charges(parameters, molecules, frames)
+
+    def compute_charges(self, parameters: dict,
+                        molecules: Optional[list]=None,
+                        frames: Optional[dict]=None) -> dict:
+        """
+        Compute the charges of the frames
+
+        The EEM parameters are rounded to the precision of the force field
+        written for LAMMPS so that both evaluators see the same values.
+        The linear systems are solved directly, the tolerance options of
+        the iterative solver in LAMMPS do not apply.
+
+        Parameters
+        ----------
+        parameters
+            ReaxFF parameters
+
+        molecules
+            names of the molecules to be computed, all if None
+
+        frames
+            dictionary of frame indices according to the molecule name,
+            the systems are solved in full and the indexed frames are
+            returned, all if None
+
+        Returns
+        -------
+        calculated_values
+            dictionary of list containing the calculated value according to
+            the molecule name, only the charges are calculated
+
+        See Also
+        --------
+        ChargeEquilibrationSolver.__solve_system
+        """
+
+        calculated_values = {}
+
+        if molecules is not None:
+            molecules = {molecule.lower() for molecule in molecules}
+
+        for system in self.__systems:
+
+            if molecules is not None and system['molecule'] not in molecules:
+                continue
+
+            results = calculated_values.setdefault(
+                system['molecule'], [None] * system['number_of_frames'])
+
+            charges = self.__solve_system(system, parameters)
+
+            for idx, frame, name, step in zip(
+                    system['frame_indices'], charges, system['names'],
+                    system['steps']):
+                results[idx] = {'name': name, 'step': step, 'q': frame,
+                                'fx': None, 'fy': None, 'fz': None,
+                                'stress': None, 'energy': None}
+
+        if frames is not None:
+            calculated_values = {
+                molecule: ([results[idx] for idx in frames[molecule]]
+                           if molecule in frames else results)
+                for molecule, results in calculated_values.items()}
+
+        return calculated_values
+
+    def validate(self, compiled_commands: dict, parameters: dict,
+                 temp_directory: str) -> float:
+        """
+        Compare the charges with the charges calculated by LAMMPS
+
+        Parameters
+        ----------
+        compiled_commands
+            compiled commands the instance is built from
+
+        parameters
+            ReaxFF parameters
+
+        temp_directory
+            temporary directory for LAMMPS
+
+        Returns
+        -------
+        deviation
+            maximum absolute deviation of the charges
+        """
+
+        reference = compute_values_lammps(compiled_commands, parameters,
+                                          temp_directory)
+
+        calculated = self.compute_charges(parameters)
+
+        deviation = 0.0
+
+        for molecule, frames in reference.items():
+            for frame, other in zip(frames, calculated[molecule]):
+                if frame is not None and frame['q'] is not None:
+                    deviation = max(deviation, float(
+                        np.abs(frame['q'] - other['q']).max()))
+
+        return deviation
+
+    def __solve_system(self, system: dict, parameters: dict) -> np.ndarray:
+        """
+        Solve the charges of the frames in one system
+
+        H s = -chi and H t = -1 are solved together and the charges
+        q = s - (sum(s) / sum(t)) t are neutral. The diagonal of H is
+        2 etaEEM as in ReaxFF, the off diagonal elements are the tapered
+        and shielded Coulomb interactions summed over the periodic images.
+
+        Parameters
+        ----------
+        system
+            precomputed pair data of the frames
+
+        parameters
+            ReaxFF parameters
+
+        Returns
+        -------
+        charges
+            charges of the frames, one row per frame
+        """
+
+        precision = get_reactive_force_field_precision()
+
+        values = np.round(np.array(
+            [parameters['atoms'][element]['value']
+             for element in system['elements']])[
+                :, list(QEQ_PARAMS_INDICES.values())], precision)
+
+        gamma, chi, eta = values[:, 0], values[:, 1], values[:, 2]
+
+        number_of_frames, number_of_atoms = system['types'].shape
+
+        shielding = (gamma[system['type_i']] *
+                     gamma[system['type_j']])**-1.5
+
+        hamiltonian = np.bincount(
+            system['flat_indices'],
+            weights=(system['taper'] /
+                     np.cbrt(system['cubic_distances'] + shielding)),
+            minlength=number_of_frames * number_of_atoms**2).reshape(
+                number_of_frames, number_of_atoms, number_of_atoms)
+
+        diagonal = np.einsum('fii->fi', hamiltonian)
+
+        diagonal += 2.0 * eta[system['types']]
+
+        rhs = np.stack([-chi[system['types']],
+                        -np.ones((number_of_frames, number_of_atoms))],
+                       axis=-1)
+
+        solution = np.linalg.solve(hamiltonian, rhs)
+
+        s, t = solution[..., 0], solution[..., 1]
+
+        return s - (s.sum(axis=1) / t.sum(axis=1))[:, None] * t
+
+    def __precompute_systems(self, compiled_commands: dict) -> list:
+        """
+        Precompute the pair data of all the frames grouped by molecule and
+        number of atoms
+
+        Parameters
+        ----------
+        compiled_commands
+            dictionary of list containing the compiled commands according to
+            the molecule name
+
+        Returns
+        -------
+        systems
+            list of dictionaries storing the precomputed pair data
+        """
+
+        systems = []
+
+        for molecule_name, frames in compiled_commands.items():
+
+            groups = {}
+
+            for idx, frame in enumerate(frames):
+                groups.setdefault(frame['geometry'].number_of_atoms,
+                                  []).append(idx)
+
+            for number_of_atoms, indices in groups.items():
+
+                geometries = [frames[idx]['geometry'] for idx in indices]
+
+                names, steps = zip(*(
+                    frames[idx]['trace_info'][-1].split('#')[-1].split(' ')
+                    for idx in indices))
+
+                pairs = [geometry.get_pairs(self.__cutoff)[:3]
+                         for geometry in geometries]
+
+                types = np.stack([geometry.types for geometry in geometries])
+
+                frame_of_pairs = np.repeat(
+                    np.arange(len(indices)), [pair[0].size for pair in pairs])
+
+                pair_i, pair_j, distances = (
+                    np.concatenate(values) for values in zip(*pairs))
+
+                systems.append({
+                    'molecule': molecule_name.lower(),
+                    'number_of_frames': len(frames),
+                    'frame_indices': indices, 'names': names, 'steps': steps,
+                    'elements': geometries[0].elements, 'types': types,
+                    'type_i': types[frame_of_pairs, pair_i],
+                    'type_j': types[frame_of_pairs, pair_j],
+                    'flat_indices': (
+                        (frame_of_pairs * number_of_atoms + pair_i) *
+                        number_of_atoms + pair_j),
+                    'taper': (QEQ_COULOMB_CONSTANT *
+                              self.__compute_taper(distances)),
+                    'cubic_distances': distances**3})
+
+            logger.info(f'{molecule_name}: {len(frames)} frames '
+                        'precomputed for charge equilibration')
+
+        return systems
+
+    def __compute_taper(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Compute the 7th order taper function of ReaxFF with zero inner
+        cutoff
+
+        Parameters
+        ----------
+        distances
+            distances of the pairs
+
+        Returns
+        -------
+        taper
+            values of the taper function
+        """
+
+        x = distances / self.__cutoff
+
+        return 1.0 + x**4 * (-35.0 + x * (84.0 + x * (-70.0 + x * 20.0)))
+
+
+def prepare_reaxff_commands_holder(holder: object, settings: dict,
+                                   parameters: dict) -> None:
+    """
+    Prepare the commands holder for training according to the engine in
+    the package settings
+
+    With engine 'qeq' and only charge objectives, the charges are computed
+    by ChargeEquilibrationSolver instead of LAMMPS. The solver is validated
+    against LAMMPS once with the initial parameters, LAMMPS is kept if the
+    deviation is larger than QEQ_VALIDATION_TOLERANCE. When LAMMPS is used
+    with warm_start, the LAMMPS instances of the frames are kept between
+    evaluations, an integer warm_start bounds the number of kept instances.
+
+    Parameters
+    ----------
+    holder
+        CommandsHolder object storing the compiled commands for training
+
+    settings
+        package settings for training
+
+    parameters
+        initial ReaxFF parameters
+
+    Returns
+    -------
+    None
+    """
+
+    if settings.get('engine', 'lammps') == 'qeq' and \
+            __prepare_charge_equilibration_solver(holder, settings,
+                                                  parameters):
+        return
+
+    warm_start = settings.get('warm_start', False)
+
+    if warm_start:
+
+        logger.info('Warm start of LAMMPS instances is enabled')
+
+        holder.excutor = functools.partial(compute_values_lammps,
+                                           warm_start=warm_start)
+
+
+def __prepare_charge_equilibration_solver(holder: object, settings: dict,
+                                          parameters: dict) -> bool:
+    """
+    Set ChargeEquilibrationSolver as the excutor of the commands holder if
+    the objectives are charges only and the solver agrees with LAMMPS
+
+    Parameters
+    ----------
+    holder
+        CommandsHolder object storing the compiled commands for training
+
+    settings
+        package settings for training
+
+    parameters
+        initial ReaxFF parameters
+
+    Returns
+    -------
+    prepared
+        whether the solver is set
+    """
+
+    others = [objective for objective in settings['objectives'].keys()
+              if not objective.endswith('charge')]
+
+    if others:
+        logger.warning(f'Engine qeq only computes charges, objectives: '
+                       f'{others} require LAMMPS')
+        return False
+
+    solver = ChargeEquilibrationSolver(holder.compiled_commands)
+
+    deviation = solver.validate(holder.compiled_commands, parameters,
+                                holder.temp_directory)
+
+    logger.info(f'Maximum charge deviation from LAMMPS: {deviation:.3e}')
+
+    if deviation > QEQ_VALIDATION_TOLERANCE:
+        logger.warning('Charge equilibration deviates from LAMMPS, '
+                       'LAMMPS is used')
+        return False
+
+    holder.excutor = solver
+
+    return True
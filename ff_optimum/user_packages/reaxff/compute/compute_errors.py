@@ -13,7 +13,7 @@ from ff_optimum.user_packages.reaxff.visualize import (
     print_formation_energy_one_mol)
 
 
-__all__ = ['compute_error_reaxff']
+__all__ = ['compute_error_reaxff', 'compute_residuals_reaxff']
 
 
 def compute_error_reaxff(calculated_values: dict,
@@ -65,6 +65,61 @@ def compute_error_reaxff(calculated_values: dict,
     return Fitness(fitness.keys(), np.fromiter(fitness.values(), dtype='f8'))
 
 
+def compute_residuals_reaxff(calculated_values: dict, training_datas: dict,
+                             settings: dict) -> np.ndarray:
+    """
+    Compute the residuals between LAMMPS calculated values and DFT training
+    datas of all the objectives, e.g. for least squares
+
+    The residuals of an objective are scaled by the square root of the
+    weight of its objective type over their number, so the sum of squares
+    of an objective is its weighted mean squared error.
+
+    Parameters
+    ----------
+    calculated_values
+        values calculated by LAMMPS
+
+    training_datas
+        DFT training data
+
+    settings
+        optimization settings
+
+    Returns
+    -------
+    residuals
+        residuals of all the objectives
+
+    See Also
+    --------
+    REAXFF_RESIDUAL_FUNCTIONS
+    """
+
+    weights = settings['weights']
+
+    if weights is None:
+        weights = [1.0] * len(ReaxFFObjectives)
+
+    residuals = []
+
+    for objective_name, objective_function in settings['objectives'].items():
+        for function_name, function in REAXFF_RESIDUAL_FUNCTIONS.items():
+            if objective_name.endswith(function_name):
+
+                mol_name = objective_name.split(f'_{function_name}')[0]
+
+                weight = weights[ReaxFFObjectives[function_name].value]
+
+                values = function(calculated_values, training_datas,
+                                  mol_name, objective_function, settings)
+
+                if weight and values is not None and values.size:
+                    residuals.append(np.sqrt(weight / values.size) * values)
+
+    return np.concatenate(residuals) if residuals else np.zeros(0)
+
+
 def __compute_error_reaxff_one_objective(
         calculated_values: dict, training_datas: dict,
         settings: dict, objective_name: str,
@@ -334,6 +389,55 @@ def __compute_error_in_formation_energy(
     setting
         optimization setting
 
+    See Also
+    --------
+    __compute_formation_energies
+    """
+
+    mol_weight = setting['mol_weights'].get(mol_name, 1.0)
+
+    calculated_formation, target_formation = __compute_formation_energies(
+        calculated_values, training_datas, mol_name, function, setting)
+
+    error = np.abs(calculated_formation - target_formation)
+
+    if not setting['slient']:
+        print_formation_energy_one_mol(
+            mol_name, setting['composition'], calculated_formation,
+            target_formation, error)
+
+    return error * mol_weight
+
+
+def __compute_formation_energies(calculated_values: dict,
+                                 training_datas: dict, mol_name: str,
+                                 function: str, setting: dict) -> tuple:
+    """
+    Compute the calculated and the target formation energy
+
+    Parameters
+    ----------
+    calculated_values
+        values computed by LAMMPS
+
+    training_datas
+        DFT traininng datas
+
+    mol_name
+        Name of the molecule
+
+    function
+        the function to be used for computing formation energy
+
+    setting
+        optimization setting
+
+    Returns
+    -------
+    calculated_formation
+
+    target_formation
+
     See Also
     --------
     __get_minimum_energy
@@ -342,8 +446,6 @@ def __compute_error_in_formation_energy(
 
     dependencies = setting['dependencies']
 
-    mol_weight = setting['mol_weights'].get(mol_name, 1.0)
-
     if dependencies[mol_name] is not None:
 
         calculated_formation = __compute_formation_energy(
@@ -359,14 +461,7 @@ def __compute_error_in_formation_energy(
 
         target_formation = eval(function)
 
-    error = np.abs(calculated_formation - target_formation)
-
-    if not setting['slient']:
-        print_formation_energy_one_mol(
-            mol_name, setting['composition'], calculated_formation,
-            target_formation, error)
-
-    return error * mol_weight
+    return calculated_formation, target_formation
 
 
 def __get_minimum_energy(molecule: list) -> float:
@@ -531,3 +626,240 @@ REAXFF_OBJECTIVE_FUNCTIONS = {'charge': __compute_error_in_charge,
                               'formation': __compute_error_in_formation_energy,
                               'force': __compute_error_in_force,
                               'stress': __compute_error_in_stress}
+
+
+def __compute_residuals_in_energy(calculated_values: dict,
+                                  training_datas: dict, mol_name: str,
+                                  function: str, setting: dict) -> np.ndarray:
+    """
+    Compute the residuals of the energies relative to the frame with the
+    lowest target energy
+
+    Parameters
+    ----------
+    calculated_values
+        values computed by LAMMPS
+
+    training_datas
+        DFT traininng datas
+
+    mol_name
+        Name of the molecule
+
+    function
+        type of error function, unused
+
+    setting
+        optimization setting, unused
+
+    Returns
+    -------
+    residuals
+    """
+
+    target_energies = np.array([frame['energy'] for frame in
+                                training_datas[mol_name]], dtype='f8')
+
+    calculated_eneregies = np.array([frame['energy'] for frame in
+                                     calculated_values[mol_name]],
+                                    dtype='f8')
+
+    min_idx = np.argmin(target_energies)
+
+    return ((calculated_eneregies - calculated_eneregies[min_idx]) -
+            (target_energies - target_energies[min_idx]))
+
+
+def __compute_residuals_in_formation_energy(
+        calculated_values: dict, training_datas: dict, mol_name: str,
+        function: str, setting: dict) -> np.ndarray:
+    """
+    Compute the residual of the formation energy
+
+    Parameters
+    ----------
+    calculated_values
+        values computed by LAMMPS
+
+    training_datas
+        DFT traininng datas
+
+    mol_name
+        Name of the molecule
+
+    function
+        the function to be used for computing formation energy
+
+    setting
+        optimization setting
+
+    Returns
+    -------
+    residuals
+
+    See Also
+    --------
+    __compute_formation_energies
+    """
+
+    calculated_formation, target_formation = __compute_formation_energies(
+        calculated_values, training_datas, mol_name, function, setting)
+
+    return (np.atleast_1d(calculated_formation - target_formation) *
+            setting['mol_weights'].get(mol_name, 1.0))
+
+
+def __compute_residuals_from_lammps_results(calculated_values: list,
+                                            training_datas: list,
+                                            keys: tuple) -> np.ndarray:
+    """
+    Compute the residuals of the values of the keys
+
+    Parameters
+    ----------
+    calculated_values
+        calculated values of the molecule
+
+    training_datas
+        training data of the molecule
+
+    keys
+        keys of the values
+
+    Returns
+    -------
+    residuals
+        None if the values are not calculated
+    """
+
+    residuals = []
+
+    for calculated, target in zip(calculated_values, training_datas):
+        for key in keys:
+
+            if calculated.get(key) is None:
+                return None
+
+            residuals.append(np.ravel(calculated[key]) -
+                             np.ravel(target[key]))
+
+    return np.concatenate(residuals)
+
+
+def __compute_residuals_in_charge(
+        calculated_values: dict, training_datas: dict, mol_name: str,
+        function: str, setting: dict) -> np.ndarray:
+    """
+    Compute the residuals of the charges
+
+    Parameters
+    ----------
+    calculated_values
+        values computed by LAMMPS
+
+    training_datas
+        DFT traininng datas
+
+    mol_name
+        Name of the molecule
+
+    function
+        type of error function, unused
+
+    setting
+        optimization setting, unused
+
+    Returns
+    -------
+    residuals
+
+    See Also
+    --------
+    __compute_residuals_from_lammps_results
+    """
+
+    return __compute_residuals_from_lammps_results(
+        calculated_values[mol_name], training_datas[mol_name],
+        ('q',))
+
+
+def __compute_residuals_in_force(
+        calculated_values: dict, training_datas: dict, mol_name: str,
+        function: str, setting: dict) -> np.ndarray:
+    """
+    Compute the residuals of the forces
+
+    Parameters
+    ----------
+    calculated_values
+        values computed by LAMMPS
+
+    training_datas
+        DFT traininng datas
+
+    mol_name
+        Name of the molecule
+
+    function
+        type of error function, unused
+
+    setting
+        optimization setting, unused
+
+    Returns
+    -------
+    residuals
+
+    See Also
+    --------
+    __compute_residuals_from_lammps_results
+    """
+
+    return __compute_residuals_from_lammps_results(
+        calculated_values[mol_name], training_datas[mol_name],
+        ('fx', 'fy', 'fz'))
+
+
+def __compute_residuals_in_stress(
+        calculated_values: dict, training_datas: dict, mol_name: str,
+        function: str, setting: dict) -> np.ndarray:
+    """
+    Compute the residuals of the stresses
+
+    Parameters
+    ----------
+    calculated_values
+        values computed by LAMMPS
+
+    training_datas
+        DFT traininng datas
+
+    mol_name
+        Name of the molecule
+
+    function
+        type of error function, unused
+
+    setting
+        optimization setting, unused
+
+    Returns
+    -------
+    residuals
+
+    See Also
+    --------
+    __compute_residuals_from_lammps_results
+    """
+
+    return __compute_residuals_from_lammps_results(
+        calculated_values[mol_name], training_datas[mol_name],
+        ('stress',))
+
+
+REAXFF_RESIDUAL_FUNCTIONS = {
+    'charge': __compute_residuals_in_charge,
+    'energy': __compute_residuals_in_energy,
+    'formation': __compute_residuals_in_formation_energy,
+    'force': __compute_residuals_in_force,
+    'stress': __compute_residuals_in_stress}
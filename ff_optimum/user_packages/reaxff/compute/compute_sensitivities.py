@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+import copy
+from typing import Optional
+
+import numpy as np
+
+from ff_optimum.cores.utilities import EventLogger
+from ff_optimum.user_packages.reaxff.compute.compute_errors import (
+    compute_error_reaxff)
+from ff_optimum.user_packages.reaxff.compute.compute_values import (
+    compute_values_lammps_batch)
+
+__all__ = ['compute_parameters_sensitivities', 'trim_step_size',
+           'select_reaxff_step_size']
+
+logger = EventLogger(__name__)
+
+SENSITIVITY_PERTURBATION = 0.1
+
+SENSITIVITY_THRESHOLD = 0.01
+
+
+def compute_parameters_sensitivities(
+        compiled_commands: dict, training_datas: dict, settings: dict,
+        parameters: dict, step_size: dict, constraints: dict,
+        temp_directory: str,
+        perturbation: float=SENSITIVITY_PERTURBATION) -> dict:
+    """
+    Compute the sensitivities of the errors to the parameters with nonzero
+    step size by central finite differences
+
+    A candidate parameter is moved up and down by the perturbation in units
+    of its step size in every entry of its category, as the step size is
+    shared by the entries. All the perturbed parameters are computed as one
+    batch across the engines. The sensitivity is the largest relative
+    change of the objectives per step size.
+
+    Parameters
+    ----------
+    compiled_commands
+        dictionary of list containing the compiled commands according to the
+        molecule name
+
+    training_datas
+        DFT training data
+
+    settings
+        package settings for training
+
+    parameters
+        ReaxFF parameters
+
+    step_size
+        step size of the parameters
+
+    constraints
+        constraints of the parameters
+
+    temp_directory
+        temporary directory of the force field files
+
+    perturbation
+        size of the finite differences in units of the step size
+
+    Returns
+    -------
+    sensitivities
+        dictionary of the sensitivities according to the tuple of the
+        category name and the parameter name
+
+    See Also
+    --------
+    reaxff.compute.compute_values.compute_values_lammps_batch
+    """
+
+    settings = dict(settings, weights=None, slient=True)
+
+    candidates = [(category_name, idx, name)
+                  for category_name, category in step_size.items()
+                  for idx, (name, value) in enumerate(category) if value]
+
+    parameters_list = [parameters]
+
+    for category_name, idx, _ in candidates:
+
+        relative = perturbation * step_size[category_name]['value'][idx]
+
+        parameters_list.extend(
+            __perturb_parameter_of_category(
+                parameters, constraints, category_name, idx, sign * relative)
+            for sign in (1, -1))
+
+    errors = np.array([
+        compute_error_reaxff(calculated, training_datas,
+                             settings).objectives_values
+        for calculated in compute_values_lammps_batch(
+            compiled_commands, parameters_list, temp_directory)])
+
+    reference = np.abs(errors[0])
+
+    valid = reference < np.finfo('f8').max
+
+    sensitivities = {}
+
+    for count, (category_name, idx, name) in enumerate(candidates):
+
+        difference = np.abs(errors[2 * count + 1] - errors[2 * count + 2])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative_change = np.where(
+                reference[valid] > 0,
+                difference[valid] / reference[valid], difference[valid])
+
+        sensitivities[(category_name, name)] = float(
+            np.nan_to_num(relative_change.max(initial=0.0)) /
+            (2 * perturbation))
+
+    return sensitivities
+
+
+def trim_step_size(step_size: dict, sensitivities: dict,
+                   threshold: float=SENSITIVITY_THRESHOLD,
+                   number_of_parameters: Optional[int]=None) -> dict:
+    """
+    Trim the step size to the sensitive parameters, the step size of the
+    other parameters is set to zero so they are not moved by
+    next_parameter_generator
+
+    Parameters
+    ----------
+    step_size
+        step size of the parameters
+
+    sensitivities
+        sensitivities computed by compute_parameters_sensitivities
+
+    threshold
+        minimum sensitivity relative to the largest one
+
+    number_of_parameters
+        maximum number of parameters to be kept, all if None
+
+    Returns
+    -------
+    step_size
+        trimmed copy of the step size
+    """
+
+    ranking = sorted(sensitivities.items(), key=lambda item: -item[1])
+
+    largest = ranking[0][1] if ranking else 0.0
+
+    kept = [key for key, sensitivity in ranking[:number_of_parameters]
+            if largest > 0 and sensitivity >= threshold * largest]
+
+    step_size = copy.deepcopy(step_size)
+
+    for category_name, category in step_size.items():
+        for idx, name in enumerate(category['name']):
+            if (category_name, name) not in kept:
+                category['value'][idx] = 0.0
+
+    for (category_name, name), sensitivity in ranking:
+        logger.info(f'Sensitivity {category_name} {name}: '
+                    f'{sensitivity:.4e} '
+                    f'{"kept" if (category_name, name) in kept else "fixed"}')
+
+    return step_size
+
+
+def select_reaxff_step_size(holder: object, training_datas: dict,
+                            settings: dict, parameters: dict,
+                            step_size: dict,
+                            constraints: dict) -> Optional[dict]:
+    """
+    Trim the step size by the sensitivities if sensitivity_analysis is set
+    in the package settings
+
+    Parameters
+    ----------
+    holder
+        CommandsHolder object storing the compiled commands for training
+
+    training_datas
+        DFT training data
+
+    settings
+        package settings for training
+
+    parameters
+        initial ReaxFF parameters
+
+    step_size
+        step size of the parameters
+
+    constraints
+        constraints of the parameters
+
+    Returns
+    -------
+    step_size
+        trimmed step size, None if the sensitivities are not analyzed
+
+    See Also
+    --------
+    compute_parameters_sensitivities
+    trim_step_size
+    """
+
+    options = settings.get('sensitivity_analysis')
+
+    if not options:
+        return None
+
+    sensitivities = compute_parameters_sensitivities(
+        holder.compiled_commands, training_datas, settings, parameters,
+        step_size, constraints, holder.temp_directory,
+        float(options.get('perturbation', SENSITIVITY_PERTURBATION)))
+
+    number_of_parameters = options.get('number_of_parameters', None)
+
+    return trim_step_size(
+        step_size, sensitivities,
+        float(options.get('threshold', SENSITIVITY_THRESHOLD)),
+        None if number_of_parameters is None else int(number_of_parameters))
+
+
+def __perturb_parameter_of_category(parameters: dict, constraints: dict,
+                                    category_name: str, idx: int,
+                                    relative: float) -> dict:
+    """
+    Move one parameter of every entry of the category relatively and clamp
+    it to the constraint
+
+    Parameters
+    ----------
+    parameters
+        ReaxFF parameters
+
+    constraints
+        constraints of the parameters
+
+    category_name
+        name of the category
+
+    idx
+        index of the parameter inside the category
+
+    relative
+        relative change of the parameter
+
+    Returns
+    -------
+    parameters
+        perturbed copy of the parameters
+    """
+
+    parameters = copy.deepcopy(parameters)
+
+    lower_bound = constraints[category_name]['lower_bound'][idx]
+
+    upper_bound = constraints[category_name]['upper_bound'][idx]
+
+    for values in parameters[category_name].values():
+        values['value'][idx] = min(max(values['value'][idx] * (1 + relative),
+                                       lower_bound), upper_bound)
+
+    return parameters
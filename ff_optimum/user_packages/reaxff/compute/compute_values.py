@@ -1,21 +1,52 @@
 # -*- coding: utf-8 -*-
-import copy
+import atexit
+import collections
+import hashlib
 import os
 import platform
+import threading
+import time
+from typing import Optional, Union
 
 from lammps import lammps
 import numpy as np
 
-from ff_optimum.user_packages.reaxff.io import save_parameters_to_file
+from ff_optimum.user_packages.reaxff.compute.frame_scheduling import (
+    MINIMUM_ATOMS_PER_RANK, estimate_frame_cost, plan_frame_ranks)
+from ff_optimum.user_packages.reaxff.compute.result_block import (
+    SharedResultBlock, get_shared_result_block)
+from ff_optimum.user_packages.reaxff.io import write_parameters_for_evaluation
+from ff_optimum.user_packages.reaxff.io.write_force_field import (
+    get_reactive_force_field_precision, set_reactive_force_field_precision)
 from ff_optimum.cores.utilities import (
-    EventLogger, file_set_path, get_client, is_client_ready)
+    EventLogger, file_set_path, get_client, get_mpi_communicator,
+    get_worker_pool, is_client_ready, is_mpi_ready, is_worker_pool_ready,
+    run_on_mpi_ranks)
 
 
 logger = EventLogger(__name__)
 
-__all__ = ['compute_values_lammps']
+__all__ = ['compute_values_lammps', 'compute_values_lammps_batch',
+           'compute_average_qeq_iterations', 'pop_qeq_statistics',
+           'relocate_lammps_commands_holder']
 
 
+LAMMPS_COMMAND_KEYS = ('before_pair_coeff', 'pair_coeff', 'after_pair_coeff')
+
+LAMMPS_INSTANCES_CACHE = 256
+
+__LAMMPS_INSTANCES = collections.OrderedDict()
+
+MPI_PLANS_CACHE = 8
+
+__MPI_PLANS = collections.OrderedDict()
+
+__MPI_GROUP = {}
+
+__FRAME_COSTS = {}
+
+__QEQ_STATISTICS = {}
+
 REAXFF_SUBENERGY = {'eb': 1, 'ea': 2, 'elp': 3, 'ev': 5,
                     'epen': 6, 'ecoa': 7, 'ehb': 8, 'et': 9,
                     'eco': 10, 'ew': 11, 'ep': 12, 'eqeq': 14}
@@ -46,11 +77,18 @@ def __extract_sub_energy_from_lammps(lmp: lammps) -> dict:
 
 
 def compute_values_lammps(lammps_commands_dict: dict,
-                          parameters: dict, temp_directory: str) -> dict:
+                          parameters: dict, temp_directory: str,
+                          qeq_tolerance: Optional[float]=None,
+                          molecules: Optional[list]=None,
+                          frames: Optional[dict]=None,
+                          warm_start: Union[bool, int]=False) -> dict:
     """
     Compute values of multi-frame of input lammps_commands by LAMMPS
 
-    If the Singleton Client of ipyparallel is ready the value will be
+    If the worker pool shared by the optimization jobs or the client of
+    the evaluation server is set the value will be calculated by it, else
+    if the MPI world is started the value will be calculated by the ranks,
+    else if the Singleton Client of ipyparallel is ready the value will be
     calulated parallely otherwise, it will be calculated serially.
 
     Parameters
@@ -62,6 +100,27 @@ def compute_values_lammps(lammps_commands_dict: dict,
     parameters
           ReaxFF parameters
 
+    temp_directory
+          temporary directory of the force field file
+
+    qeq_tolerance
+          tolerance of the charge equilibration replacing the compiled one,
+          e.g. a looser tolerance for cheap screening
+
+    molecules
+          names of the molecules to be computed, all if None
+
+    frames
+          dictionary of frame indices according to the molecule name,
+          only the indexed frames are computed, all if None
+
+    warm_start
+          keep the LAMMPS instance of each frame and only read the force
+          field again in the next evaluation, the charge equilibration
+          then starts from the history of the previous charges, an integer
+          is the maximum number of instances kept by each process, True
+          keeps at most LAMMPS_INSTANCES_CACHE
+
     Returns
     -------
     calculated_values
@@ -70,25 +129,389 @@ def compute_values_lammps(lammps_commands_dict: dict,
 
     See Also
     --------
+    reaxff.compute.compute_values.__select_lammps_commands
+    reaxff.compute.compute_values.__compute_values_lammps_multi_frame_pool
+    reaxff.compute.compute_values.__compute_values_lammps_multi_frame_mpi
     reaxff.compute.compute_values.__compute_values_lammps_multi_frame_parallel
     reaxff.compute.compute_values.__compute_values_lammps_multi_frame_serial
-    reaxff.io.write_force_field.save_force_field_to_file
+    reaxff.io.write_force_field.write_reactive_force_field_from_template
     utilities.parallel.ipyparallel_singleton.is_client_ready
     """
 
     force_field_path = file_set_path(temp_directory, 'ffield_temp')
 
-    save_parameters_to_file(parameters, force_field_path)
+    write_parameters_for_evaluation(parameters, force_field_path)
+
+    lammps_commands_dict = __select_lammps_commands(
+        lammps_commands_dict, qeq_tolerance, molecules, frames)
+
+    if is_worker_pool_ready():
+        calculated_values = __compute_values_lammps_multi_frame_pool(
+            lammps_commands_dict, warm_start, force_field_path)
+
+    elif is_mpi_ready():
+        calculated_values = __compute_values_lammps_multi_frame_mpi(
+            lammps_commands_dict, warm_start)
+
+    elif is_client_ready():
+        calculated_values = __compute_values_lammps_multi_frame_parallel(
+            lammps_commands_dict, warm_start)
+
+    else:
+        calculated_values = __compute_values_lammps_multi_frame_serial(
+            lammps_commands_dict, warm_start)
+
+    __record_qeq_iterations(calculated_values)
+
+    return calculated_values
+
+
+def compute_average_qeq_iterations(calculated_values: dict) -> float:
+    """
+    Compute the average number of charge equilibration iterations per
+    frame of the calculated values
+
+    Parameters
+    ----------
+    calculated_values
+          dictionary of list containing the calculated value according to the
+          molecule name
+
+    Returns
+    -------
+    average_iterations
+          average number of iterations, nan if it is not available
+    """
+
+    iterations = [frame['qeq_iterations']
+                  for frames in calculated_values.values()
+                  for frame in frames
+                  if frame is not None and
+                  frame.get('qeq_iterations') is not None]
+
+    return float(np.mean(iterations)) if iterations else np.nan
+
+
+def __record_qeq_iterations(calculated_values: dict) -> None:
+    """
+    Accumulate the charge equilibration iterations of the calculated
+    frames into the statistics of the calling thread, i.e. of the job when
+    several jobs run side by side in the process
+
+    Parameters
+    ----------
+    calculated_values
+          dictionary of list containing the calculated value according to the
+          molecule name
+
+    Returns
+    -------
+    None
+    """
+
+    iterations = [frame['qeq_iterations']
+                  for frames in calculated_values.values()
+                  for frame in frames
+                  if frame is not None and
+                  frame.get('qeq_iterations') is not None]
+
+    statistics = __QEQ_STATISTICS.setdefault(
+        threading.current_thread().name, {'frames': 0, 'iterations': 0.0})
+
+    statistics['frames'] += len(iterations)
+
+    statistics['iterations'] += float(np.sum(iterations))
+
+
+def pop_qeq_statistics() -> dict:
+    """
+    Get the charge equilibration statistics accumulated by the calling
+    thread since its last call and reset them
+
+    Returns
+    -------
+    statistics
+          dictionary of the number of frames and the average number of
+          iterations per frame, nan if no frame reports its iterations
+    """
+
+    statistics = __QEQ_STATISTICS.pop(threading.current_thread().name,
+                                      {'frames': 0, 'iterations': 0.0})
+
+    frames, iterations = statistics['frames'], statistics['iterations']
+
+    return {'frames': frames,
+            'average_iterations': iterations / frames if frames else np.nan}
+
+
+def compute_values_lammps_batch(lammps_commands_dict: dict,
+                                parameters_list: list,
+                                temp_directory: str) -> list:
+    """
+    Compute values of a batch of parameters, e.g. the perturbed parameters
+    of finite differences
+
+    Every parameters of the batch is written to its own force field file
+    and computed serially on one engine of ipyparallel, so the batch is
+    computed concurrently. The batch is computed serially if the client is
+    not ready.
+
+    Parameters
+    ----------
+    lammps_commands_dict
+          dictionary of list containing the LAMMPS commands according to the
+          molecule name
+
+    parameters_list
+          list of ReaxFF parameters
+
+    temp_directory
+          temporary directory of the force field files
+
+    Returns
+    -------
+    calculated_values_list
+          list of the calculated values of the parameters
+
+    See Also
+    --------
+    reaxff.compute.compute_values.__set_force_field_path
+    reaxff.compute.compute_values.__compute_values_lammps_one_task
+    """
+
+    precision = get_reactive_force_field_precision()
+
+    tasks = []
+
+    for idx, parameters in enumerate(parameters_list):
+
+        force_field_path = file_set_path(
+            file_set_path(temp_directory, 'batch'), f'ffield_temp_{idx}')
+
+        tasks.append((__set_force_field_path(lammps_commands_dict,
+                                             force_field_path),
+                      parameters, force_field_path, precision))
+
+    if is_worker_pool_ready():
+        return get_worker_pool().map(__compute_values_lammps_one_task,
+                                     [(task,) for task in tasks])
 
     if is_client_ready():
-        return __compute_values_lammps_multi_frame_parallel(
-            lammps_commands_dict)
+        return get_client()[:].map_sync(__compute_values_lammps_one_task,
+                                        tasks)
+
+    return list(map(__compute_values_lammps_one_task, tasks))
+
+
+def relocate_lammps_commands_holder(commands_holder: object,
+                                    temp_directory: str) -> None:
+    """
+    Move the temporary directory of the commands holder, the force field
+    file read by the pair_coeff commands is moved as well, e.g. every
+    island of the island model writes its own force field file
+
+    Parameters
+    ----------
+    commands_holder
+          commands holder storing the compiled LAMMPS commands
 
-    return __compute_values_lammps_multi_frame_serial(lammps_commands_dict)
+    temp_directory
+          new temporary directory of the force field file
+
+    Returns
+    -------
+    None
+    """
+
+    force_field_path = file_set_path(temp_directory, 'ffield_temp')
+
+    compiled_commands = commands_holder.compiled_commands
+
+    for frames in compiled_commands.values():
+        for frame in frames:
+            frame['pair_coeff'] = [
+                __set_force_field_path_of_command(command, force_field_path)
+                for command in frame['pair_coeff']]
+
+    commands_holder.compiled_commands = compiled_commands
+
+    commands_holder.temp_directory = temp_directory
+
+
+def __set_force_field_path(lammps_commands_dict: dict,
+                           force_field_path: str) -> dict:
+    """
+    Replace the force field file read by the pair_coeff commands, only
+    the trace information and the LAMMPS commands are kept
+
+    Parameters
+    ----------
+    lammps_commands_dict
+          dictionary of list containing the LAMMPS commands according to the
+          molecule name
+
+    force_field_path
+          path of the force field file
+
+    Returns
+    -------
+    lammps_commands_dict
+          dictionary of list containing the LAMMPS commands reading the
+          force field file
+    """
+
+    return {name: [dict({key: frame[key] for key in
+                         ('trace_info',) + LAMMPS_COMMAND_KEYS},
+                        pair_coeff=[
+                            __set_force_field_path_of_command(
+                                command, force_field_path)
+                            for command in frame['pair_coeff']])
+                   for frame in frames]
+            for name, frames in lammps_commands_dict.items()}
+
+
+def __set_force_field_path_of_command(command: str,
+                                      force_field_path: str) -> str:
+    """
+    Replace the force field file of the pair_coeff command
+
+    Parameters
+    ----------
+    command
+          pair_coeff command
+
+    force_field_path
+          path of the force field file
+
+    Returns
+    -------
+    command
+          the command reading the force field file
+    """
+
+    tokens = command.split()
+
+    tokens[3] = force_field_path
+
+    return ' '.join(tokens)
+
+
+def __compute_values_lammps_one_task(task: tuple) -> dict:
+    """
+    Compute values of all the frames of one parameters of the batch
+
+    Parameters
+    ----------
+    task
+          tuple of the LAMMPS commands, the parameters, the path of the
+          force field file and the precision of the force field file
+
+    Returns
+    -------
+    calculated_values
+          dictionary of list containing the calculated value according to the
+          molecule name
+    """
+
+    lammps_commands_dict, parameters, force_field_path, precision = task
+
+    set_reactive_force_field_precision(precision)
+
+    write_parameters_for_evaluation(parameters, force_field_path)
+
+    return {name.lower(): [__compute_values_lammps_one_frame(frame)
+                           for frame in frames]
+            for name, frames in lammps_commands_dict.items()}
+
+
+def __select_lammps_commands(lammps_commands_dict: dict,
+                             qeq_tolerance: Optional[float],
+                             molecules: Optional[list],
+                             frames: Optional[dict]) -> dict:
+    """
+    Select the commands of the molecules and the frames and replace the
+    tolerance of the charge equilibration, the input commands are not
+    modified
+
+    Parameters
+    ----------
+    lammps_commands_dict
+          dictionary of list containing the LAMMPS commands according to the
+          molecule name
+
+    qeq_tolerance
+          tolerance of the charge equilibration, unchanged if None
+
+    molecules
+          names of the molecules to be selected, all if None
+
+    frames
+          dictionary of frame indices according to the molecule name,
+          all if None
+
+    Returns
+    -------
+    lammps_commands_dict
+          dictionary of list containing the selected LAMMPS commands
+    """
+
+    if molecules is not None:
+
+        molecules = {molecule.lower() for molecule in molecules}
+
+        lammps_commands_dict = {
+            name: frames for name, frames in lammps_commands_dict.items()
+            if name.lower() in molecules}
+
+    if frames is not None:
+
+        lammps_commands_dict = {
+            name: ([commands[idx] for idx in frames[name.lower()]]
+                   if name.lower() in frames else commands)
+            for name, commands in lammps_commands_dict.items()}
+
+    if qeq_tolerance is None:
+        return lammps_commands_dict
+
+    return {name: [dict(frame, after_pair_coeff=[
+                __set_qeq_tolerance(command, qeq_tolerance)
+                for command in frame['after_pair_coeff']])
+            for frame in frames]
+            for name, frames in lammps_commands_dict.items()}
+
+
+def __set_qeq_tolerance(command: str, qeq_tolerance: float) -> str:
+    """
+    Replace the tolerance of the fix qeq/reax command
+
+    Parameters
+    ----------
+    command
+          LAMMPS command
+
+    qeq_tolerance
+          tolerance of the charge equilibration
+
+    Returns
+    -------
+    command
+          the command with the tolerance replaced if it is the fix
+          qeq/reax command, otherwise the input command
+    """
+
+    tokens = command.split()
+
+    if (len(tokens) < 8 or tokens[0] != 'fix' or
+            not tokens[3].startswith('qeq/reax')):
+        return command
+
+    tokens[7] = f'{qeq_tolerance:g}'
+
+    return ' '.join(tokens)
 
 
 def __compute_values_lammps_multi_frame_serial(
-        lammps_commands_dict: dict) -> dict:
+        lammps_commands_dict: dict, warm_start: Union[bool, int]) -> dict:
     """
     Compute values of multi-frame of input lammps_commands by LAMMPS in serial
 
@@ -98,6 +521,9 @@ def __compute_values_lammps_multi_frame_serial(
           dictionary of list containing the LAMMPS commands according to the
           molecule name
 
+    warm_start
+          whether the LAMMPS instances are kept for the next evaluation
+
     Returns
     -------
     calculated_values
@@ -113,17 +539,22 @@ def __compute_values_lammps_multi_frame_serial(
 
     for molecule_name in lammps_commands_dict.keys():
         calculated_values[molecule_name.lower()] = \
-            list(map(__compute_values_lammps_one_frame,
-                     lammps_commands_dict[molecule_name]))
+            list(map(lambda x: __compute_values_lammps_one_frame(
+                x, warm_start), lammps_commands_dict[molecule_name]))
 
     return calculated_values
 
 
 def __compute_values_lammps_multi_frame_parallel(
-        lammps_commands_dict: dict) -> dict:
+        lammps_commands_dict: dict, warm_start: Union[bool, int]) -> dict:
     """
     Compute values of multi-frame of input lammps_commands by LAMMPS parallely
-    by ipyparallel
+    by ipyparallel, the frames are mapped to the same engines in every
+    evaluation so the kept LAMMPS instances are reused
+
+    The engines write the calculated values into the shared result block of
+    the frames and only return a completion flag, the values are read from
+    the block instead of being unpickled and copied.
 
     Parameters
     ----------
@@ -131,6 +562,9 @@ def __compute_values_lammps_multi_frame_parallel(
           dictionary of list containing the LAMMPS commands according to the
           molecule name
 
+    warm_start
+          whether the LAMMPS instances are kept for the next evaluation
+
     Returns
     -------
     calculated_values
@@ -139,84 +573,473 @@ def __compute_values_lammps_multi_frame_parallel(
 
     See Also
     --------
-    reaxff.compute.compute_values.__compute_values_lammps_one_frame
+    reaxff.compute.compute_values.__compute_values_lammps_one_frame_shared
+    reaxff.compute.result_block.get_shared_result_block
     utilities.parallel.ipyparallel_singleton.get_client
     """
 
-    lmp_cmd_list = []
+    frames = __flatten_frames(lammps_commands_dict)
 
-    calculated_values = {}
+    block = get_shared_result_block(
+        [estimate_frame_cost(frame) for frame in frames],
+        [__retrive_trace_info(frame)[2] for frame in frames])
 
-    direct_view = get_client()[:]
+    statuses = get_client()[:].map_sync(
+        __compute_values_lammps_one_frame_shared, frames,
+        [warm_start] * len(frames),
+        [block.layout(idx) for idx in range(len(frames))])
 
-    for cmds in lammps_commands_dict.values():
-        lmp_cmd_list.extend(cmds)
+    return __unflatten_values(lammps_commands_dict, block.read(statuses))
 
-    for molecule_name in lammps_commands_dict.keys():
-        calculated_values[molecule_name] = []
 
-    sync_res = direct_view.map_sync(__compute_values_lammps_one_frame,
-                                    lmp_cmd_list)
+def __compute_values_lammps_one_frame_shared(lammps_commands: dict,
+                                             warm_start: Union[bool, int],
+                                             layout: tuple) -> object:
+    """
+    Compute values of one frame and write them into the shared result
+    block
+
+    Parameters
+    ----------
+    lammps_commands
+          dictionary containing one frame of command
+
+    warm_start
+          whether the LAMMPS instance is kept for the next evaluation
+
+    layout
+          name of the block, offset and number of atoms of the slot of the
+          frame
+
+    Returns
+    -------
+    status
+          True if the values are written into the block
+
+    See Also
+    --------
+    reaxff.compute.result_block.SharedResultBlock.write
+    """
+
+    return SharedResultBlock.write(
+        *layout, __compute_values_lammps_one_frame(lammps_commands,
+                                                   warm_start))
+
+
+def __compute_values_lammps_multi_frame_pool(
+        lammps_commands_dict: dict, warm_start: Union[bool, int],
+        force_field_path: str) -> dict:
+    """
+    Compute values of multi-frame of input lammps_commands by the worker
+    pool shared by the optimization jobs
+
+    A frame always runs on the same worker so its kept LAMMPS instance is
+    reused by all the jobs computing the same frame. The key of a frame is
+    its commands apart from the path of the force field file together with
+    the digest of the force field file, the jobs computing the same frame
+    with the same force field share one calculation.
+
+    Parameters
+    ----------
+    lammps_commands_dict
+          dictionary of list containing the LAMMPS commands according to the
+          molecule name
+
+    warm_start
+          whether the LAMMPS instances are kept for the next evaluation
+
+    force_field_path
+          path of the force field file read by the frames
+
+    Returns
+    -------
+    calculated_values
+          dictionary of list containing the calculated value according to the
+          molecule name
+
+    See Also
+    --------
+    reaxff.compute.compute_values.__compute_values_lammps_one_frame
+    utilities.worker_pool.WorkerPool.map
+    """
+
+    with open(force_field_path, 'rb') as fp:
+        digest = hashlib.sha1(fp.read()).hexdigest()
+
+    frames = __flatten_frames(lammps_commands_dict)
+
+    identities = [__get_frame_identity(frame) for frame in frames]
+
+    results = get_worker_pool().map(
+        __compute_values_lammps_one_frame,
+        [(frame, warm_start) for frame in frames],
+        [(identity, digest) for identity in identities], identities)
+
+    return __unflatten_values(lammps_commands_dict, results)
+
+
+def __compute_values_lammps_multi_frame_mpi(
+        lammps_commands_dict: dict, warm_start: Union[bool, int]) -> dict:
+    """
+    Compute values of multi-frame of input lammps_commands by the ranks of
+    the MPI world, the large frames are decomposed over several ranks and
+    the small frames are computed one per rank
+
+    The ranks of the frames are planned from the number of atoms of the
+    frames and planned again once from the measured costs after every
+    frame is computed, the plan is then kept so the LAMMPS instances of the
+    frames stay on their ranks.
+
+    Parameters
+    ----------
+    lammps_commands_dict
+          dictionary of list containing the LAMMPS commands according to the
+          molecule name
+
+    warm_start
+          whether the LAMMPS instances are kept for the next evaluation
+
+    Returns
+    -------
+    calculated_values
+          dictionary of list containing the calculated value according to the
+          molecule name
+
+    See Also
+    --------
+    reaxff.compute.compute_values.__plan_mpi_groups
+    reaxff.compute.compute_values.__compute_values_lammps_mpi_rank
+    utilities.mpi_world.run_on_mpi_ranks
+    """
+
+    frames = __flatten_frames(lammps_commands_dict)
+
+    identities = tuple(__get_frame_identity(frame) for frame in frames)
+
+    groups = __plan_mpi_groups(frames, identities)
+
+    results = [None] * len(frames)
+
+    for rank_results in run_on_mpi_ranks(__compute_values_lammps_mpi_rank,
+                                         (frames, groups, warm_start)):
+        for idx, res, cost in rank_results:
+
+            results[idx] = res
+
+            __FRAME_COSTS[identities[idx]] = cost
+
+    return __unflatten_values(lammps_commands_dict, results)
+
+
+def __plan_mpi_groups(frames: list, identities: tuple) -> list:
+    """
+    Get the plan of the ranks of the frames, the frames are planned by
+    their number of atoms until all of them are measured, only the
+    MPI_PLANS_CACHE most recently used plans are kept
+
+    Parameters
+    ----------
+    frames
+          list of the LAMMPS commands of the frames
+
+    identities
+          identity of every frame
+
+    Returns
+    -------
+    groups
+          list of the tuple of the number of the ranks and the indices of
+          the frames of every group
+
+    See Also
+    --------
+    reaxff.compute.frame_scheduling.plan_frame_ranks
+    """
+
+    measured = all(identity in __FRAME_COSTS for identity in identities)
+
+    plan = __MPI_PLANS.get(identities)
+
+    if plan is not None and (plan[0] or not measured):
+        __MPI_PLANS.move_to_end(identities)
+        return plan[1]
+
+    sizes = [estimate_frame_cost(frame) for frame in frames]
+
+    costs = ([__FRAME_COSTS[identity] for identity in identities]
+             if measured else sizes)
+
+    groups = plan_frame_ranks(
+        costs, get_mpi_communicator().Get_size(),
+        [max(1, size // MINIMUM_ATOMS_PER_RANK) for size in sizes])
+
+    __MPI_PLANS[identities] = (measured, groups)
+
+    __MPI_PLANS.move_to_end(identities)
+
+    while len(__MPI_PLANS) > MPI_PLANS_CACHE:
+        __MPI_PLANS.popitem(last=False)
+
+    logger.info(f'Frames planned on MPI ranks by '
+                f'{"measured costs" if measured else "atoms"}, '
+                f'ranks of the decomposed frames: '
+                f'{[ranks for ranks, _ in groups if ranks > 1]}')
+
+    return groups
+
+
+def __compute_values_lammps_mpi_rank(frames: list, groups: list,
+                                     warm_start: Union[bool, int]) -> list:
+    """
+    Compute the frames of the group of the rank, the ranks are split into
+    the groups again only if the numbers of the ranks of the groups change
+
+    Parameters
+    ----------
+    frames
+          list of the LAMMPS commands of the frames
+
+    groups
+          list of the tuple of the number of the ranks and the indices of
+          the frames of every group, the groups take the ranks in order
+
+    warm_start
+          whether the LAMMPS instances are kept for the next evaluation
+
+    Returns
+    -------
+    results
+          list of the tuple of the index, the calculated value and the cost
+          of the frames on the first rank of the group, empty on the other
+          ranks
+    """
+
+    comm = get_mpi_communicator()
+
+    rank, first = comm.Get_rank(), 0
+
+    color, indices = len(groups), []
+
+    for number, (ranks, frame_indices) in enumerate(groups):
+
+        if first <= rank < first + ranks:
+            color, indices = number, frame_indices
+            break
+
+        first += ranks
+
+    layout = tuple(ranks for ranks, _ in groups)
+
+    if __MPI_GROUP.get('layout') != layout:
+
+        __close_lammps_instances()
 
-    results = copy.deepcopy(sync_res)
+        if __MPI_GROUP.get('comm') is not None:
+            __MPI_GROUP['comm'].Free()
 
-    for res in results:
-        calculated_values[res['name'].lower()].append(res)
+        __MPI_GROUP.update(layout=layout, comm=comm.Split(color, rank))
+
+    group = __MPI_GROUP['comm']
+
+    results = []
+
+    for idx in indices:
+
+        start = time.time()
+
+        res = __compute_values_lammps_one_frame(frames[idx], warm_start,
+                                                group)
+
+        if group.Get_rank() == 0:
+            results.append((idx, res,
+                            (time.time() - start) * group.Get_size()))
+
+    return results
+
+
+def __flatten_frames(lammps_commands_dict: dict) -> list:
+    """
+    Flatten the frames of the molecules, only the trace information and
+    the LAMMPS commands are kept
+
+    Parameters
+    ----------
+    lammps_commands_dict
+          dictionary of list containing the LAMMPS commands according to the
+          molecule name
+
+    Returns
+    -------
+    frames
+          list of the LAMMPS commands of the frames in the order of the
+          molecules
+    """
+
+    return [{key: frame[key] for key in ('trace_info',) + LAMMPS_COMMAND_KEYS}
+            for frames in lammps_commands_dict.values() for frame in frames]
+
+
+def __unflatten_values(lammps_commands_dict: dict, results: list) -> dict:
+    """
+    Split the calculated values of the flattened frames according to the
+    molecule name
+
+    Parameters
+    ----------
+    lammps_commands_dict
+          dictionary of list containing the LAMMPS commands according to the
+          molecule name
+
+    results
+          calculated values in the order of the flattened frames
+
+    Returns
+    -------
+    calculated_values
+          dictionary of list containing the calculated value according to the
+          molecule name
+    """
+
+    calculated_values, start = {}, 0
+
+    for name, frames in lammps_commands_dict.items():
+
+        calculated_values[name.lower()] = results[start:start + len(frames)]
+
+        start += len(frames)
 
     return calculated_values
 
 
-def __compute_values_lammps_one_frame(lammps_commands: list) -> dict:
+def __get_frame_identity(frame: dict) -> tuple:
+    """
+    Get the identity of the frame, i.e. its commands apart from the path of
+    the force field file
+
+    Parameters
+    ----------
+    frame
+          dictionary containing one frame of command
+
+    Returns
+    -------
+    identity
+          hashable identity of the frame
+    """
+
+    return (tuple(frame['trace_info']), tuple(frame['before_pair_coeff']),
+            tuple(__set_force_field_path_of_command(command, '')
+                  for command in frame['pair_coeff']),
+            tuple(frame['after_pair_coeff']))
+
+
+def __compute_values_lammps_one_frame(lammps_commands: list,
+                                      warm_start: Union[bool, int]=False,
+                                      comm: Optional[object]=None) -> dict:
     """
     Compute values of one frame of input lammps_commands by LAMMPS
 
+    With warm start the LAMMPS instance of the frame is kept, the next
+    evaluation of the frame only reads the force field again and runs,
+    the fix qeq/reax extrapolates the initial charges from its history.
+    The least recently used instances are closed when more instances than
+    the maximum of warm_start are kept.
+
+    With a communicator of several ranks the frame is decomposed over the
+    ranks, every rank of the communicator calls the function and the
+    charges and the forces are gathered on every rank.
+
     Parameters
     ----------
     lammps_commands
           list containing one frame of command
 
+    warm_start
+          whether the LAMMPS instance is kept for the next evaluation, or
+          the maximum number of instances kept
+
+    comm
+          mpi4py communicator of the ranks computing the frame, LAMMPS runs
+          single process if None, i.e. on the rank itself in the MPI world
+
     Returns
     -------
     results
-          dictionary containing name, step, charge, forces, stress and
-          energy calculated by LAMMPS
+          dictionary containing name, step, charge, forces, stress,
+          energy and the number of charge equilibration iterations
+          calculated by LAMMPS
 
     See Also
     --------
     reaxff.compute.compute_values.__retrive_trace_info
     reaxff.compute.compute_values.__extract_charge_from_lammps
     reaxff.compute.compute_values.__extract_forces_from_lammps
+    reaxff.compute.compute_values.__gather_values_from_lammps
     reaxff.compute.compute_values.__extract_stress_from_lammps
     reaxff.compute.compute_values.__set_flag_from_trace_info
+    reaxff.compute.compute_values.__extract_qeq_iterations_from_lammps
     """
 
     _, flags, name_and_step = __retrive_trace_info(lammps_commands)
 
+    instance_key = (lammps_commands['trace_info'][-1],
+                    tuple(lammps_commands['after_pair_coeff']))
+
+    res, lmp = None, None
+
+    if comm is None and is_mpi_ready():
+        comm = get_mpi_communicator(local=True)
+
     try:
 
-        res = None
+        if warm_start:
+            lmp = __LAMMPS_INSTANCES.pop(instance_key, None)
+
+        if lmp is None:
+
+            lmp = lammps("", ["-screen", "none", "-log", "none", "-nocite"],
+                         comm=comm)
 
-        lmp = lammps("", ["-screen", "none", "-log", "none", "-nocite"])
+            for key in LAMMPS_COMMAND_KEYS:
+                for cmd in lammps_commands[key]:
+                    lmp.command(cmd)
 
-        for lammps_command in lammps_commands.values():
-            for cmd in lammps_command:
+        else:
+
+            for cmd in lammps_commands['pair_coeff']:
                 lmp.command(cmd)
 
+            __refresh_qeq_parameters(lmp, lammps_commands)
+
+            for cmd in lammps_commands['after_pair_coeff']:
+                if cmd.startswith('run'):
+                    lmp.command(cmd)
+
         lmp.command("variable etot equal etotal")
 
         natoms = lmp.get_natoms()
 
-        forces = (__extract_forces_from_lammps(lmp, natoms)
-                  if flags[0] else None)
+        if comm is not None and comm.Get_size() > 1:
+            forces, charge = __gather_values_from_lammps(lmp, natoms, flags)
+
+        else:
 
-        charge = (__extract_charge_from_lammps(lmp, natoms)
-                  if flags[1] else None)
+            order = __extract_atom_order_from_lammps(lmp, natoms)
+
+            forces = (__extract_forces_from_lammps(lmp, natoms)[:, order]
+                      if flags[0] else None)
+
+            charge = (__extract_charge_from_lammps(lmp, natoms)[order]
+                      if flags[1] else None)
 
         stress = __extract_stress_from_lammps(lmp) if flags[2] else None
 
         total_energy = (lmp.extract_fix("2", 0, 0) if flags[3]
                         else lmp.extract_variable("etot", "1", 0) / natoms)
 
+        qeq_iterations = __extract_qeq_iterations_from_lammps(
+            lmp, lammps_commands)
+
     except Exception as e:
 
         logger.error(e)
@@ -227,7 +1050,12 @@ def __compute_values_lammps_one_frame(lammps_commands: list) -> dict:
 
         res = {'name': name_and_step[0], 'step': name_and_step[1],
                'q': charge, 'fx': forces[0], 'fy': forces[1], 'fz': forces[2],
-               'stress': stress, 'energy': total_energy}
+               'stress': stress, 'energy': total_energy,
+               'qeq_iterations': qeq_iterations}
+
+        if warm_start:
+            __keep_lammps_instance(instance_key, lmp, warm_start)
+            lmp = None
 
     finally:
 
@@ -237,6 +1065,201 @@ def __compute_values_lammps_one_frame(lammps_commands: list) -> dict:
         return res
 
 
+def __keep_lammps_instance(instance_key: tuple, lmp: lammps,
+                           warm_start: Union[bool, int]) -> None:
+    """
+    Keep the LAMMPS instance of a frame as the most recently used one and
+    close the least recently used instances above the maximum
+
+    Parameters
+    ----------
+    instance_key
+          key of the frame the instance belongs to
+
+    lmp
+          reference of the lammps object
+
+    warm_start
+          True for at most LAMMPS_INSTANCES_CACHE instances, or the maximum
+          number of instances kept
+
+    Returns
+    -------
+    None
+    """
+
+    maximum = (LAMMPS_INSTANCES_CACHE if warm_start is True
+               else max(int(warm_start), 1))
+
+    __LAMMPS_INSTANCES[instance_key] = lmp
+
+    while len(__LAMMPS_INSTANCES) > maximum:
+        __LAMMPS_INSTANCES.popitem(last=False)[1].close()
+
+
+@atexit.register
+def __close_lammps_instances() -> None:
+    """
+    Close the LAMMPS instances kept for warm start, also when the program
+    terminates
+
+    Returns
+    -------
+    None
+    """
+
+    while __LAMMPS_INSTANCES:
+        __LAMMPS_INSTANCES.popitem()[1].close()
+
+
+def __refresh_qeq_parameters(lmp: lammps, lammps_commands: dict) -> None:
+    """
+    Refresh the EEM parameters seen by the fix qeq/reax after the force
+    field is read again
+
+    The fix holds the per-type arrays of the pair style which are only
+    filled when a qeq fix is created, a temporary copy of the fix is
+    created and removed so the existing fix keeps its charge history.
+
+    Parameters
+    ----------
+    lmp
+          reference of the lammps object
+
+    lammps_commands
+          list containing one frame of command
+
+    Returns
+    -------
+    None
+    """
+
+    for cmd in lammps_commands['after_pair_coeff']:
+
+        tokens = cmd.split()
+
+        if __is_qeq_fix_command(tokens):
+
+            lmp.command(' '.join(['fix', 'qeq_refresh'] + tokens[2:]))
+
+            lmp.command('unfix qeq_refresh')
+
+
+def __is_qeq_fix_command(tokens: list) -> bool:
+    """
+    Check whether the tokens of a LAMMPS command define a qeq fix
+
+    Parameters
+    ----------
+    tokens
+          tokens of the LAMMPS command
+
+    Returns
+    -------
+    bool
+    """
+
+    return tokens[:1] == ['fix'] and len(tokens) > 3 and \
+        tokens[3].startswith('qeq')
+
+
+def __extract_qeq_iterations_from_lammps(lmp: lammps,
+                                         lammps_commands: dict
+                                         ) -> Optional[float]:
+    """
+    Extract the number of iterations of the last charge equilibration from
+    the fix qeq/reax
+
+    Parameters
+    ----------
+    lmp
+          reference of the lammps object
+
+    lammps_commands
+          list containing one frame of command
+
+    Returns
+    -------
+    iterations
+          number of iterations, None if it is not available
+    """
+
+    for cmd in lammps_commands['after_pair_coeff']:
+
+        tokens = cmd.split()
+
+        if __is_qeq_fix_command(tokens):
+
+            try:
+                return float(lmp.extract_fix(tokens[1], 0, 0))
+
+            except Exception:
+                return None
+
+    return None
+
+
+def __gather_values_from_lammps(lmp: lammps, number_of_atoms: int,
+                                flags: list) -> tuple:
+    """
+    Gather the forces and the charges of the frame decomposed over several
+    ranks, the gathered atoms are sorted by atom id
+
+    Parameters
+    ----------
+    lmp
+          reference of the lammps object
+
+    number_of_atoms
+          number of atoms of the frame
+
+    flags
+          Force, Charge, Stress, Temperature
+          True if the value will be retrived
+
+    Returns
+    -------
+    forces
+          forces calculated by LAMMPS, None if not retrived
+
+    charge
+          charge calculated by LAMMPS, None if not retrived
+    """
+
+    forces = (np.array(lmp.gather_atoms("f", 1, 3)).reshape(
+        number_of_atoms, 3).T if flags[0] else None)
+
+    charge = (np.array(lmp.gather_atoms("q", 1, 1)) if flags[1] else None)
+
+    return forces, charge
+
+
+def __extract_atom_order_from_lammps(lmp: lammps,
+                                     number_of_atoms: int) -> np.ndarray:
+    """
+    Extract the order of the atoms by atom id, LAMMPS sorts the atoms
+    spatially so the local order is different from the order in the xml
+
+    Parameters
+    ----------
+    lmp
+          reference of the lammps object
+
+    number_of_atoms
+          number of atoms stated in the trace info of the input command
+
+    Returns
+    -------
+    order
+          indices sorting the local atoms by atom id
+
+    """
+
+    ids = np.ctypeslib.as_array(lmp.extract_atom("id", 0), (number_of_atoms,))
+
+    return np.argsort(ids)
+
+
 def __extract_charge_from_lammps(lmp: lammps,
                                  number_of_atoms: int) -> np.ndarray:
     """
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+import itertools
+from typing import Optional
+
+import numpy as np
+
+from ff_optimum.user_packages.reaxff.compute.simulation_box import (
+    SimulationBox)
+
+__all__ = ['FrameGeometry']
+
+REAXFF_NONBONDED_CUTOFF = 10.0
+
+
+class FrameGeometry(object):
+
+    """
+    Class storing the fixed geometry of one training frame in LAMMPS
+    coordinates with the pairs within the ReaxFF cutoff cached
+
+    The pairs include the periodic images of the periodic directions, the
+    images cover the cutoff so the frame is equivalent to the replicated
+    box in LAMMPS. Each pair is stored in both directions and sorted by
+    the first atom, the pairs within a shorter cutoff are filtered from the
+    cached ones. The pairs are found on the first request, so the frames
+    of the evaluators not using them, e.g. LAMMPS, only keep the positions.
+
+    Attributes
+    ----------
+    __elements: list
+        element names of the atom types
+
+    __types: np.ndarray
+        zero based atom types
+
+    __positions: np.ndarray
+        positions of the atoms, one row per atom
+
+    __cell: np.ndarray
+        lattice vectors in rows, None without simulation box
+
+    __periodicity: tuple
+        periodicity of the three directions
+
+    __replicate: tuple
+        replication of the box by LammpsCommandCompiler
+
+    __cutoff: float
+        cutoff of the cached pairs
+
+    __pairs: tuple
+        first atoms, second atoms, distances and images of the pairs, None
+        until the pairs are requested
+
+    Methods
+    -------
+    from_xml_step(xml_result, elements, step, replicate)
+        create the geometry from one step of the xml parse results
+
+    get_pairs(cutoff)
+        return the pairs within the cutoff
+
+    get_neighbor_list(cutoff)
+        return the neighbor list within the cutoff
+
+    get_distance_matrix()
+        return the minimum image distances
+    """
+
+    __slots__ = ['__elements', '__types', '__positions', '__cell',
+                 '__periodicity', '__replicate', '__cutoff', '__pairs']
+
+    def __init__(self, elements: list, types: np.ndarray,
+                 positions: np.ndarray, cell: Optional[np.ndarray]=None,
+                 periodicity: tuple=(False, False, False),
+                 replicate: tuple=(1, 1, 1),
+                 cutoff: float=REAXFF_NONBONDED_CUTOFF) -> None:
+
+        self.__elements = list(elements)
+
+        self.__types = np.asarray(types, dtype=int)
+
+        self.__positions = np.asarray(positions, dtype='f8')
+
+        self.__cell = None if cell is None else np.asarray(cell, dtype='f8')
+
+        self.__periodicity = (tuple(periodicity) if cell is not None
+                              else (False, False, False))
+
+        self.__replicate = tuple(replicate)
+
+        self.__cutoff = cutoff
+
+        self.__pairs = None
+
+    @classmethod
+    def from_xml_step(cls, xml_result: dict, elements: list, step: dict,
+                      replicate: tuple=(1, 1, 1)) -> object:
+        """
+        Create the geometry from one step of the xml parse results
+
+        Parameters
+        ----------
+        xml_result
+            xml parse results
+
+        elements
+            element names of the atom types
+
+        step
+            the step information in xml parse results
+
+        replicate
+            replication of the box
+
+        Returns
+        -------
+        FrameGeometry
+        """
+
+        types = np.asarray(step['type'], dtype=int) - 1
+
+        coordinates = zip(step['x'][0], step['y'][0], step['z'][0])
+
+        if step['box'] is None:
+            return cls(elements, types, list(coordinates))
+
+        box = SimulationBox(step['box'])
+
+        lx, ly, lz, xy, xz, yz = box.get_xyz_box().astype('f8')
+
+        positions = list(map(box.convert_xml_coordinate_to_lmp_coordinate,
+                             coordinates))
+
+        periodicity = tuple('p' in periodicity for periodicity in
+                            xml_result['periodicity'].split())
+
+        return cls(elements, types, np.asarray(positions, dtype='f8'),
+                   np.array([[lx, 0.0, 0.0], [xy, ly, 0.0], [xz, yz, lz]]),
+                   periodicity, replicate)
+
+    @property
+    def elements(self) -> list:
+        return self.__elements
+
+    @property
+    def types(self) -> np.ndarray:
+        return self.__types
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.__positions
+
+    @property
+    def cell(self) -> Optional[np.ndarray]:
+        return self.__cell
+
+    @property
+    def periodicity(self) -> tuple:
+        return self.__periodicity
+
+    @property
+    def replicate(self) -> tuple:
+        return self.__replicate
+
+    @property
+    def cutoff(self) -> float:
+        return self.__cutoff
+
+    @property
+    def number_of_atoms(self) -> int:
+        return self.__types.size
+
+    def get_pairs(self, cutoff: Optional[float]=None) -> tuple:
+        """
+        Return the pairs within the cutoff
+
+        Parameters
+        ----------
+        cutoff
+            cutoff of the pairs, the cutoff of the cached pairs if None
+
+        Returns
+        -------
+        pair_i
+            indices of the first atoms
+
+        pair_j
+            indices of the second atoms
+
+        distances
+            distances of the pairs
+
+        images
+            periodic images of the second atoms
+
+        Raises
+        ------
+        ValueError
+            if the cutoff is larger than the cutoff of the cached pairs
+        """
+
+        if cutoff is not None and cutoff > self.__cutoff:
+            raise ValueError(f'cutoff {cutoff} is larger than the '
+                             f'cached cutoff {self.__cutoff}')
+
+        if self.__pairs is None:
+            self.__pairs = self.__find_pairs()
+
+        if cutoff is None or cutoff == self.__cutoff:
+            return self.__pairs
+
+        mask = self.__pairs[2] <= cutoff
+
+        return tuple(values[mask] for values in self.__pairs)
+
+    def get_neighbor_list(self, cutoff: Optional[float]=None) -> tuple:
+        """
+        Return the neighbor list within the cutoff in compressed form, the
+        neighbors of atom i are neighbors[offsets[i]:offsets[i + 1]]
+
+        Parameters
+        ----------
+        cutoff
+            cutoff of the neighbors, the cutoff of the cached pairs if None
+
+        Returns
+        -------
+        offsets
+            offsets of the neighbors of the atoms
+
+        neighbors
+            indices of the neighbors
+
+        distances
+            distances of the neighbors
+        """
+
+        pair_i, pair_j, distances, _ = self.get_pairs(cutoff)
+
+        offsets = np.zeros(self.number_of_atoms + 1, dtype=int)
+
+        np.cumsum(np.bincount(pair_i, minlength=self.number_of_atoms),
+                  out=offsets[1:])
+
+        return offsets, pair_j, distances
+
+    def get_distance_matrix(self) -> np.ndarray:
+        """
+        Return the minimum image distances of the atoms, the distances
+        beyond the cutoff are inf
+
+        Returns
+        -------
+        distance_matrix
+            minimum image distances
+        """
+
+        pair_i, pair_j, distances, _ = self.get_pairs()
+
+        distance_matrix = np.full((self.number_of_atoms,) * 2, np.inf)
+
+        np.minimum.at(distance_matrix, (pair_i, pair_j), distances)
+
+        np.fill_diagonal(distance_matrix, 0.0)
+
+        return distance_matrix
+
+    def __find_pairs(self) -> tuple:
+        """
+        Find all the atom pairs within the cutoff including the periodic
+        images
+
+        Returns
+        -------
+        pair_i
+            indices of the first atoms
+
+        pair_j
+            indices of the second atoms
+
+        distances
+            distances of the pairs
+
+        images
+            periodic images of the second atoms
+        """
+
+        ranges = [range(1)] * 3
+
+        if self.__cell is not None:
+
+            volume = abs(np.linalg.det(self.__cell))
+
+            for idx in np.flatnonzero(self.__periodicity):
+
+                width = volume / np.linalg.norm(
+                    np.cross(self.__cell[(idx + 1) % 3],
+                             self.__cell[(idx + 2) % 3]))
+
+                images = int(np.ceil(self.__cutoff / width)) + 1
+
+                ranges[idx] = range(-images, images + 1)
+
+        displacements = (self.__positions[None, :, :] -
+                         self.__positions[:, None, :])
+
+        pair_i, pair_j, distances, images = [], [], [], []
+
+        for image in itertools.product(*ranges):
+
+            shift = (np.dot(image, self.__cell) if self.__cell is not None
+                     else np.zeros(3))
+
+            distance = np.linalg.norm(displacements + shift, axis=-1)
+
+            mask = distance <= self.__cutoff
+
+            if not any(image):
+                np.fill_diagonal(mask, False)
+
+            indices = np.nonzero(mask)
+
+            pair_i.append(indices[0])
+
+            pair_j.append(indices[1])
+
+            distances.append(distance[indices])
+
+            images.append(np.tile(image, (indices[0].size, 1)))
+
+        pair_i, pair_j, distances, images = (
+            np.concatenate(values) for values in
+            (pair_i, pair_j, distances, images))
+
+        order = np.lexsort((pair_j, pair_i))
+
+        return (pair_i[order], pair_j[order], distances[order],
+                images[order].reshape(-1, 3))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import heapq
+
+import numpy as np
+
+__all__ = ['estimate_frame_cost', 'plan_frame_ranks']
+
+MINIMUM_ATOMS_PER_RANK = 100
+
+
+def estimate_frame_cost(lammps_commands: dict) -> int:
+    """
+    Estimate the cost of a frame by its number of atoms after the
+    replication, the cost of ReaxFF grows about linearly with the atoms
+
+    Parameters
+    ----------
+    lammps_commands
+          dictionary containing one frame of command
+
+    Returns
+    -------
+    number_of_atoms
+          number of atoms simulated by LAMMPS
+    """
+
+    number_of_atoms = next(
+        int(info.split(': ')[1]) for info in lammps_commands['trace_info']
+        if info.startswith('#number_of_atom'))
+
+    for command in lammps_commands['before_pair_coeff']:
+
+        tokens = command.split()
+
+        if tokens[:1] == ['replicate']:
+            number_of_atoms *= int(np.prod([int(n) for n in tokens[1:4]]))
+
+    return number_of_atoms
+
+
+def plan_frame_ranks(costs: list, number_of_ranks: int,
+                     maximum_ranks: list) -> list:
+    """
+    Plan the ranks computing the frames, a frame costing more than the
+    average load of a rank is computed by several ranks in proportion to
+    its cost and the other frames are computed one per rank balanced by
+    the longest processing time first rule
+
+    Parameters
+    ----------
+    costs
+          estimated or measured cost of every frame
+
+    number_of_ranks
+          number of the ranks
+
+    maximum_ranks
+          maximum number of the ranks of every frame, e.g. limited by the
+          atoms per rank
+
+    Returns
+    -------
+    groups
+          list of the tuple of the number of the ranks and the indices of
+          the frames of every group, the groups take the ranks in order
+    """
+
+    costs = np.asarray(costs, dtype='f8')
+
+    average = costs.sum() / number_of_ranks
+
+    order = [int(idx) for idx in np.argsort(-costs, kind='stable')]
+
+    groups, free = [], number_of_ranks
+
+    for position, idx in enumerate(order):
+
+        small_frames = position + 1 < len(order)
+
+        ranks = min(int(costs[idx] / average) if average > 0 else 1,
+                    maximum_ranks[idx], free - small_frames)
+
+        if ranks < 2:
+            break
+
+        groups.append((ranks, [idx]))
+
+        free -= ranks
+
+    small = order[len(groups):]
+
+    loads = [(0.0, number, []) for number in range(min(free, len(small)))]
+
+    for idx in small:
+
+        load, number, frames = heapq.heappop(loads)
+
+        frames.append(idx)
+
+        heapq.heappush(loads, (load + costs[idx], number, frames))
+
+    groups.extend((1, frames) for _, _, frames in sorted(
+        loads, key=lambda load: load[1]))
+
+    return groups
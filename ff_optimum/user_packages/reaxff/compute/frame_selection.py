@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+import copy
+from typing import Optional
+
+import numpy as np
+
+from ff_optimum.cores.utilities import EventLogger
+from ff_optimum.user_packages.reaxff.compute.compute_errors import (
+    compute_error_reaxff)
+from ff_optimum.user_packages.reaxff.optimization_setting.frames import (
+    select_frames_of_molecules)
+from ff_optimum.user_packages.reaxff.optimization_setting.parameters import (
+    next_parameter_generator)
+
+__all__ = ['ActiveFrameSelector', 'reduce_reaxff_training_frames']
+
+logger = EventLogger(__name__)
+
+FRAME_SELECTION_TOLERANCE = 0.05
+
+FRAME_SELECTION_DIRECTIONS = 4
+
+FRAME_SELECTION_PERTURBATION = 0.1
+
+FRAME_SELECTION_SEED = 0
+
+
+class ActiveFrameSelector(object):
+
+    """
+    Class selecting a reduced subset of the training frames which
+    preserves the error of every objective within a tolerance
+
+    The frames of every molecule are ranked by their information content,
+    the average of the normalized energy curvature along the scan, the
+    force magnitude and the leverage of the frame in the sensitivities of
+    the calculated energies and charges. The sensitivities are finite
+    differences along random directions of the parameters to be optimized.
+    The directions are drawn from the own seeded random state of the
+    selector, so the same frames are selected again for the same inputs
+    and the random state of the optimizer is not consumed.
+
+    The frame with the lowest target energy and the end points of the scan
+    are always selected. The frames are added by rank to the molecules of
+    the objectives whose error on the subset deviates from the error on all
+    the frames by more than the tolerance, at the initial parameters and
+    at every perturbed parameters.
+
+    Attributes
+    ----------
+    __training_datas: dict
+        training data of all the frames
+
+    __number_of_directions: int
+        number of random directions of the finite differences
+
+    __perturbation: float
+        relative size of the finite differences in units of the step size
+
+    __random_state: np.random.RandomState
+        random state drawing the directions
+
+    __scores: dict
+        information content of the frames according to the molecule name
+
+    Methods
+    -------
+    from_coordinator(coordinator)
+        create the selector from the xml coordinator
+
+    select(executor, settings, parameters, step_size, constraints,
+           tolerance)
+        select the frames
+    """
+
+    __slots__ = ['__training_datas', '__number_of_directions',
+                 '__perturbation', '__random_state', '__scores']
+
+    def __init__(self, training_datas: dict,
+                 number_of_directions: int=FRAME_SELECTION_DIRECTIONS,
+                 perturbation: float=FRAME_SELECTION_PERTURBATION,
+                 seed: Optional[int]=FRAME_SELECTION_SEED) -> None:
+
+        self.__training_datas = training_datas
+
+        self.__number_of_directions = number_of_directions
+
+        self.__perturbation = perturbation
+
+        self.__random_state = np.random.RandomState(seed)
+
+        self.__scores = None
+
+    @classmethod
+    def from_coordinator(cls, coordinator: object, **kwargs) -> object:
+        """
+        Create the selector from the training data of the xml coordinator
+
+        Parameters
+        ----------
+        coordinator
+            DftXmlCoordinator object with the xmls read
+
+        Returns
+        -------
+        ActiveFrameSelector
+        """
+
+        return cls(coordinator.training_datasets, **kwargs)
+
+    @property
+    def scores(self) -> Optional[dict]:
+        return self.__scores
+
+    def select(self, executor: callable, settings: dict, parameters: dict,
+               step_size: dict, constraints: dict,
+               tolerance: float=FRAME_SELECTION_TOLERANCE) -> dict:
+        """
+        Select the frames preserving the error of every objective within
+        the relative tolerance
+
+        Parameters
+        ----------
+        executor
+            function computing the values of all the frames from the
+            parameters, e.g. CommandsHolder.execute_commands
+
+        settings
+            package settings for training
+
+        parameters
+            initial ReaxFF parameters
+
+        step_size
+            step size of the parameters
+
+        constraints
+            constraints of the parameters
+
+        tolerance
+            relative tolerance of the error of every objective
+
+        Returns
+        -------
+        frames
+            dictionary of sorted frame indices according to the molecule
+            name
+
+        See Also
+        --------
+        ActiveFrameSelector.__perturb_parameters
+        ActiveFrameSelector.__rank_frames
+        """
+
+        settings = dict(settings, weights=None, slient=True)
+
+        parameters_list = [parameters] + [
+            self.__perturb_parameters(parameters, step_size, constraints)
+            for _ in range(self.__number_of_directions)]
+
+        calculated_list = [executor(values) for values in parameters_list]
+
+        self.__scores = self.__rank_frames(calculated_list)
+
+        full_errors = np.array([
+            compute_error_reaxff(calculated, self.__training_datas,
+                                 settings).objectives_values
+            for calculated in calculated_list])
+
+        objectives = list(settings['objectives'].keys())
+
+        ranks = {molecule: list(np.argsort(-scores, kind='stable'))
+                 for molecule, scores in self.__scores.items()}
+
+        frames = {molecule: self.__get_fixed_frames(molecule)
+                  for molecule in self.__training_datas}
+
+        for molecule, selected in frames.items():
+            ranks[molecule] = [idx for idx in ranks[molecule]
+                               if idx not in selected]
+
+        while True:
+
+            errors = np.array([
+                compute_error_reaxff(
+                    select_frames_of_molecules(calculated, frames),
+                    select_frames_of_molecules(self.__training_datas,
+                                               frames),
+                    settings).objectives_values
+                for calculated in calculated_list])
+
+            violated = np.any(np.abs(errors - full_errors) >
+                              tolerance * np.abs(full_errors), axis=0)
+
+            molecules = set()
+
+            for objective in np.array(objectives)[violated]:
+
+                molecule = objective.rsplit('_', 1)[0]
+
+                molecules.add(molecule)
+
+                if objective.endswith('formation'):
+                    molecules.update(
+                        settings['dependencies'].get(molecule) or [])
+
+            molecules = [molecule for molecule in molecules
+                         if ranks.get(molecule)]
+
+            if not molecules:
+                break
+
+            for molecule in molecules:
+                frames[molecule].add(ranks[molecule].pop(0))
+
+        frames = {molecule: np.array(sorted(selected))
+                  for molecule, selected in frames.items()}
+
+        for molecule, selected in frames.items():
+            logger.info(f'{molecule}: {selected.size} / '
+                        f'{len(self.__training_datas[molecule])} '
+                        f'frames selected')
+
+        return frames
+
+    def __get_fixed_frames(self, molecule: str) -> set:
+        """
+        Get the frames always selected, the end points of the scan and the
+        frame with the lowest target energy
+
+        Parameters
+        ----------
+        molecule
+            name of the molecule
+
+        Returns
+        -------
+        frames
+            set of the frame indices
+        """
+
+        training_data = self.__training_datas[molecule]
+
+        frames = {0, len(training_data) - 1}
+
+        energies = [frame.get('energy') for frame in training_data]
+
+        if None not in energies:
+            frames.add(int(np.argmin(energies)))
+
+        return frames
+
+    def __perturb_parameters(self, parameters: dict, step_size: dict,
+                             constraints: dict) -> dict:
+        """
+        Perturb the parameters to be optimized along a random direction,
+        every parameter is moved up or down by the perturbation in units of
+        its step size and clamped to the constraint
+
+        Parameters
+        ----------
+        parameters
+            ReaxFF parameters
+
+        step_size
+            step size of the parameters
+
+        constraints
+            constraints of the parameters
+
+        Returns
+        -------
+        parameters
+            perturbed parameters
+        """
+
+        parameters = copy.deepcopy(parameters)
+
+        for idx, values, size, constraint in next_parameter_generator(
+                parameters, step_size, constraints, True):
+
+            values[idx] *= 1 + (self.__random_state.choice((-1, 1)) *
+                                size * self.__perturbation)
+
+            values[idx] = min(max(values[idx], constraint[0]), constraint[1])
+
+        return parameters
+
+    def __rank_frames(self, calculated_list: list) -> dict:
+        """
+        Compute the information content of the frames of every molecule
+
+        Parameters
+        ----------
+        calculated_list
+            calculated values at the initial and the perturbed parameters
+
+        Returns
+        -------
+        scores
+            dictionary of the scores of the frames according to the molecule
+            name
+
+        See Also
+        --------
+        ActiveFrameSelector.__compute_leverages
+        """
+
+        scores = {}
+
+        for molecule, training_data in self.__training_datas.items():
+
+            criteria = []
+
+            energies = [frame.get('energy') for frame in training_data]
+
+            if None not in energies and len(energies) > 2:
+
+                curvature = np.zeros(len(energies))
+
+                curvature[1:-1] = np.abs(np.diff(energies, 2))
+
+                criteria.append(curvature)
+
+            if all(frame.get('fx') is not None for frame in training_data):
+                criteria.append(np.array([
+                    np.mean(np.sqrt(np.square(frame['fx']) +
+                                    np.square(frame['fy']) +
+                                    np.square(frame['fz'])))
+                    for frame in training_data]))
+
+            criteria.append(self.__compute_leverages(
+                [calculated[molecule] for calculated in calculated_list]))
+
+            scores[molecule] = np.mean(
+                [values / values.max() if values.max() > 0 else values
+                 for values in criteria], axis=0)
+
+        return scores
+
+    def __compute_leverages(self, molecule_list: list) -> np.ndarray:
+        """
+        Compute the leverage of every frame in the finite difference
+        sensitivities of the calculated energies and charges, the sum of
+        the diagonal elements of the hat matrix over the rows of the frame
+
+        Parameters
+        ----------
+        molecule_list
+            calculated values of one molecule at the initial and the
+            perturbed parameters
+
+        Returns
+        -------
+        leverages
+            leverages of the frames
+        """
+
+        number_of_frames = len(molecule_list[0])
+
+        rows, frame_of_rows = [], []
+
+        for key in ('energy', 'q'):
+
+            if len(molecule_list) < 2 or any(
+                    frame is None or frame.get(key) is None
+                    for molecule in molecule_list for frame in molecule):
+                continue
+
+            for idx, frame in enumerate(molecule_list[0]):
+
+                sensitivities = np.column_stack([
+                    np.atleast_1d(molecule[idx][key]) -
+                    np.atleast_1d(frame[key])
+                    for molecule in molecule_list[1:]])
+
+                rows.append(sensitivities)
+
+                frame_of_rows.extend([idx] * sensitivities.shape[0])
+
+        if not rows:
+            return np.zeros(number_of_frames)
+
+        jacobian = np.vstack(rows)
+
+        scale = np.abs(jacobian).max(axis=0)
+
+        jacobian = jacobian / np.where(scale > 0, scale, 1)
+
+        u, singular_values, _ = np.linalg.svd(jacobian, full_matrices=False)
+
+        rank = np.sum(singular_values > singular_values.max() * 1e-8)
+
+        return np.bincount(frame_of_rows,
+                           weights=np.square(u[:, :rank]).sum(axis=1),
+                           minlength=number_of_frames)
+
+
+def reduce_reaxff_training_frames(holder: object, training_datas: dict,
+                                  settings: dict, parameters: dict,
+                                  step_size: dict,
+                                  constraints: dict) -> Optional[dict]:
+    """
+    Select the training frames by ActiveFrameSelector if frame_selection
+    is set in the package settings
+
+    Parameters
+    ----------
+    holder
+        CommandsHolder object storing the compiled commands for training
+
+    training_datas
+        training data of all the frames
+
+    settings
+        package settings for training
+
+    parameters
+        initial ReaxFF parameters
+
+    step_size
+        step size of the parameters
+
+    constraints
+        constraints of the parameters
+
+    Returns
+    -------
+    frames
+        dictionary of sorted frame indices according to the molecule name,
+        None if the frames are not selected
+    """
+
+    options = settings.get('frame_selection')
+
+    if not options:
+        return None
+
+    selector = ActiveFrameSelector(
+        training_datas,
+        int(options.get('number_of_directions',
+                        FRAME_SELECTION_DIRECTIONS)),
+        float(options.get('perturbation', FRAME_SELECTION_PERTURBATION)),
+        options.get('seed', FRAME_SELECTION_SEED))
+
+    return selector.select(
+        holder.execute_commands, settings, parameters, step_size,
+        constraints, float(options.get('tolerance',
+                                       FRAME_SELECTION_TOLERANCE)))
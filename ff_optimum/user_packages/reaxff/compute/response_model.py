@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+import copy
+from typing import Optional
+
+import numpy as np
+
+from ff_optimum.cores.utilities import EventLogger
+from ff_optimum.user_packages.reaxff.optimization_setting.parameters import (
+    next_parameter_generator)
+
+__all__ = ['FirstOrderResponseModel', 'create_reaxff_response_model']
+
+logger = EventLogger(__name__)
+
+RESPONSE_VALUES_KEYS = ('energy', 'q', 'fx', 'fy', 'fz', 'stress')
+
+RESPONSE_STALENESS = 20
+
+
+class FirstOrderResponseModel(object):
+
+    """
+    Class predicting the calculated values of all the frames by a first
+    order Taylor step from the values of the reference parameters
+
+    The derivatives of the energies, charges, forces and stress of every
+    frame with respect to an active parameter are refreshed from every
+    evaluation which differs from the reference in this parameter only,
+    i.e. whenever the parameter is perturbed by simulated annealing. The
+    reference is moved to the evaluated parameters when they are accepted.
+    A derivative is stale after the reference is moved more than staleness
+    times since it is refreshed.
+
+    The predicted values have the same structure as the values calculated
+    by LAMMPS and are consumed by compute_error_reaxff identically.
+
+    Attributes
+    ----------
+    __step_size: dict
+        step size of the parameters
+
+    __constraints: dict
+        constraints of the parameters
+
+    __staleness: int
+        number of moves of the reference a derivative stays valid for
+
+    __reference: tuple
+        active values and calculated values of the reference
+
+    __evaluation: tuple
+        active values and calculated values of the last evaluation
+
+    __derivatives: dict
+        version and derivatives of the frames according to the index of
+        the active parameter
+
+    __version: int
+        number of moves of the reference
+
+    Methods
+    -------
+    set_reference(parameters, calculated_values)
+        set the reference
+
+    record(parameters, calculated_values)
+        record an evaluation and refresh the derivative of the perturbed
+        parameter
+
+    accept()
+        move the reference to the last evaluation
+
+    predict(parameters)
+        predict the calculated values of the parameters
+    """
+
+    __slots__ = ['__step_size', '__constraints', '__staleness',
+                 '__reference', '__evaluation', '__derivatives', '__version']
+
+    def __init__(self, step_size: dict, constraints: dict,
+                 staleness: int=RESPONSE_STALENESS) -> None:
+
+        self.__step_size = step_size
+
+        self.__constraints = constraints
+
+        self.__staleness = staleness
+
+        self.__reference, self.__evaluation = None, None
+
+        self.__derivatives, self.__version = {}, 0
+
+    def set_reference(self, parameters: dict,
+                      calculated_values: dict) -> None:
+        """
+        Set the reference, all the derivatives are dropped
+
+        Parameters
+        ----------
+        parameters
+            ReaxFF parameters
+
+        calculated_values
+            values calculated by LAMMPS with the parameters
+
+        Returns
+        -------
+        None
+        """
+
+        self.__reference = (self.__get_active_values(parameters),
+                            copy.deepcopy(calculated_values))
+
+        self.__evaluation, self.__derivatives = None, {}
+
+    def record(self, parameters: dict, calculated_values: dict) -> None:
+        """
+        Record an evaluation, the derivative of the parameter is refreshed
+        if the evaluation differs from the reference in one parameter only.
+        The first evaluation becomes the reference once it is accepted
+
+        Parameters
+        ----------
+        parameters
+            ReaxFF parameters
+
+        calculated_values
+            values calculated by LAMMPS with the parameters
+
+        Returns
+        -------
+        None
+        """
+
+        values = self.__get_active_values(parameters)
+
+        self.__evaluation = (values, copy.deepcopy(calculated_values))
+
+        if self.__reference is None:
+            return
+
+        changed = np.flatnonzero(values != self.__reference[0])
+
+        if changed.size != 1:
+            return
+
+        idx = int(changed[0])
+
+        derivatives = self.__compute_derivatives(
+            self.__reference[1], calculated_values,
+            values[idx] - self.__reference[0][idx])
+
+        if derivatives is not None:
+            self.__derivatives[idx] = (self.__version, derivatives)
+
+    def accept(self) -> None:
+        """
+        Move the reference to the last evaluation
+
+        Returns
+        -------
+        None
+        """
+
+        if self.__evaluation is None:
+            return
+
+        self.__reference, self.__evaluation = self.__evaluation, None
+
+        self.__version += 1
+
+    def predict(self, parameters: dict) -> Optional[dict]:
+        """
+        Predict the calculated values of the parameters
+
+        Parameters
+        ----------
+        parameters
+            ReaxFF parameters
+
+        Returns
+        -------
+        calculated_values
+            predicted values, None if the derivative of a changed parameter
+            is missing or stale
+        """
+
+        if self.__reference is None:
+            return None
+
+        reference_values, reference = self.__reference
+
+        differences = self.__get_active_values(parameters) - reference_values
+
+        changed = np.flatnonzero(differences)
+
+        for idx in changed:
+
+            version, _ = self.__derivatives.get(idx, (None, None))
+
+            if (version is None or
+                    self.__version - version > self.__staleness):
+                return None
+
+        predicted = copy.deepcopy(reference)
+
+        for idx in changed:
+
+            derivatives = self.__derivatives[idx][1]
+
+            for molecule_name, frames in predicted.items():
+                for frame, derivative in zip(frames,
+                                             derivatives[molecule_name]):
+                    for key, value in derivative.items():
+                        frame[key] = frame[key] + value * differences[idx]
+
+        return predicted
+
+    def __get_active_values(self, parameters: dict) -> np.ndarray:
+        return np.array([
+            values[idx] for idx, values, _, _ in next_parameter_generator(
+                parameters, self.__step_size, self.__constraints, True)])
+
+    @staticmethod
+    def __compute_derivatives(reference: dict, calculated_values: dict,
+                              difference: float) -> Optional[dict]:
+        """
+        Compute the finite difference derivatives of the frames
+
+        Parameters
+        ----------
+        reference
+            calculated values of the reference
+
+        calculated_values
+            calculated values of the perturbed parameters
+
+        difference
+            change of the perturbed parameter
+
+        Returns
+        -------
+        derivatives
+            dictionary of list containing the derivatives of the values
+            according to the molecule name, None if a frame is failed
+        """
+
+        derivatives = {}
+
+        for molecule_name, frames in reference.items():
+
+            others = calculated_values.get(molecule_name)
+
+            if others is None or len(others) != len(frames):
+                return None
+
+            derivatives[molecule_name] = []
+
+            for frame, other in zip(frames, others):
+
+                if frame is None or other is None:
+                    return None
+
+                derivatives[molecule_name].append({
+                    key: (np.asarray(other[key]) -
+                          np.asarray(frame[key])) / difference
+                    for key in RESPONSE_VALUES_KEYS
+                    if frame.get(key) is not None and
+                    other.get(key) is not None})
+
+        return derivatives
+
+
+def create_reaxff_response_model(
+        step_size: dict, constraints: dict,
+        staleness: int=RESPONSE_STALENESS) -> FirstOrderResponseModel:
+    """
+    Create the first order response model of the calculated values
+
+    Parameters
+    ----------
+    step_size
+        step size of the parameters
+
+    constraints
+        constraints of the parameters
+
+    staleness
+        number of moves of the reference a derivative stays valid for
+
+    Returns
+    -------
+    FirstOrderResponseModel
+    """
+
+    return FirstOrderResponseModel(step_size, constraints, staleness)
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+import atexit
+import collections
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Union
+
+import numpy as np
+
+from ff_optimum.cores.utilities import EventLogger
+
+__all__ = ['SharedResultBlock', 'get_shared_result_block']
+
+logger = EventLogger(__name__)
+
+RESULT_HEADER_SIZE = 5
+
+RESULT_BLOCK_CACHE = 4
+
+__ATTACHED_BLOCKS = collections.OrderedDict()
+
+__CREATED_BLOCKS = collections.OrderedDict()
+
+
+class SharedResultBlock(object):
+
+    """
+    Class of the shared memory block the engines write the calculated
+    values of the frames into, only a completion flag is returned by the
+    engines instead of the pickled values
+
+    The slot of a frame is indexed by the position of the frame in the
+    evaluation and holds, in float64, the status, the energy, the number of
+    charge equilibration iterations, whether the charges and the stress are
+    calculated, the charges, the three components of the forces and the
+    stress. The block is created once for the frames and reused by their
+    evaluations, the values are read from a single copy of the block so
+    they stay valid after the next evaluation.
+
+    Attributes
+    ----------
+    __shared_memory: SharedMemory
+        shared memory of the block
+
+    __offsets: list
+        offset of the slot of every frame
+
+    __numbers_of_atoms: list
+        number of atoms of every frame
+
+    __names_and_steps: list
+        molecule name and step of every frame
+
+    Methods
+    -------
+    layout(idx)
+        name of the block, offset and number of atoms of a frame
+
+    reset()
+        mark all the frames as not calculated
+
+    read(statuses)
+        read the calculated values of all the frames
+
+    write(name, offset, number_of_atoms, res)
+        write the calculated values of a frame, called by the engines
+
+    close()
+        release the block
+    """
+
+    __slots__ = ['__shared_memory', '__offsets', '__numbers_of_atoms',
+                 '__names_and_steps']
+
+    def __init__(self, numbers_of_atoms: list,
+                 names_and_steps: list) -> None:
+
+        self.__numbers_of_atoms = list(numbers_of_atoms)
+
+        self.__names_and_steps = list(names_and_steps)
+
+        sizes = [self.slot_size(n) for n in self.__numbers_of_atoms]
+
+        self.__offsets = np.concatenate([[0], np.cumsum(sizes)]).tolist()
+
+        self.__shared_memory = shared_memory.SharedMemory(
+            create=True, size=max(8, 8 * self.__offsets[-1]))
+
+    @staticmethod
+    def slot_size(number_of_atoms: int) -> int:
+        return RESULT_HEADER_SIZE + 4 * number_of_atoms + 9
+
+    @property
+    def name(self) -> str:
+        return self.__shared_memory.name
+
+    def layout(self, idx: int) -> tuple:
+        return (self.__shared_memory.name, self.__offsets[idx],
+                self.__numbers_of_atoms[idx])
+
+    def reset(self) -> None:
+        """
+        Mark all the frames as not calculated
+
+        Returns
+        -------
+        None
+        """
+
+        data = np.ndarray((self.__offsets[-1],), 'f8',
+                          self.__shared_memory.buf)
+
+        data[self.__offsets[:-1]] = 0
+
+        del data
+
+    def read(self, statuses: list) -> list:
+        """
+        Read the calculated values of all the frames from one copy of the
+        block, the arrays of the values are views of the copy
+
+        Parameters
+        ----------
+        statuses
+            value returned by the engine of every frame, True if the values
+            are written into the block, the calculated values if they do
+            not fit the slot, otherwise the frame is failed
+
+        Returns
+        -------
+        results
+            list of dictionary containing name, step, charge, forces,
+            stress, energy and the number of charge equilibration
+            iterations, None for the failed frame
+        """
+
+        data = np.array(np.ndarray((self.__offsets[-1],), 'f8',
+                                   self.__shared_memory.buf))
+
+        results = []
+
+        for idx, status in enumerate(statuses):
+
+            if status is not True:
+                results.append(status if isinstance(status, dict) else None)
+                continue
+
+            offset, n = self.__offsets[idx], self.__numbers_of_atoms[idx]
+
+            header = data[offset:offset + RESULT_HEADER_SIZE]
+
+            if header[0] != 1:
+                results.append(None)
+                continue
+
+            values = data[offset + RESULT_HEADER_SIZE:
+                          offset + self.slot_size(n)]
+
+            forces = values[n:4 * n].reshape(3, n)
+
+            name, step = self.__names_and_steps[idx]
+
+            results.append({
+                'name': name, 'step': step,
+                'q': values[:n] if header[3] else None,
+                'fx': forces[0], 'fy': forces[1], 'fz': forces[2],
+                'stress': values[4 * n:] if header[4] else None,
+                'energy': float(header[1]),
+                'qeq_iterations': (None if np.isnan(header[2])
+                                   else float(header[2]))})
+
+        return results
+
+    @staticmethod
+    def write(name: str, offset: int, number_of_atoms: int,
+              res: Optional[dict]) -> Union[bool, dict]:
+        """
+        Write the calculated values of a frame into its slot, called by the
+        engines
+
+        Parameters
+        ----------
+        name
+            name of the block
+
+        offset
+            offset of the slot of the frame
+
+        number_of_atoms
+            number of atoms of the slot
+
+        res
+            calculated values of the frame, None if the frame is failed
+
+        Returns
+        -------
+        status
+            True if the values are written, the calculated values if they
+            do not fit the slot or the block is not reachable, e.g. from an
+            engine on another node, False if the frame is failed
+        """
+
+        if res is None:
+            return False
+
+        if len(res['fx']) != number_of_atoms:
+            return res
+
+        try:
+            block = _attach_result_block(name)
+
+        except FileNotFoundError:
+            return res
+
+        data = np.ndarray((SharedResultBlock.slot_size(number_of_atoms),),
+                          'f8', block.buf, 8 * offset)
+
+        n = number_of_atoms
+
+        values = data[RESULT_HEADER_SIZE:]
+
+        if res['q'] is not None:
+            values[:n] = res['q']
+
+        values[n:2 * n], values[2 * n:3 * n], values[3 * n:4 * n] = (
+            res['fx'], res['fy'], res['fz'])
+
+        if res['stress'] is not None:
+            values[4 * n:] = res['stress']
+
+        data[:RESULT_HEADER_SIZE] = (
+            1, res['energy'],
+            np.nan if res['qeq_iterations'] is None
+            else res['qeq_iterations'],
+            res['q'] is not None, res['stress'] is not None)
+
+        del data, values
+
+        return True
+
+    def close(self) -> None:
+        """
+        Release and remove the block
+
+        Returns
+        -------
+        None
+        """
+
+        self.__shared_memory.close()
+
+        self.__shared_memory.unlink()
+
+
+def _attach_result_block(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach the block by its name in the engine, the latest blocks are kept
+    attached and the block is left to its creator for removing
+
+    Parameters
+    ----------
+    name
+        name of the block
+
+    Returns
+    -------
+    SharedMemory
+        shared memory of the block
+    """
+
+    block = __ATTACHED_BLOCKS.pop(name, None)
+
+    if block is None:
+
+        block = shared_memory.SharedMemory(name=name)
+
+        # the block is not created by the engine, the resource tracker of
+        # the engine would remove it when the engine exits
+        resource_tracker.unregister(block._name, 'shared_memory')
+
+        if len(__ATTACHED_BLOCKS) >= RESULT_BLOCK_CACHE:
+            __ATTACHED_BLOCKS.popitem(last=False)[1].close()
+
+    __ATTACHED_BLOCKS[name] = block
+
+    return block
+
+
+def get_shared_result_block(numbers_of_atoms: list,
+                            names_and_steps: list) -> SharedResultBlock:
+    """
+    Get the block of the frames, the block is created for the first
+    evaluation of the frames and the latest blocks are kept for the next
+    evaluations
+
+    Parameters
+    ----------
+    numbers_of_atoms
+        number of atoms of every frame
+
+    names_and_steps
+        molecule name and step of every frame
+
+    Returns
+    -------
+    SharedResultBlock
+        block with all the frames marked as not calculated
+    """
+
+    key = (tuple(numbers_of_atoms), tuple(map(tuple, names_and_steps)))
+
+    block = __CREATED_BLOCKS.pop(key, None)
+
+    if block is None:
+
+        block = SharedResultBlock(numbers_of_atoms, names_and_steps)
+
+        logger.debug(f'Shared result block {block.name} is created for '
+                     f'{len(numbers_of_atoms)} frames')
+
+        if len(__CREATED_BLOCKS) >= RESULT_BLOCK_CACHE:
+            __CREATED_BLOCKS.popitem(last=False)[1].close()
+
+    __CREATED_BLOCKS[key] = block
+
+    block.reset()
+
+    return block
+
+
+@atexit.register
+def __close_shared_result_blocks() -> None:
+    """
+    Remove the blocks created by the process when the program terminates
+
+    Returns
+    -------
+    None
+    """
+
+    while __CREATED_BLOCKS:
+        __CREATED_BLOCKS.popitem()[1].close()
@@ -1,16 +1,29 @@
 # -*- coding: utf-8 -*-
 from .coordinator import DftXmlCoordinator
-from .read_force_field import read_reactive_force_field
+from .read_force_field import (read_reactive_force_field,
+                               read_reactive_force_fields)
 from .read_package_settings import read_reaxff_setting
-from .write_force_field import save_reactive_force_field
+from .write_force_field import (
+    is_written_value_equal, save_reactive_force_field,
+    set_reactive_force_field_precision,
+    write_reactive_force_field_from_template)
 
 __all__ = ['Coordinator', 'read_parameters_from_file',
-           'read_package_setting', 'save_parameters_to_file']
+           'read_parameters_from_files',
+           'read_package_setting', 'save_parameters_to_file',
+           'set_parameters_precision', 'write_parameters_for_evaluation',
+           'is_written_value_equal']
 
 Coordinator = DftXmlCoordinator
 
 read_parameters_from_file = read_reactive_force_field
 
+read_parameters_from_files = read_reactive_force_fields
+
 read_package_setting = read_reaxff_setting
 
 save_parameters_to_file = save_reactive_force_field
+
+set_parameters_precision = set_reactive_force_field_precision
+
+write_parameters_for_evaluation = write_reactive_force_field_from_template
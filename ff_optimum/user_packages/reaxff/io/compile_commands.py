@@ -4,6 +4,8 @@ from typing import List, Union
 import numpy as np
 
 from .atomic_mass import get_element_name_from_atomic_mass
+from ff_optimum.user_packages.reaxff.compute.frame_geometry import (
+    FrameGeometry)
 from ff_optimum.user_packages.reaxff.compute.simulation_box import (
     SimulationBox)
 from ff_optimum.cores.utilities import argument_type_check
@@ -62,6 +64,7 @@ class LammpsCommandCompiler(object):
     __pair_coeff_command: list
     __variable_commands: list
     __fix_and_run_command: list
+    __frame_geometries: list
 
     Methods
     -------
@@ -77,7 +80,8 @@ class LammpsCommandCompiler(object):
                  '__create_box_command', '__create_atom_commands',
                  '__mass_command', '__replicate_commands',
                  '__pair_style_command', '__pair_coeff_command',
-                 '__variable_commands', '__fix_and_run_command']
+                 '__variable_commands', '__fix_and_run_command',
+                 '__frame_geometries']
 
     def __init__(self):
 
@@ -108,6 +112,8 @@ class LammpsCommandCompiler(object):
         self.__fix_and_run_command = (
             ['fix 1 all qeq/reax 1 0.0 10.0 1.0e-6 reax/c', 'run 0'])
 
+        self.__frame_geometries = None
+
     def __enter__(self) -> object:
         return self
 
@@ -142,6 +148,7 @@ class LammpsCommandCompiler(object):
         LammpsCommandCompiler.__get_replicate_command_from_step
         LammpsCommandCompiler.__get_pair_coeff_command_from_result
         LammpsCommandCompiler.__get_variable_commands_from_result
+        LammpsCommandCompiler.__get_frame_geometry_from_step
         """
 
         self.__trace_infos = \
@@ -179,6 +186,10 @@ class LammpsCommandCompiler(object):
         self.__variable_commands = \
             self.__get_variable_commands_from_result(xml_result)
 
+        self.__frame_geometries = \
+            [self.__get_frame_geometry_from_step(xml_result, step)
+                for step in xml_result['positions']]
+
     def get_compiled_command(self) -> List:
         """
         Get the compiled command
@@ -191,16 +202,17 @@ class LammpsCommandCompiler(object):
         return list(
             map(lambda x:
                 self.__get_compiled_command_one_step(
-                x[0], x[1], x[2], x[3]),
+                x[0], x[1], x[2], x[3], x[4]),
                 zip(self.__trace_infos, self.__region_box_commands,
                     self.__create_atom_commands,
-                    self.__replicate_commands)))
+                    self.__replicate_commands, self.__frame_geometries)))
 
     def __get_compiled_command_one_step(
         self, trace_info: List[str],
                 region_box_command: str,
                 create_atom_command: str,
-                replicate_command: str) -> dict:
+                replicate_command: str,
+                frame_geometry: FrameGeometry) -> dict:
         """
         Get one step of compiled command
 
@@ -215,6 +227,9 @@ class LammpsCommandCompiler(object):
         replicate_command
             commands of replicate
 
+        frame_geometry
+            geometry of the frame, its pairs are found on first use
+
         Returns
         -------
         dictionary of one step of compiled command
@@ -247,7 +262,8 @@ class LammpsCommandCompiler(object):
         lammps_commands = {'trace_info': trace_info,
                            'before_pair_coeff': commands_before_pair_coeff,
                            'pair_coeff': [self.__pair_coeff_command],
-                           'after_pair_coeff': commands_after_pair_coeff}
+                           'after_pair_coeff': commands_after_pair_coeff,
+                           'geometry': frame_geometry}
 
         return lammps_commands
 
@@ -286,6 +302,36 @@ class LammpsCommandCompiler(object):
 
         return command
 
+    def __get_frame_geometry_from_step(self, xml_result: dict,
+                                       step: dict) -> FrameGeometry:
+        """
+        Get the geometry of one step in LAMMPS coordinates, the pairs
+        within the ReaxFF cutoff are found when they are first requested
+
+        Parameters
+        ----------
+        xml_result
+            xml parse results
+
+        step
+            the step information in xml parse results
+
+        Returns
+        -------
+        frame_geometry
+
+        See Also
+        --------
+        FrameGeometry.from_xml_step
+        LammpsCommandCompiler.__get_replicate_from_step
+        """
+
+        elements = list(map(get_element_name_from_atomic_mass,
+                            xml_result['mass'].split(' ')))
+
+        return FrameGeometry.from_xml_step(
+            xml_result, elements, step, self.__get_replicate_from_step(step))
+
     @staticmethod
     def __get_units_command_from_result(xml_result: dict) -> str:
         """
@@ -435,6 +481,33 @@ class LammpsCommandCompiler(object):
         -------
         replicate command
 
+        See Also
+        --------
+        LammpsCommandCompiler.__get_replicate_from_step
+
+        """
+
+        rep = self.__get_replicate_from_step(step)
+
+        if rep != (1, 1, 1):
+            return f'replicate {rep[0]} {rep[1]} {rep[2]}'
+
+        return str()
+
+    def __get_replicate_from_step(self, step: dict) -> tuple:
+        """
+        Get the replication of the box along the three directions from xml
+        parse results, only the small periodic directions are replicated
+
+        Parameters
+        ----------
+        step
+            the step information in xml parse results
+
+        Returns
+        -------
+        replication of the box
+
         See Also
         --------
         LammpsCommandCompiler.__replicate
@@ -456,9 +529,9 @@ class LammpsCommandCompiler(object):
                     if 'f' in periodicities[idx]:
                         rep[idx] = 1
 
-                return f'replicate {rep[0]} {rep[1]} {rep[2]}'
+                return tuple(int(value) for value in rep)
 
-        return str()
+        return (1, 1, 1)
 
     @staticmethod
     def __get_pair_coeff_command_from_result(
@@ -1,19 +1,25 @@
 # -*- coding: utf-8 -*-
+import fnmatch
 from itertools import filterfalse
+import os
 import re
 from typing import Optional, Union
 
 import numpy as np
 
+from ff_optimum.cores.utilities import get_client, is_client_ready
 from ff_optimum.cores.utilities.event_logging import EventLogger
 from ff_optimum.cores.utilities.exceptions import FileEmptyError
-from ff_optimum.cores.utilities.file_path import file_is_file_path_valid
+from ff_optimum.cores.utilities.file_path import (file_is_directory_valid,
+                                                  file_is_file_path_valid,
+                                                  file_set_path)
 from ff_optimum.user_packages.reaxff.optimization_setting import (
     REAXFF_PARAM_DTYPE, REAXFF_GENERAL_PARAMS, REAXFF_TYPE_PARAMS,
     REAXFF_BOND_PARAMS, REAXFF_DIAG_PARAMS, REAXFF_ANGLE_PARAMS,
-    REAXFF_TORSION_PARAMS, REAXFF_HYDROGEN_BOND_PARAMS)
+    REAXFF_TORSION_PARAMS, REAXFF_HYDROGEN_BOND_PARAMS, flatten_parameters,
+    get_parameters_layout)
 
-__all__ = ['read_reactive_force_field']
+__all__ = ['read_reactive_force_field', 'read_reactive_force_fields']
 
 logger = EventLogger(__name__)
 
@@ -67,33 +73,159 @@ def read_reactive_force_field(force_field_directory: str) -> dict:
     return reader.parameters
 
 
-class ReactiveForceFieldReader(object):
+def read_reactive_force_fields(force_field_directories: Union[str, list],
+                               pattern: str='ffield*') -> tuple:
+    """
+    Read a batch of reactive force field files into a stacked parameter
+    matrix, e.g. the force fields dumped from the achrive
+
+    The files are read parallely if the Singleton Client of ipyparallel is
+    ready otherwise, they will be read serially.
+
+    Parameters
+    ----------
+    force_field_directories
+        list of file paths of the force fields, or a directory searched
+        recursively for the files matching the pattern
+
+    pattern
+        pattern of the file names when a directory is given
+
+    Returns
+    -------
+    file_paths
+        file paths of the force fields in the order of the rows
+
+    layout
+        layout of the parameters shared by all the force fields
+
+    parameters_matrix
+        matrix of the flattened parameters, one row per force field
+
+    Raises
+    ------
+    FileNotFoundError
+        when no force field file is found
 
+    ValueError
+        when the layout of the force fields are not identical
+
+    See Also
+    --------
+    reaxff.io.read_force_field.__read_flattened_reactive_force_field
+    reaxff.optimization_setting.parameters.flatten_parameters
+    reaxff.optimization_setting.parameters.unflatten_parameters
+    utilities.parallel.ipyparallel_singleton.is_client_ready
     """
-    Class for reading ReaxFF parameters file
+
+    if isinstance(force_field_directories, str):
+        file_paths = __search_force_field_files(force_field_directories,
+                                                pattern)
+    else:
+        file_paths = list(force_field_directories)
+
+    if not file_paths:
+        raise FileNotFoundError(f'No force field is found in '
+                                f'{force_field_directories}')
+
+    if is_client_ready():
+        results = get_client()[:].map_sync(
+            __read_flattened_reactive_force_field, file_paths)
+    else:
+        results = list(map(__read_flattened_reactive_force_field,
+                           file_paths))
+
+    layout = results[0][0]
+
+    for file_path, (other_layout, _) in zip(file_paths, results):
+        if other_layout != layout:
+            raise ValueError(f'Layout of force field {file_path} mismatch')
+
+    parameters_matrix = np.vstack([values for _, values in results])
+
+    logger.info(f'Read {len(file_paths)} force fields, '
+                f'number of parameters: {parameters_matrix.shape[1]}')
+
+    return file_paths, layout, parameters_matrix
+
+
+def __search_force_field_files(directory: str, pattern: str) -> list:
     """
+    Search the directory recursively for the force field files
 
-    __TYPE_LINE_WIDTH = 4
+    Parameters
+    ----------
+    directory
+        directory to be searched
 
-    __BOND_LINE_WIDTH = 2
+    pattern
+        pattern of the file names
 
-    __NUMBER_PATTERN = re.compile('(\d+)(\s+!\s+)([\w+\s\-*\w+]{1,})')
+    Returns
+    -------
+    file_paths
+        file paths sorted by the numbers in the paths,
+        e.g. save_2/ffield_10 is placed after save_2/ffield_9
+    """
+
+    file_is_directory_valid(directory)
+
+    file_paths = []
+
+    for root, _, file_names in os.walk(directory):
+        file_paths.extend(file_set_path(root, file_name) for file_name in
+                          fnmatch.filter(file_names, pattern))
+
+    return sorted(file_paths, key=lambda path: [
+        int(text) if text.isdigit() else text
+        for text in re.split(r'(\d+)', path)])
+
+
+def __read_flattened_reactive_force_field(file_path: str) -> tuple:
+    """
+    Read the force field and flatten the parameters
+
+    Parameters
+    ----------
+    file_path
+        file path of the force field
+
+    Returns
+    -------
+    layout
+        layout of the parameters
+
+    flattened
+        flattened parameters values
+
+    See Also
+    --------
+    ReactiveForceFieldReader
+    """
+
+    parameters = ReactiveForceFieldReader(file_path).parameters
+
+    return (get_parameters_layout(parameters),
+            flatten_parameters(parameters))
 
-    __VALUES_PATTERN = re.compile('(-*\d+.\d+)')
 
-    __GENERAL_PARAM_PATTERN = re.compile('(-*\d+.\d+)( !)(.+)')
+class ReactiveForceFieldReader(object):
 
-    __TYPE_PATTERN = re.compile('(\s*[\w+]*\s+)(.+)')
+    """
+    Class for reading ReaxFF parameters file
 
-    __BOND_PATTERN = re.compile('(\s*[\d+\s+\d+]*\s+)(.+)')
+    Each section of the file is tokenized as a whole and the parameters of
+    a category are allocated in one structured array, the parameters of an
+    entry is a row view of the array
+    """
 
-    __OFF_DIAGONAL_PATTERN = re.compile('(\s*\d+\s+\d+\s+)(.+)')
+    __TYPE_LINE_WIDTH = 4
 
-    __ANGLE_PATTERN = re.compile('(\s*\d+\s+\d+\s+\d+\s+)(.+)')
+    __BOND_LINE_WIDTH = 2
 
-    __TORSION_PATTERN = re.compile('(\s*\d+\s+\d+\s+\d+\s+\d+\s+)(.+)')
+    __NUMBER_PATTERN = re.compile('(\d+)(\s+!\s+)([\w+\s\-*\w+]{1,})')
 
-    __HYDROGEN_BOND_PATTERN = re.compile('(\s*\d+\s+\d+\s+\d+\s+)(.+)')
+    __VALUES_PATTERN = re.compile(r'-?\d*\.\d+(?:[eE][-+]?\d+)?|\S+')
 
     __slots__ = ['__parameters']
 
@@ -126,20 +258,22 @@ class ReactiveForceFieldReader(object):
         --------
         ReactiveForceFieldReader.__read_general_parameters
         ReactiveForceFieldReader.__read_atoms
-        ReactiveForceFieldReader.__read_bonds
-        ReactiveForceFieldReader.__read_off_diagonal
-        ReactiveForceFieldReader.__read_angle
-        ReactiveForceFieldReader.__read_torsion
-        ReactiveForceFieldReader.__read_hydrogen_bonds
+        ReactiveForceFieldReader.__read_entries
         cores.utilities.file_path.file_is_file_path_valid
         """
 
         file_is_file_path_valid(reactive_force_field_directory)
 
         with open(reactive_force_field_directory, 'r') as fp:
-            lines = list(map(lambda line: line.strip('\n'),
-                             filterfalse(lambda line: line.startswith('#'),
-                                         fp.readlines())))
+            lines = list(filterfalse(lambda line: line.startswith('#'),
+                                     fp.read().splitlines()))
+
+        sections = {
+            'bonds': (self.__BOND_LINE_WIDTH, 2, REAXFF_BOND_PARAMS),
+            'off-diagonal': (1, 2, REAXFF_DIAG_PARAMS),
+            'angles': (1, 3, REAXFF_ANGLE_PARAMS),
+            'torsions': (1, 4, REAXFF_TORSION_PARAMS),
+            'hydrogen': (1, 3, REAXFF_HYDROGEN_BOND_PARAMS)}
 
         parameters = dict()
 
@@ -149,89 +283,55 @@ class ReactiveForceFieldReader(object):
 
             res = re.match(self.__NUMBER_PATTERN, lines[idx].strip())
 
-            if res:
-
-                number_of_param = int(res.group(1))
-
-                param_type = res.group(3).split(' ')[2]
-
-                if number_of_param > 0:
-
-                    if 'general' in param_type:
-
-                        idx += 1
-
-                        parameters[param_type] = \
-                            self.__read_general_parameters(
-                                lines[idx:(idx + number_of_param)])
-
-                        idx += number_of_param
-
-                    elif 'atoms' in param_type:
-
-                        idx += self.__TYPE_LINE_WIDTH
-
-                        elements, parameters[param_type] = self.__read_atoms(
-                            lines[idx:(idx + number_of_param *
-                                       self.__TYPE_LINE_WIDTH)],
-                            number_of_param)
-
-                        idx += number_of_param * self.__TYPE_LINE_WIDTH
-
-                    elif 'bonds' in param_type:
-
-                        idx += self.__BOND_LINE_WIDTH
+            if not res:
+                idx += 1
+                continue
 
-                        parameters[param_type] = self.__read_bonds(
-                            lines[idx:(idx + number_of_param *
-                                       self.__BOND_LINE_WIDTH)],
-                            elements,
-                            number_of_param)
+            number_of_param = int(res.group(1))
 
-                        idx += number_of_param * self.__BOND_LINE_WIDTH
+            param_type = res.group(3).split(' ')[2]
 
-                    elif 'off-diagonal' in param_type:
+            if number_of_param == 0:
+                idx += 1
+                continue
 
-                        idx += 1
+            if 'general' in param_type:
 
-                        parameters[param_type] = self.__read_off_diagonal(
-                            lines[idx:(idx + number_of_param)],
-                            elements, number_of_param)
+                idx += 1
 
-                        idx += number_of_param
+                parameters[param_type] = self.__read_general_parameters(
+                    lines[idx:(idx + number_of_param)])
 
-                    elif 'angles' in param_type:
+                idx += number_of_param
 
-                        idx += 1
+            elif 'atoms' in param_type:
 
-                        parameters[param_type] = self.__read_angle(
-                            lines[idx:(idx + number_of_param)],
-                            elements, number_of_param)
+                idx += self.__TYPE_LINE_WIDTH
 
-                        idx += number_of_param
+                width = number_of_param * self.__TYPE_LINE_WIDTH
 
-                    elif 'torsions' in param_type:
+                elements, parameters[param_type] = self.__read_atoms(
+                    lines[idx:(idx + width)], number_of_param)
 
-                        idx += 1
+                idx += width
 
-                        parameters[param_type] = self.__read_torsion(
-                            lines[idx:(idx + number_of_param)],
-                            elements, number_of_param)
+            elif param_type in sections:
 
-                        idx += number_of_param
+                line_width, number_of_elements, param_names = \
+                    sections[param_type]
 
-                    elif 'hydrogen' in param_type:
+                idx += line_width
 
-                        idx += 1
+                width = number_of_param * line_width
 
-                        parameters[param_type] = self.__read_hydrogen_bonds(
-                            lines[idx:(idx + number_of_param)],
-                            elements, number_of_param)
+                parameters[param_type] = self.__read_entries(
+                    param_type, lines[idx:(idx + width)], elements,
+                    number_of_param, number_of_elements, param_names)
 
-                        idx += number_of_param
+                idx += width
 
-                else:
-                    idx += 1
+            else:
+                idx += 1
 
         self.__parameters = parameters
 
@@ -253,22 +353,19 @@ class ReactiveForceFieldReader(object):
             number of REAXFF_GENERAL_PARAMS
         """
 
-        general_parameters = dict.fromkeys(REAXFF_GENERAL_PARAMS, float)
-
-        idx = 0
-
-        for line in lines:
+        if len(REAXFF_GENERAL_PARAMS) != len(lines):
+            raise ValueError('Number of general parameters mismatch')
 
-            res = re.match(self.__GENERAL_PARAM_PATTERN, line.strip())
+        general_parameters = dict()
 
-            key = res.group(3)
+        for key, line in zip(REAXFF_GENERAL_PARAMS, lines):
 
-            if not key in REAXFF_GENERAL_PARAMS:
-                key = REAXFF_GENERAL_PARAMS[idx]
+            value, _, comment = line.partition('!')
 
-            general_parameters[key] = float(res.group(1))
+            if comment.strip() in REAXFF_GENERAL_PARAMS:
+                key = comment.strip()
 
-            idx += 1
+            general_parameters[key] = float(value)
 
         if len(REAXFF_GENERAL_PARAMS) != len(general_parameters):
             raise ValueError('Number of general parameters mismatch')
@@ -298,358 +395,161 @@ class ReactiveForceFieldReader(object):
         ValueError
             when number of atoms parameters read is not equal to
             number of atoms stated in the file
-        """
-
-        type_parameters = dict()
-
-        elements = ['*']
-
-        idx = 0
-
-        while idx < len(lines):
-
-            values = []
-
-            for i in range(self.__TYPE_LINE_WIDTH):
-
-                res = re.match(self.__TYPE_PATTERN, lines[idx + i])
-
-                element = res.group(1).strip()
-
-                if element:
-
-                    elements.append(element)
-
-                    element_str = element
-
-                values.extend(re.findall(self.__VALUES_PATTERN, res.group(2)))
-
-            else:
-
-                value_array = np.zeros(len(REAXFF_TYPE_PARAMS),
-                                       dtype=REAXFF_PARAM_DTYPE)
-
-                value_array['name'] = np.array(REAXFF_TYPE_PARAMS, dtype='U10')
-
-                value_array['value'] = np.array(values, dtype='f8')
-
-                type_parameters[element_str] = value_array
-
-                idx += self.__TYPE_LINE_WIDTH
-
-        if number_of_atoms != len(elements) - 1:
-            raise ValueError('Nr of atoms mismatch')
-
-        return elements, type_parameters
-
-    def __read_bonds(self, lines: list, elements: list,
-                     number_of_bonds: int) -> dict:
-        """
-        Read the bonds parameters from the force field file
-
-        lines:
-            lines containing general parameters
-
-        elements
-            name of the elements in the file
-
-        number_of_bonds:
-            number of bonds stated in the file
-
-        Returns
-        -------
-        bonds_parameter
-            bonds parameter values
-
-        Raises
-        ------
-        ValueError
-            when number of bonds read is not equal to
-            number of bonds stated in the file
 
         See Also
         --------
-        ReactiveForceFieldReader.__get_string
+        ReactiveForceFieldReader.__tokenize
         """
 
-        bonds_parameter = {}
-
-        idx = 0
-
-        while idx < len(lines):
-
-            values = []
-
-            for i in range(self.__BOND_LINE_WIDTH):
-
-                res = re.match(self.__BOND_PATTERN, lines[idx])
+        tokens = self.__tokenize(
+            'atoms', lines, number_of_atoms, 1 + len(REAXFF_TYPE_PARAMS))
 
-                if res:
+        elements = ['*'] + tokens[:, 0].tolist()
 
-                    bond = (res.group(1).strip())
+        values = self.__allocate(tokens[:, 1:], REAXFF_TYPE_PARAMS)
 
-                    if bond:
+        type_parameters = dict(zip(elements[1:], values))
 
-                        bond_str = self.__get_string(bond, elements, 2)
-
-                    values.extend(re.findall(self.__VALUES_PATTERN,
-                                             res.group(2)))
-
-                idx += 1
-
-            else:
+        if number_of_atoms != len(type_parameters):
+            raise ValueError('Nr of atoms mismatch')
 
-                bond_values = np.zeros(len(REAXFF_BOND_PARAMS),
-                                       dtype=REAXFF_PARAM_DTYPE)
+        return elements, type_parameters
 
-                bond_values['name'] = np.array(REAXFF_BOND_PARAMS, dtype='U10')
+    def __read_entries(self, category_name: str, lines: list,
+                       elements: list, number_of_entries: int,
+                       number_of_elements: int, param_names: list) -> dict:
+        """
+        Read the parameters of bonds, off-diagonal, angles, torsions or
+        hydrogen bonds from the force field file
 
-                bond_values['value'] = np.array(values, dtype=np.float)
+        Parameters
+        ----------
+        category_name
+            name of the category
 
-                bonds_parameter[bond_str] = bond_values
+        lines
+            the lines containing parameters values
 
-        return bonds_parameter
+        elements
+            list of string of elements
 
-    def __read_off_diagonal(self, lines: list, elements: list,
-                            number_of_off_diagonal: int) -> dict:
-        """
-        Read the off-diagonal parameters from the force field file
+        number_of_entries
+            number of entries stated in the file
 
-        lines:
-            lines containing general parameters
-
-        elements
-            name of the elements in the file
+        number_of_elements
+            number of elements in the specific type
 
-        number_of_off_diagonal:
-            number of off-diagonal stated in the file
+        param_names
+            name of the parameters
 
         Returns
         -------
-        off_diagonal_parameters
-            off_diagonal_parameters parameters values
+        parameters
+            parameters values of the entries
 
         Raises
         ------
         ValueError
-            when number of off-diagonal read is not equal to
-            number of off-diagonal stated in the file
+            when number of entries read is not equal to
+            number of entries stated in the file
 
         See Also
         --------
-        ReactiveForceFieldReader.__read_parameters
+        ReactiveForceFieldReader.__tokenize
+        ReactiveForceFieldReader.__allocate
         """
 
-        off_diagonal_parameters = self.__read_parameters(
-            lines, self.__OFF_DIAGONAL_PATTERN, elements,
-                REAXFF_DIAG_PARAMS, 2)
+        tokens = self.__tokenize(category_name, lines, number_of_entries,
+                                 number_of_elements + len(param_names))
 
-        if(number_of_off_diagonal != len(off_diagonal_parameters)):
-            raise ValueError('Nr of off-diagonal terms mismatch')
+        try:
+            names = np.asarray(elements)[
+                tokens[:, :number_of_elements].astype(int)]
+        except (IndexError, ValueError):
+            raise ValueError(f'Index of elements in {category_name} mismatch')
 
-        return off_diagonal_parameters
+        values = self.__allocate(tokens[:, number_of_elements:], param_names)
 
-    def __read_angle(self, lines: list, elements: list,
-                     number_of_angle: int) -> dict:
-        """
-        Read the angle parameters from the force field file
-
-        lines:
-            lines containing general parameters
+        parameters = dict(zip(map('-'.join, names), values))
 
-        elements
-            name of the elements in the file
+        if number_of_entries != len(parameters):
+            raise ValueError(f'Nr of {category_name} mismatch')
 
-        number_of_angle:
-            number of angle stated in the file
-
-        Returns
-        -------
-        angle_parameters
-            angle parameters values
-
-        Raises
-        ------
-        ValueError
-            when number of angle read is not equal to
-            number of angle stated in the file
+        return parameters
 
-        See Also
-        --------
-        ReactiveForceFieldReader.__read_parameters
+    @staticmethod
+    def __tokenize(category_name: str, lines: list, number_of_entries: int,
+                   number_of_tokens: int) -> np.ndarray:
         """
+        Split the lines of a section into a matrix of tokens,
+        one row per entry
 
-        angle_parameters = self.__read_parameters(
-            lines, self.__ANGLE_PATTERN,
-            elements, REAXFF_ANGLE_PARAMS, 3)
-
-        if(number_of_angle != len(angle_parameters)):
-            raise ValueError('Nr of angles mismatch')
+        The lines are split by white spaces, if the number of tokens is not
+        matched, e.g. negative values written without separation,
+        the values are matched by the pattern
 
-        return angle_parameters
-
-    def __read_torsion(self, lines: list, elements: list,
-                       number_of_torsion: int) -> dict:
-        """
-        Read the torsion parameters from the force field file
+        Parameters
+        ----------
+        category_name
+            name of the category
 
-        lines:
-            lines containing general parameters
+        lines
+            the lines of the section
 
-        elements
-            name of the elements in the file
+        number_of_entries
+            number of entries stated in the file
 
-        number_of_torsion:
-            number of torsion stated in the file
+        number_of_tokens
+            number of tokens of each entry
 
         Returns
         -------
-        torsion_parameters
-            torsion parameters values
+        tokens
+            matrix of the tokens
 
         Raises
         ------
         ValueError
-            when number of torsion read is not equal to
-            number of torsion stated in the file
-
-        See Also
-        --------
-        ReactiveForceFieldReader.__read_parameters
-        """
-
-        torsion_parameters = self.__read_parameters(
-            lines, self.__TORSION_PATTERN,
-            elements, REAXFF_TORSION_PARAMS, 4)
-
-        if(number_of_torsion != len(torsion_parameters)):
-            raise ValueError('Nr of torsions mismatch')
-
-        return torsion_parameters
-
-    def __read_hydrogen_bonds(self, lines: list, elements: list,
-                              number_of_hygrogen_bond: int) -> dict:
+            when the number of tokens is not matched with
+            the number of entries
         """
-        Read the hydrogen bond parameters from the force field file
-
-        lines:
-            lines containing general parameters
-
-        elements
-            name of the elements in the file
-
-        number_of_hygrogen_bond:
-            number of hydrogen bond stated in the file
-
-        Returns
-        -------
-        hydrogen_bond_parameters
-            torsion parameters values
 
-        Raises
-        ------
-        ValueError
-            when number of hydrogen bond read is not equal to
-            number of hydrogen bond stated in the file
+        text = ' '.join(lines)
 
-        See Also
-        --------
-        ReactiveForceFieldReader.__read_parameters
-        """
+        tokens = text.split()
 
-        hydrogen_bond_parameters = self.__read_parameters(
-            lines, self.__HYDROGEN_BOND_PATTERN, elements,
-            REAXFF_HYDROGEN_BOND_PARAMS, 3)
+        if len(tokens) != number_of_entries * number_of_tokens:
+            tokens = re.findall(ReactiveForceFieldReader.__VALUES_PATTERN,
+                                text)
 
-        if number_of_hygrogen_bond != len(hydrogen_bond_parameters):
-            raise ValueError('Nr of hydrogen bonds mismatch')
+        if len(tokens) != number_of_entries * number_of_tokens:
+            raise ValueError(f'Nr of {category_name} mismatch')
 
-        return hydrogen_bond_parameters
+        return np.asarray(tokens).reshape(number_of_entries, number_of_tokens)
 
     @staticmethod
-    def __read_parameters(lines: list, pattern: object,
-                          elements: list,
-                          param_names: list,
-                          number_of_elements: int) -> dict:
+    def __allocate(tokens: np.ndarray, param_names: list) -> np.ndarray:
         """
-        Read parameters from the force field file
+        Allocate the parameters of a category in one structured array
 
         Parameters
         ----------
-        lines
-            the lines containing parameters values
-        pattern
-            pattern of the specific type of parameters
-
-        elements
-            list of string of elements
+        tokens
+            matrix of the values tokens, one row per entry
 
         param_names
             name of the parameters
 
-        number_of_elements
-            number of elements in the specific type
-
-
-        See Also
-        --------
-        ReactiveForceFieldReader.__get_string
-        """
-
-        parameters = {}
-
-        for line in lines:
-
-            res = re.match(pattern, line)
-
-            if res:
-
-                parameter_str = ReactiveForceFieldReader.__get_string(
-                    res.group(1).strip(), elements, number_of_elements)
-
-                values = np.zeros(len(param_names), dtype=REAXFF_PARAM_DTYPE)
-
-                values['name'] = np.array(param_names, dtype='U10')
-
-                values['value'] = np.array(
-                    re.findall(ReactiveForceFieldReader.__VALUES_PATTERN,
-                               res.group(2)), dtype=np.float)
-
-                parameters[parameter_str] = values
-
-        return parameters
-
-    @staticmethod
-    def __get_string(something: str, elements: list,
-                     number_of_elements: int) -> str:
-        """
-        Get the bond string from index to elements
-
-        e.g. 1 2 3 and the elements is H S Ge then the output will be H-S-Ge
-
-        Parameters
-        ----------
-        something
-            element in index
-
-        elements
-            element in string
-
-        number_of_elements
-            number of elements in the string
-
         Returns
         -------
-        bond string in elements
+        values
+            structured array, one row per entry
         """
 
-        res = str()
+        values = np.zeros(tokens.shape, dtype=REAXFF_PARAM_DTYPE)
 
-        atoms = list(map(int, something.split('  ')))
+        values['name'] = param_names
 
-        for idx in range(number_of_elements - 1):
-            res += elements[atoms[idx]] + '-'
-        else:
-            res += elements[atoms[-1]]
+        values['value'] = tokens.astype('f8')
 
-        return res
+        return values
@@ -26,6 +26,16 @@ def read_reaxff_setting(setting: dict) -> dict:
 
     slient, weights = setting.get('slient', True), setting.get('weights', None)
 
+    precision = setting.get('ffield_precision', None)
+
+    engine = setting.get('engine', 'lammps')
+
+    warm_start = setting.get('warm_start', False)
+
+    frame_selection = setting.get('frame_selection', None)
+
+    sensitivity_analysis = setting.get('sensitivity_analysis', None)
+
     composition, dependencies, objectives, mol_weights = {}, {}, {}, {}
 
     for molecule_name, molecule_info in setting['molecules'].items():
@@ -55,7 +65,10 @@ def read_reaxff_setting(setting: dict) -> dict:
     return {"level": optimization_level, "composition": composition,
             "dependencies": dependencies, "objectives": objectives,
             "slient": slient, "weights": weights,
-            "mol_weights": mol_weights}
+            "mol_weights": mol_weights, "precision": precision,
+            "engine": engine, "warm_start": warm_start,
+            "frame_selection": frame_selection,
+            "sensitivity_analysis": sensitivity_analysis}
 
 
 def __read_formation_energy_information_one_mol(
@@ -1,143 +1,287 @@
 # -*- coding: utf-8 -*-
 import os
-from typing import Optional
+from typing import Optional, Union
 
 import numpy as np
 
-from ff_optimum.cores.utilities.file_path import file_create_directory
-from ff_optimum.user_packages.reaxff.optimization_setting \
-    import REAXFF_GENERAL_PARAMS
+from ff_optimum.cores.utilities.file_path import (file_atomic_write,
+                                                  file_create_directory)
+from ff_optimum.user_packages.reaxff.optimization_setting import (
+    REAXFF_GENERAL_PARAMS, flatten_parameters, get_parameters_layout)
 
-__all__ = ['save_reactive_force_field']
+__all__ = ['ReactiveForceFieldTemplate', 'save_reactive_force_field',
+           'write_reactive_force_field_from_template',
+           'set_reactive_force_field_precision',
+           'get_reactive_force_field_precision', 'is_written_value_equal']
 
+REAXFF_DEFAULT_PRECISION = 4
 
-class ReactiveForceFieldWriter(object):
+REAXFF_FULL_PRECISION = 10
 
-    @classmethod
-    def write_force_field_to_file(cls, parameters: dict,
-                                  directory: str) -> None:
+
+class ReactiveForceFieldTemplate(object):
+
+    """
+    Class for the precompiled layout of the force field file
+
+    The layout of the file is compiled once into a buffer of text fragments
+    with numeric slots, writing the parameters only refill the slots,
+    optionally only the slots whose values are changed since the last fill
+
+    Attributes
+    ----------
+    __layout: tuple
+        layout of the parameters compiled into the template
+
+    __precision: int
+        number of decimals of the numeric slots
+
+    __buffer: list
+        text fragments and formatted values of the force field file
+
+    __slot_positions: np.ndarray
+        positions of the numeric slots inside the buffer
+
+    __slot_formats: list
+        format of every numeric slot
+
+    __slot_order: np.ndarray
+        position of every numeric slot inside the flattened parameters
+
+    __values: np.ndarray
+        values currently formatted in the numeric slots
+
+    Methods
+    -------
+    is_compatible(parameters)
+        check whether the parameters share the compiled layout
+
+    fill(parameters, only_changed)
+        fill the parameters into the template
+
+    write(parameters, file_path, only_changed)
+        fill the parameters into the template and write it to file
+    """
+
+    __slots__ = ['__layout', '__precision', '__buffer', '__slot_positions',
+                 '__slot_formats', '__slot_order', '__values']
+
+    def __init__(self, parameters: dict,
+                 precision: int=REAXFF_DEFAULT_PRECISION) -> None:
+
+        self.__layout = get_parameters_layout(parameters)
+
+        self.__precision = int(precision)
+
+        self.__buffer = list()
+
+        self.__slot_formats = list()
+
+        self.__values = None
+
+        self.__compile(parameters)
+
+    @property
+    def layout(self) -> tuple:
+        return self.__layout
+
+    @property
+    def precision(self) -> int:
+        return self.__precision
+
+    def is_compatible(self, parameters: dict) -> bool:
         """
-        Write the force field parameters to the file
+        Check whether the parameters share the layout of the template
 
         Parameters
         ----------
         parameters
             force field parameters
 
-        directory
-            target directory
-
         Returns
         -------
-        None
+        True if the layout is the same
+        Otherwise False
+        """
 
-        See Also
-        --------
-        ReactiveForceFieldWriter.__prepare_headers
-        ReactiveForceFieldWriter.__prepare_general_parameters_contents
-        ReactiveForceFieldWriter.__prepare_atoms_contents
-        ReactiveForceFieldWriter.__prepare_bonds_contents
-        ReactiveForceFieldWriter.__prepare_off_diagonals_contents
-        ReactiveForceFieldWriter.__prepare_angles_contents
-        ReactiveForceFieldWriter.__prepare_torsions_contents
-        ReactiveForceFieldWriter.__prepare_hydrogen_bonds_contents
+        return get_parameters_layout(parameters) == self.__layout
+
+    def fill(self, parameters: dict, only_changed: bool=True) -> str:
         """
+        Fill the parameters values into the numeric slots
 
-        np.set_printoptions(formatter={'float_kind': lambda x: '%8.4f' % x})
+        Parameters
+        ----------
+        parameters
+            force field parameters sharing the layout of the template
 
-        elements = parameters['atoms'].keys()
+        only_changed
+            only reformat the slots whose value is changed since last fill
 
-        with open(directory, 'w') as fp:
+        Returns
+        -------
+        content of the force field file
+        """
 
-            fp.write(cls.__prepare_headers(elements))
+        values = flatten_parameters(parameters)[self.__slot_order]
 
-            fp.writelines(
-                cls.__prepare_general_parameters_contents(
-                    parameters['general']))
+        if only_changed and self.__values is not None:
+            indices = np.flatnonzero(values != self.__values)
+        else:
+            indices = range(values.size)
 
-            fp.writelines(cls.__prepare_atoms_contents(parameters['atoms']))
+        for index in indices:
+            self.__buffer[self.__slot_positions[index]] = (
+                self.__slot_formats[index] % values[index])
 
-            fp.writelines(cls.__prepare_bonds_contents(
-                parameters.get('bonds', None), elements))
+        self.__values = values
 
-            fp.writelines(
-                cls.__prepare_off_diagonals_contents(
-                    parameters.get('off-diagonal', None), elements))
+        return ''.join(self.__buffer)
 
-            fp.writelines(
-                cls.__prepare_angles_contents(
-                    parameters.get('angles', None), elements))
+    def write(self, parameters: dict, file_path: str,
+              only_changed: bool=True) -> None:
+        """
+        Fill the parameters and write the force field file
 
-            fp.writelines(
-                cls.__prepare_torsions_contents(
-                    parameters.get('torsions', None), elements))
+        Parameters
+        ----------
+        parameters
+            force field parameters sharing the layout of the template
 
-            fp.writelines(
-                cls.__prepare_hydrogen_bonds_contents(
-                    parameters.get('hydrogen', None), elements))
+        file_path
+            path of the force field file
 
-    @staticmethod
-    def __prepare_headers(elements: list) -> str:
+        only_changed
+            only reformat the slots whose value is changed since last fill
+
+        Returns
+        -------
+        None
+
+        See Also
+        --------
+        ReactiveForceFieldTemplate.fill
         """
-        Prepare the header of the force field file
+
+        content = self.fill(parameters, only_changed)
+
+        with open(file_path, 'w') as fp:
+            fp.write(content)
+
+    def __compile(self, parameters: dict) -> None:
+        """
+        Compile the layout of the force field file into the buffer
 
         Parameters
         ----------
-        elements
-            elements in the force field
+        parameters
+            force field parameters
 
         Returns
         -------
-        header
+        None
 
+        See Also
+        --------
+        ReactiveForceFieldTemplate.__compile_general_parameters
+        ReactiveForceFieldTemplate.__compile_atoms
+        ReactiveForceFieldTemplate.__compile_entries
         """
-        return f'# ReaxFF_{"-".join(elements)} optimized with ff_optimum\n'
 
-    @staticmethod
-    def __prepare_general_parameters_contents(general_params: dict) -> list:
+        offsets, position = {}, 0
+
+        for category_name, key, size in self.__layout:
+            offsets[(category_name, key)] = position
+            position += size
+
+        slots = list()
+
+        elements = list(parameters['atoms'].keys())
+
+        self.__buffer.append(
+            f'# ReaxFF_{"-".join(elements)} optimized with ff_optimum\n')
+
+        self.__compile_general_parameters(parameters['general'], slots)
+
+        self.__compile_atoms(parameters['atoms'], slots)
+
+        self.__compile_entries(
+            'bonds', parameters.get('bonds', None), elements, slots,
+            ' ! Nr of bonds; Edis1;LPpen;n.u.;pbe1;pbo5;13corr;pbo6'
+            '\n\t   pbe2;pbo3;pbo4;n.u.;pbo1;pbo2;ovcorr\n', 8)
+
+        self.__compile_entries(
+            'off-diagonal', parameters.get('off-diagonal', None), elements,
+            slots, ' ! Nr of off-diagonal terms; '
+            'Ediss;Ro;gamma;rsigma;rpi;rpi2\n')
+
+        self.__compile_entries(
+            'angles', parameters.get('angles', None), elements, slots,
+            ' ! Nr of angles;at1;at2;at3;Thetao,o;ka;kb;pv1;pv2;val(bo)\n')
+
+        self.__compile_entries(
+            'torsions', parameters.get('torsions', None), elements, slots,
+            ' ! Nr of torsions;'
+            'at1;at2;at3;at4;;V1;V2;V3;V2(BO);vconj;n.u;n\n')
+
+        self.__compile_entries(
+            'hydrogen', parameters.get('hydrogen', None), elements, slots,
+            ' ! Nr of hydrogen bonds;at1;at2;at3;Rhb;Dehb;vhb1')
+
+        self.__slot_positions = np.array([slot[0] for slot in slots],
+                                         dtype=int)
+
+        self.__slot_order = np.array(
+            [offsets[slot[1]] + slot[2] for slot in slots], dtype=int)
+
+    def __compile_general_parameters(self, general_params: dict,
+                                     slots: list) -> None:
         """
-        Prepare the general parameters contnet of the force field file
+        Compile the general parameters section
 
         Parameters
         ----------
         general_params
             general parameters
 
+        slots
+            list of (buffer position, (category, key), index) to be appended
+
         Returns
         -------
-        general_parameters_contents
-            general parameters content of the force field file
+        None
         """
 
-        general_parameters_contents = list()
-
-        general_parameters_contents.append(
+        self.__buffer.append(
             f' {len(REAXFF_GENERAL_PARAMS)} ! Number of general parameters\n')
 
-        for key, value in general_params.items():
-            general_parameters_contents.append(f'   {value:.4f} ! {key}\n')
+        for key in general_params.keys():
 
-        return general_parameters_contents
+            self.__buffer.append('   ')
 
-    @staticmethod
-    def __prepare_atoms_contents(type_parameters: dict) -> list:
+            self.__append_slot(('general', key), 0, f'%.{self.__precision}f',
+                               slots)
+
+            self.__buffer.append(f' ! {key}\n')
+
+    def __compile_atoms(self, type_parameters: dict, slots: list) -> None:
         """
-        Prepare the atom parameters contnet of the force field file
+        Compile the atom parameters section
 
         Parameters
         ----------
         type_parameters
             atom parameters
 
+        slots
+            list of (buffer position, (category, key), index) to be appended
+
         Returns
         -------
-        type_contents
-            atom parameters content of the force field file
+        None
         """
 
-        type_contents = []
-
-        type_contents.append(
+        self.__buffer.append(
             ' {:^2}'.format(len(type_parameters)) +
             ' ! Nr of atoms; '
             'cov.r; valency;a.m;Rvdw;Evdw;gammaEEM;cov.r2;#el\n'
@@ -148,293 +292,334 @@ class ReactiveForceFieldWriter(object):
             '\t\tov/un;val1;n.u.;val3,vval4\n')
 
         for element, values in type_parameters.items():
+            for line in range(4):
 
-            for i in range(4):
-
-                if i == 0:
-                    content = ' ' * 2 + element + ' ' * (6 - len(element))
-                else:
-                    content = ' ' * 8
+                self.__buffer.append(
+                    ' ' * 2 + element + ' ' * (6 - len(element))
+                    if line == 0 else ' ' * 8)
 
-                content += \
-                    (str(values['value'][8 * i: 8 *
-                         (i + 1)]).lstrip('[').rstrip(']') + '\n')
+                self.__append_row(('atoms', element),
+                                  range(8 * line, min(8 * (line + 1),
+                                                      values.size)),
+                                  slots)
 
-                type_contents.append(content)
+                self.__buffer.append('\n')
 
-        return type_contents
-
-    @staticmethod
-    def __prepare_bonds_contents(bonds: Optional[list],
-                                 elements: list) -> list:
+    def __compile_entries(self, category_name: str,
+                          entries: Optional[dict], elements: list,
+                          slots: list, header: str,
+                          line_width: Optional[int]=None) -> None:
         """
-        Prepare the bonds parameters contnet of the force field file
+        Compile the section of bonds, off-diagonal, angles, torsions or
+        hydrogen bonds
 
         Parameters
         ----------
-        bonds
-            bonds parameters
+        category_name
+            name of the category
+
+        entries
+            parameters of the category
 
         elements
             elements in the force field
 
+        slots
+            list of (buffer position, (category, key), index) to be appended
+
+        header
+            header of the section
+
+        line_width
+            number of values in the first line of an entry, the remaining
+            values are written to the second line
+
         Returns
         -------
-        bonds_content
-            bond parameters content of the force field file
+        None
 
         See Also
         --------
-        ReactiveForceFieldWriter.__get_num_from_str
-
+        ReactiveForceFieldTemplate.__get_num_from_str
         """
 
-        bonds_content = []
+        number_of_entries = len(entries) if entries is not None else 0
+
+        self.__buffer.append(' {:^2}'.format(number_of_entries) + header)
 
-        number_of_bond = len(bonds) if bonds is not None else 0
+        if not number_of_entries:
+            return
 
-        bonds_content.append(
-            ' {:^2}'.format(number_of_bond) +
-                    ' ! Nr of bonds; Edis1;LPpen;n.u.;pbe1;pbo5;13corr;pbo6' +
-                    '\n\t   pbe2;pbo3;pbo4;n.u.;pbo1;pbo2;ovcorr\n')
+        if category_name == 'hydrogen':
+            self.__buffer.append('\n')
 
-        if number_of_bond:
+        for key, values in entries.items():
 
-            for key, values in bonds.items():
+            num = self.__get_num_from_str(elements, key)
 
-                num = \
-                    ReactiveForceFieldWriter.__get_num_from_str(elements, key)
+            self.__buffer.append('  ' + num + ' ' * 2)
 
-                bonds_content.append(
-                    '  ' + num + ' ' * 2 +
-                            str(values['value'][:8]).lstrip('[').rstrip(']') +
-                            '\n')
+            if line_width is None:
+                self.__append_row((category_name, key), range(values.size),
+                                  slots)
+            else:
+                self.__append_row((category_name, key), range(line_width),
+                                  slots)
 
-                val = str(values['value'][8:]).lstrip('[').rstrip(']')
+                self.__buffer.append('\n\t')
 
-                bonds_content.append('\t' + val + '\n')
+                self.__append_row((category_name, key),
+                                  range(line_width, values.size), slots)
 
-        return bonds_content
+            self.__buffer.append('\n')
 
-    @staticmethod
-    def __prepare_off_diagonals_contents(off_diagonals: Optional[dict],
-                                         elements: list) -> list:
+    def __append_row(self, entry: tuple, indices: range,
+                     slots: list) -> None:
         """
-        Prepare the off diagonals parameters contnet of the force field file
+        Append a row of values separated by space to the buffer
 
         Parameters
         ----------
-        off_diagonals
-            off diagonals parameters
+        entry
+            (category, key) of the values
 
-        elements
-            elements in the force field
+        indices
+            indices of the values inside the entry
+
+        slots
+            list of (buffer position, (category, key), index) to be appended
 
         Returns
         -------
-        off_diagonal_contents
-            off diagonals parameters content of the force field file
+        None
+        """
 
-        See Also
-        --------
-        ReactiveForceFieldWriter.__get_num_from_str
+        column_format = f'%{self.__precision + 4}.{self.__precision}f'
+
+        for count, index in enumerate(indices):
+
+            if count:
+                self.__buffer.append(' ')
+
+            self.__append_slot(entry, index, column_format, slots)
+
+    def __append_slot(self, entry: tuple, index: int, slot_format: str,
+                      slots: list) -> None:
         """
+        Append an empty numeric slot to the buffer
 
-        off_diagonal_contents = []
+        Parameters
+        ----------
+        entry
+            (category, key) of the value
 
-        number_of_off_diagonal = \
-            len(off_diagonals) if off_diagonals is not None else 0
+        index
+            index of the value inside the entry
 
-        off_diagonal_contents.append(
-            ' {:^2}'.format(number_of_off_diagonal) +
-                    ' ! Nr of off-diagonal terms; ' +
-                    'Ediss;Ro;gamma;rsigma;rpi;rpi2\n')
+        slot_format
+            format of the value
 
-        if number_of_off_diagonal:
+        slots
+            list of (buffer position, (category, key), index) to be appended
 
-            for key, values in off_diagonals.items():
+        Returns
+        -------
+        None
+        """
 
-                num = \
-                    ReactiveForceFieldWriter.__get_num_from_str(elements, key)
+        slots.append((len(self.__buffer), entry, index))
 
-                off_diagonal_contents.append(
-                    ' ' * 2 + num + ' ' * 2 +
-                            str(values['value']).lstrip('[').rstrip(']') +
-                            '\n')
+        self.__slot_formats.append(slot_format)
 
-        return off_diagonal_contents
+        self.__buffer.append('')
 
     @staticmethod
-    def __prepare_angles_contents(angles: Optional[dict],
-                                  elements: list) -> list:
+    def __get_num_from_str(elements: list, string: str) -> str:
         """
-        Prepare the angles parameters contnet of the force field file
+        Convert the bonds string from elements to indices
+
+        e.g.S-Ge-H where S = 1, Ge = 2, H =3 to 1 2 3
 
         Parameters
         ----------
-        angles
-            angles parameters
-
         elements
             elements in the force field
 
+        string
+           the bond string
+
         Returns
         -------
-        angles_contents
-            angles parameters content of the force field file
+        bond string in indices
 
-        See Also
-        --------
-        ReactiveForceFieldWriter.__get_num_from_str
         """
 
-        angles_contents = []
+        num = list()
+
+        for atom in string.split('-'):
+
+            if atom == '*':
+                num.append('0')
+            else:
+                num.append(f'{elements.index(atom) + 1}')
+
+        return '  '.join(num)
 
-        number_of_angles = len(angles) if angles is not None else 0
 
-        angles_contents.append(
-            ' {:^2}'.format(number_of_angles) +
-                    ' ! Nr of angles;' +
-                    'at1;at2;at3;Thetao,o;ka;kb;pv1;pv2;val(bo)\n')
+class ReactiveForceFieldWriter(object):
 
-        if number_of_angles:
+    """
+    Class for writing force field file with a template cached by file path
 
-            for key, values in angles.items():
+    Attributes
+    ----------
+    __templates: dict
+        templates cached by the file path
 
-                num = ReactiveForceFieldWriter.__get_num_from_str(elements,
-                                                                  key)
+    __precision: int
+        number of decimals of the force field written by
+        write_force_field_from_template
 
-                angles_contents.append(
-                    '  ' + num + ' ' * 2 +
-                            str(values['value']).lstrip('[').rstrip(']') +
-                            '\n')
+    Methods
+    -------
+    write_force_field_to_file(parameters, directory, precision)
+        write the force field with a new template
 
-        return angles_contents
+    write_force_field_from_template(parameters, file_path)
+        write the force field with the template cached for the file path
+    """
 
-    @staticmethod
-    def __prepare_torsions_contents(torsions: Optional[dict],
-                                    elements: list) -> list:
+    __templates = dict()
+
+    __precision = REAXFF_DEFAULT_PRECISION
+
+    @classmethod
+    def write_force_field_to_file(
+            cls, parameters: dict, directory: str,
+            precision: int=REAXFF_DEFAULT_PRECISION) -> None:
         """
-        Prepare the torsions parameters contnet of the force field file
+        Write the force field parameters to the file atomically, so the
+        file is either the previous one or the complete new one
 
         Parameters
         ----------
-        torsions
-            torsions parameters
+        parameters
+            force field parameters
 
-        elements
-            elements in the force field
+        directory
+            target directory
+
+        precision
+            number of decimals of the parameters values
 
         Returns
         -------
-        torsions_contents
-            torsions parameters content of the force field file
+        None
 
         See Also
         --------
-        ReactiveForceFieldWriter.__get_num_from_str
+        ReactiveForceFieldTemplate
+        cores.utilities.file_path.file_atomic_write
         """
 
-        torsions_contents = []
-
-        number_of_torsions = len(torsions) if torsions is not None else 0
-
-        torsions_contents.append(
-            ' {:^2}'.format(number_of_torsions) +
-                    ' ! Nr of torsions;' +
-                    'at1;at2;at3;at4;;V1;V2;V3;V2(BO);vconj;n.u;n\n')
-
-        if number_of_torsions:
-
-            for key, values in torsions.items():
-
-                num = ReactiveForceFieldWriter.__get_num_from_str(elements,
-                                                                  key)
+        content = ReactiveForceFieldTemplate(parameters, precision).fill(
+            parameters, False)
 
-                torsions_contents.append(
-                    '  ' + num + ' ' * 2 +
-                    str(values['value']).lstrip('[').rstrip(']') +
-                    '\n')
+        file_atomic_write(directory, lambda fp: fp.write(content), 'w')
 
-        return torsions_contents
-
-    @staticmethod
-    def __prepare_hydrogen_bonds_contents(hydrogen_bonds: Optional[dict],
-                                          elements: list) -> list:
+    @classmethod
+    def write_force_field_from_template(cls, parameters: dict,
+                                        file_path: str) -> None:
         """
-        Prepare the hydrogen bonds parameters contnet of the force field file
+        Write the force field parameters to the file with the cached template,
+        the template is compiled again when the layout or the precision
+        is changed
 
         Parameters
         ----------
-        hydrogen_bonds
-            hydrogen bonds parameters
+        parameters
+            force field parameters
 
-        elements
-            elements in the force field
+        file_path
+            path of the force field file
 
         Returns
         -------
-        hydrogen_bonds_contents
-            hydrogen bonds parameters content of the force field file
-        """
-
-        hydrogen_bonds_contents = []
-
-        number_of_hydrogen_bonds = (
-            len(hydrogen_bonds) if hydrogen_bonds is not None else 0)
+        None
 
-        hydrogen_bonds_contents.append(
-            ' {:^2}'.format(number_of_hydrogen_bonds) +
-            ' ! Nr of hydrogen bonds;at1;at2;at3;Rhb;Dehb;vhb1')
+        See Also
+        --------
+        ReactiveForceFieldTemplate
+        """
 
-        if number_of_hydrogen_bonds:
+        template = cls.__templates.get(file_path, None)
 
-            hydrogen_bonds_contents.append('\n')
+        if (template is None or template.precision != cls.__precision or
+                not template.is_compatible(parameters)):
 
-            for key, values in hydrogen_bonds.items():
+            if template is None:
+                file_create_directory(os.path.dirname(file_path))
 
-                num = ReactiveForceFieldWriter.__get_num_from_str(
-                    elements, key)
+            template = ReactiveForceFieldTemplate(parameters, cls.__precision)
 
-                hydrogen_bonds_contents.append(
-                    f"  {num}  "
-                    f"{str(values['value']).lstrip('[').rstrip(']')}\n")
+            cls.__templates[file_path] = template
 
-        return hydrogen_bonds_contents
+        template.write(parameters, file_path)
 
-    @staticmethod
-    def __get_num_from_str(elements: list, string: str) -> str:
+    @classmethod
+    def set_precision(cls, precision: Union[int, str, None]) -> None:
         """
-        Convert the bonds string from elements to indices
-
-        e.g.S-Ge-H where S = 1, Ge = 2, H =3 to 1 2 3
+        Set the precision of the force field written from template
 
         Parameters
         ----------
-        elements
-            elements in the force field
-
-        string
-           the bond string
+        precision
+            number of decimals, 'full' for REAXFF_FULL_PRECISION or
+            None for REAXFF_DEFAULT_PRECISION
 
         Returns
         -------
-        bond string in indices
+        None
+        """
+
+        if precision is None:
+            precision = REAXFF_DEFAULT_PRECISION
+
+        elif isinstance(precision, str) and precision.lower() == 'full':
+            precision = REAXFF_FULL_PRECISION
 
+        cls.__precision = int(precision)
+
+    @classmethod
+    def get_precision(cls) -> int:
+        return cls.__precision
+
+    @classmethod
+    def is_written_value_equal(cls, value: float, other: float) -> bool:
         """
+        Determine whether two values are written as the same number
+        in the force field file with the current precision
 
-        num = list()
+        Parameters
+        ----------
+        value
+            value to be compared
 
-        element_list = list(elements)
+        other
+            value to be compared with
 
-        for atom in string.split('-'):
+        Returns
+        -------
+        True
+            If the two values are identical after rounding to the precision
+            of the force field file
 
-            if atom == '*':
-                num.append('0')
-            else:
-                num.append(f'{element_list.index(atom) + 1}')
+        False
+            Otherwise
+        """
 
-        return '  '.join(num)
+        return (float(f'{value:.{cls.__precision}f}') ==
+                float(f'{other:.{cls.__precision}f}'))
 
 
 def save_reactive_force_field(parameters: dict, directory: str) -> None:
@@ -461,5 +646,62 @@ def save_reactive_force_field(parameters: dict, directory: str) -> None:
 
     file_create_directory(os.path.dirname(directory))
 
-    writer = ReactiveForceFieldWriter().write_force_field_to_file(
-        parameters, directory)
+    ReactiveForceFieldWriter.write_force_field_to_file(parameters, directory)
+
+
+def write_reactive_force_field_from_template(parameters: dict,
+                                             file_path: str) -> None:
+    """
+    Write the force field parameters for evaluation, the layout of the
+    file is compiled once and only the changed values are refilled
+
+    Parameters
+    ----------
+    parameters
+        force field parameters
+
+    file_path
+        path of the force field file
+
+    Returns
+    -------
+    None
+
+    See Also
+    --------
+    ReactiveForceFieldWriter.write_force_field_from_template
+    """
+
+    ReactiveForceFieldWriter.write_force_field_from_template(
+        parameters, file_path)
+
+
+def set_reactive_force_field_precision(
+        precision: Union[int, str, None]) -> None:
+    """
+    See Also
+    --------
+    ReactiveForceFieldWriter.set_precision
+    """
+
+    ReactiveForceFieldWriter.set_precision(precision)
+
+
+def get_reactive_force_field_precision() -> int:
+    """
+    See Also
+    --------
+    ReactiveForceFieldWriter.get_precision
+    """
+
+    return ReactiveForceFieldWriter.get_precision()
+
+
+def is_written_value_equal(value: float, other: float) -> bool:
+    """
+    See Also
+    --------
+    ReactiveForceFieldWriter.is_written_value_equal
+    """
+
+    return ReactiveForceFieldWriter.is_written_value_equal(value, other)
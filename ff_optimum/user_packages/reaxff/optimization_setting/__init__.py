@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 from .constraints import *
+from .frames import (sample_frames_of_molecules,
+                     select_frames_of_molecules)
 from .objectives import (ReaxFFObjectives, pop_pressure_from_objectives,
-                         pop_objective_from_settings)
+                         pop_objective_from_settings,
+                         select_objectives_of_molecules)
 from .parameters import *
 from .step_size import *
 
 
 __all__ = ['ReaxFFObjectives',
-           'pop_unused_training_objectives', 'pop_objective_from_settings']
+           'pop_unused_training_objectives', 'pop_objective_from_settings',
+           'select_training_molecules', 'sample_training_frames',
+           'select_training_frames']
 
 __all__.extend(constraints.__all__)
 
@@ -17,3 +22,9 @@ __all__.extend(step_size.__all__)
 
 
 pop_unused_training_objectives = pop_pressure_from_objectives
+
+select_training_molecules = select_objectives_of_molecules
+
+sample_training_frames = sample_frames_of_molecules
+
+select_training_frames = select_frames_of_molecules
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from ff_optimum.cores.utilities import EventLogger
+
+__all__ = ['sample_frames_of_molecules', 'select_frames_of_molecules']
+
+logger = EventLogger(__name__)
+
+
+def sample_frames_of_molecules(training_datas: dict, fraction: float,
+                               minimum_frames: int=2) -> dict:
+    """
+    Sample a stratified random subset of the frames of every molecule,
+    e.g. for evaluating the trials on a mini-batch of the training data
+
+    The frame with the lowest target energy of each molecule is always
+    selected, so the relative energies and the formation energies of the
+    subset are referenced to the same frame as the full training data.
+
+    Parameters
+    ----------
+    training_datas
+        DFT training data
+
+    fraction
+        fraction of the frames to be selected from every molecule
+
+    minimum_frames
+        minimum number of frames selected from every molecule
+
+    Returns
+    -------
+    frames
+        dictionary of sorted frame indices according to the molecule name
+
+    See Also
+    --------
+    select_frames_of_molecules
+    """
+
+    frames = {}
+
+    for molecule_name, molecule in training_datas.items():
+
+        number_of_frames = len(molecule)
+
+        size = min(number_of_frames,
+                   max(minimum_frames,
+                       int(np.ceil(fraction * number_of_frames))))
+
+        energies = [frame.get('energy') for frame in molecule]
+
+        if size == number_of_frames or None in energies:
+
+            selected = np.random.choice(number_of_frames, size,
+                                        replace=False)
+
+        else:
+
+            anchor = int(np.argmin(energies))
+
+            others = np.delete(np.arange(number_of_frames), anchor)
+
+            selected = np.append(
+                np.random.choice(others, size - 1, replace=False), anchor)
+
+        frames[molecule_name] = np.sort(selected)
+
+    logger.debug(f'Frames sampled: '
+                 f'{sum(map(len, frames.values()))} / '
+                 f'{sum(map(len, training_datas.values()))}')
+
+    return frames
+
+
+def select_frames_of_molecules(training_datas: dict, frames: dict) -> dict:
+    """
+    Select the frames of the molecules from the training data, the
+    molecules without selection are kept
+
+    Parameters
+    ----------
+    training_datas
+        DFT training data
+
+    frames
+        dictionary of frame indices according to the molecule name
+
+    Returns
+    -------
+    training_datas
+        training data of the selected frames
+    """
+
+    return {molecule_name: ([molecule[idx] for idx in frames[molecule_name]]
+                            if molecule_name in frames else molecule)
+            for molecule_name, molecule in training_datas.items()}
@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
+import copy
 from enum import Enum, unique
 
 from ff_optimum.cores.utilities import EventLogger
 
 __all__ = ['ReaxFFObjectives', 'pop_pressure_from_objectives',
-           'pop_objective_from_settings']
+           'pop_objective_from_settings', 'select_objectives_of_molecules']
 
 logger = EventLogger(__name__)
 
@@ -100,3 +101,48 @@ def pop_objective_from_settings(package_settings: dict,
         objectives.pop(objective_name, None)
 
         return False
+
+
+def select_objectives_of_molecules(package_settings: dict,
+                                   molecules: list) -> tuple:
+    """
+    Select the objectives of the molecules from the package settings, e.g.
+    for evaluating a subset of the training data
+
+    Parameters
+    ----------
+    package_settings
+        package settings
+
+    molecules
+        names of the molecules to be selected
+
+    Returns
+    -------
+    settings
+        copy of the package settings with the objectives of the molecules
+
+    required_molecules
+        names of the molecules to be computed, including the dependencies
+        of the formation energies
+    """
+
+    molecules = {molecule.lower() for molecule in molecules}
+
+    settings = copy.deepcopy(package_settings)
+
+    settings['objectives'] = {
+        name: function for name, function in
+        package_settings['objectives'].items()
+        if name.rsplit('_', 1)[0] in molecules}
+
+    required_molecules = set(molecules)
+
+    for molecule in molecules:
+        required_molecules.update(
+            package_settings['dependencies'].get(molecule) or [])
+
+    logger.info(f'Objectives: {list(settings["objectives"].keys())} '
+                f'are selected')
+
+    return settings, sorted(required_molecules)
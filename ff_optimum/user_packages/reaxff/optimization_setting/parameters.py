@@ -11,7 +11,10 @@ __all__ = ['REAXFF_NUMBER_OF_STRESS', 'REAXFF_NUMBER_OF_ENERGY',
            'REAXFF_TYPE_PARAMS', 'REAXFF_BOND_PARAMS',
            'REAXFF_DIAG_PARAMS', 'REAXFF_ANGLE_PARAMS',
            'REAXFF_TORSION_PARAMS', 'REAXFF_HYDROGEN_BOND_PARAMS',
-           'REAXFF_PARAMETER_CATEGORY', 'next_parameter_generator', 'is_equal']
+           'REAXFF_PARAMETER_CATEGORY', 'next_parameter_generator', 'is_equal',
+           'get_parameters_layout', 'flatten_parameters',
+           'assign_flattened_parameters', 'unflatten_parameters',
+           'get_parameter_blocks']
 
 REAXFF_NUMBER_OF_STRESS = 9
 
@@ -93,6 +96,140 @@ def is_equal(parameters_a: dict, parameters_b: dict) -> bool:
     return True
 
 
+def get_parameters_layout(parameters: dict) -> tuple:
+    """
+    Get the layout of the parameters, which is the category, key and number
+    of values of every entry in the order used by flatten_parameters
+
+    Parameters
+    ----------
+    parameters
+        ReaxFF parameters
+
+    Returns
+    -------
+    layout
+        tuple of (category name, key, number of values)
+    """
+
+    return tuple((category_name, key,
+                  1 if isinstance(values, float) else values.size)
+                 for category_name, category in parameters.items()
+                 for key, values in category.items())
+
+
+def flatten_parameters(parameters: dict) -> np.ndarray:
+    """
+    Flatten all the parameters values into one array
+
+    Parameters
+    ----------
+    parameters
+        ReaxFF parameters
+
+    Returns
+    -------
+    np.ndarray
+        parameters values in the order of get_parameters_layout
+
+    See Also
+    --------
+    get_parameters_layout
+    """
+
+    return np.concatenate(
+        [np.atleast_1d(values if isinstance(values, float)
+                       else values['value'])
+         for category in parameters.values() for values in category.values()])
+
+
+def assign_flattened_parameters(parameters: dict,
+                                flattened: np.ndarray) -> dict:
+    """
+    Assign the flattened values back to the parameters in place
+
+    Parameters
+    ----------
+    parameters
+        ReaxFF parameters to be updated
+
+    flattened
+        values in the order of get_parameters_layout
+
+    Returns
+    -------
+    parameters
+        the updated parameters
+
+    Raises
+    ------
+    ValueError
+        when the size of flattened mismatch the parameters
+    """
+
+    position = 0
+
+    for category in parameters.values():
+        for key, values in category.items():
+
+            if isinstance(values, float):
+                category[key] = float(flattened[position])
+                position += 1
+            else:
+                values['value'] = flattened[position:position + values.size]
+                position += values.size
+
+    if position != np.size(flattened):
+        raise ValueError('Size of flattened parameters mismatch')
+
+    return parameters
+
+
+def unflatten_parameters(flattened: np.ndarray, layout: tuple) -> dict:
+    """
+    Build the parameters from the flattened values and the layout
+
+    Categories not listed in REAXFF_PARAMETER_CATEGORY are the general
+    parameters which are stored as float
+
+    Parameters
+    ----------
+    flattened
+        values in the order of the layout
+
+    layout
+        layout from get_parameters_layout
+
+    Returns
+    -------
+    parameters
+        ReaxFF parameters
+    """
+
+    parameters, position = {}, 0
+
+    for category_name, key, size in layout:
+
+        category = parameters.setdefault(category_name, {})
+
+        param_names = REAXFF_PARAMETER_CATEGORY.get(category_name)
+
+        if param_names is None:
+            category[key] = float(flattened[position])
+        else:
+            values = np.zeros(size, dtype=REAXFF_PARAM_DTYPE)
+
+            values['name'] = param_names[:size]
+
+            values['value'] = flattened[position:position + size]
+
+            category[key] = values
+
+        position += size
+
+    return parameters
+
+
 def next_parameter_generator(parameters: dict,
                              step_size: dict,
                              constraints: dict,
@@ -140,3 +277,69 @@ def next_parameter_generator(parameters: dict,
                                (constraints[category_name]['lower_bound'][idx],
                                 constraints[category_name]['upper_bound'][idx])
                                )
+
+
+def get_parameter_blocks(parameters: dict, step_size: dict,
+                         groups: list) -> list:
+    """
+    Get the blocks of the parameters to be moved jointly, the parameters of
+    one entry, e.g. one element or one bond, whose names are in the same
+    group form a block and every other parameter is a block by itself
+
+    Parameters
+    ----------
+    parameters
+        ReaxFF parameters
+
+    step_size
+        step size of the parameters
+
+    groups
+        list of the groups of parameter names,
+        e.g. [['Edis1', 'Edis2', 'Edis3'], ['chiEEM', 'etaEEM', 'gammaEEM']]
+
+    Returns
+    -------
+    blocks
+        list of the blocks ordered by their first parameter, a block is the
+        list of the positions of its parameters in the order of
+        next_parameter_generator
+
+    See Also
+    --------
+    next_parameter_generator
+    """
+
+    group_of_name = {name: number for number, group in enumerate(groups)
+                     for name in group}
+
+    blocks, position = [], 0
+
+    for category_name, category in parameters.items():
+        for key, values in category.items():
+
+            if isinstance(values, float):
+                continue
+
+            entry_blocks = {}
+
+            for idx in range(values.size):
+
+                if not step_size[category_name]['value'][idx]:
+                    continue
+
+                number = group_of_name.get(values['name'][idx])
+
+                if number is None:
+                    blocks.append([position])
+
+                elif number in entry_blocks:
+                    entry_blocks[number].append(position)
+
+                else:
+                    entry_blocks[number] = [position]
+                    blocks.append(entry_blocks[number])
+
+                position += 1
+
+    return blocks
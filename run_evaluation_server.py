@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+import sys
+
+from ff_optimum.cores.utilities import EvaluationServer
+
+
+def main():
+
+    address = sys.argv[1]
+
+    number_of_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    authkey = sys.argv[3] if len(sys.argv) > 3 else None
+
+    EvaluationServer(address, number_of_workers, authkey).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+import sys
+
+from ff_optimum.cores.optimizer import JobRunner
+
+
+def main():
+
+    JobRunner(sys.argv[1:]).run()
+
+
+if __name__ == '__main__':
+    main()
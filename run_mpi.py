@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+import sys
+
+from ff_optimum.cores.optimizer import OptimizerFactory
+from ff_optimum.cores.utilities import start_mpi_world
+
+
+def main():
+
+    if not start_mpi_world():
+        return
+
+    optimizer = OptimizerFactory().create_optimizer_from_config(sys.argv[1])
+
+    optimizer.optimize()
+
+    optimizer.save_parameters_to_file('ffield')
+
+
+if __name__ == '__main__':
+    main()
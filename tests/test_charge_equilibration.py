@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from ff_optimum.user_packages.reaxff.compute import (
+    ChargeEquilibrationSolver, FrameGeometry)
+from ff_optimum.user_packages.reaxff.compute.compute_charges import (
+    QEQ_COULOMB_CONSTANT, QEQ_CUTOFF)
+from ff_optimum.user_packages.reaxff.optimization_setting.parameters import (
+    REAXFF_TYPE_PARAMS)
+
+
+def make_parameters(eem):
+
+    atoms = {}
+
+    for element, (gamma, chi, eta) in eem.items():
+
+        values = np.zeros(len(REAXFF_TYPE_PARAMS))
+
+        values[REAXFF_TYPE_PARAMS.index('gammaEEM')] = gamma
+
+        values[REAXFF_TYPE_PARAMS.index('chiEEM')] = chi
+
+        values[REAXFF_TYPE_PARAMS.index('etaEEM')] = eta
+
+        atoms[element] = {'value': values}
+
+    return {'atoms': atoms}
+
+
+def make_frame(name, step, types, positions, elements=('Li', 'S')):
+    return {'geometry': FrameGeometry(list(elements), types, positions),
+            'trace_info': [f'#number_of_atom: {len(types)}',
+                           f'#{name} {step}']}
+
+
+def shielded_coulomb(distance, gamma_i, gamma_j):
+
+    x = distance / QEQ_CUTOFF
+
+    taper = 1.0 + x**4 * (-35.0 + x * (84.0 + x * (-70.0 + x * 20.0)))
+
+    return (QEQ_COULOMB_CONSTANT * taper /
+            np.cbrt(distance**3 + (gamma_i * gamma_j)**-1.5))
+
+
+def test_two_atoms_match_analytic_charges():
+
+    parameters = make_parameters({'Li': (0.8, 1.5, 6.0),
+                                  'S': (0.7, 8.5, 7.0)})
+
+    commands = {'LiS': [make_frame('LiS', 1, [0, 1],
+                                   [[0, 0, 0], [0, 0, 2.0]])]}
+
+    charges = ChargeEquilibrationSolver(commands).compute_charges(
+        parameters)['lis'][0]['q']
+
+    coupling = shielded_coulomb(2.0, 0.8, 0.7)
+
+    expected = (8.5 - 1.5) / (2 * 6.0 + 2 * 7.0 - 2 * coupling)
+
+    np.testing.assert_allclose(charges, [expected, -expected], rtol=1e-10)
+
+
+def test_charges_are_neutral_and_symmetric():
+
+    parameters = make_parameters({'Li': (0.8, 1.5, 6.0),
+                                  'S': (0.7, 8.5, 7.0)})
+
+    commands = {'SLiS': [
+        make_frame('SLiS', step, [1, 0, 1],
+                   [[-distance, 0, 0], [0, 0, 0], [distance, 0, 0]])
+        for step, distance in enumerate((2.0, 2.4, 3.0), 1)]}
+
+    results = ChargeEquilibrationSolver(commands).compute_charges(
+        parameters)['slis']
+
+    assert [frame['step'] for frame in results] == ['1', '2', '3']
+
+    for frame in results:
+
+        assert abs(frame['q'].sum()) < 1e-12
+
+        assert frame['q'][1] > 0
+
+        assert frame['q'][0] == pytest.approx(frame['q'][2])
+
+        assert frame['energy'] is None and frame['fx'] is None
+
+
+def test_molecules_and_frames_are_selected():
+
+    parameters = make_parameters({'Li': (0.8, 1.5, 6.0),
+                                  'S': (0.7, 8.5, 7.0)})
+
+    commands = {
+        'LiS': [make_frame('LiS', step, [0, 1], [[0, 0, 0], [0, 0, z]])
+                for step, z in enumerate((1.8, 2.0, 2.2), 1)],
+        'Li2': [make_frame('Li2', 1, [0, 0], [[0, 0, 0], [0, 0, 2.5]])]}
+
+    solver = ChargeEquilibrationSolver(commands)
+
+    everything = solver.compute_charges(parameters)
+
+    np.testing.assert_allclose(everything['li2'][0]['q'], 0, atol=1e-12)
+
+    selected = solver.compute_charges(parameters, molecules=['LiS'],
+                                      frames={'lis': [2, 0]})
+
+    assert list(selected) == ['lis']
+
+    assert [frame['step'] for frame in selected['lis']] == ['3', '1']
+
+    np.testing.assert_allclose(selected['lis'][0]['q'],
+                               everything['lis'][2]['q'])
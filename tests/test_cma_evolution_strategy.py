@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from ff_optimum.cores.optimizer.evolution_strategy import (
+    CovarianceMatrixAdaptationEvolutionStrategyOptimizer)
+from ff_optimum.cores.utilities import CommandsHolder
+
+TARGET = np.array([1.5, -0.5, 2.0, 0.8])
+
+
+def next_parameter_generator(parameters, step_size, constraints,
+                             is_active):
+
+    for idx, step in enumerate(step_size):
+        if not is_active or step:
+            yield idx, parameters, step, constraints[idx]
+
+
+@pytest.fixture
+def quadratic_package(monkeypatch):
+    """
+    User package of the sphere function around TARGET, the parameters are
+    a flat array and the calculated values are the parameters themselves
+    """
+
+    package = types.ModuleType('ff_optimum.user_packages.quadratic')
+
+    package.get_default_step_size = lambda level: np.full(TARGET.size, 0.5)
+
+    package.get_default_constraints = lambda: [(-5.0, 5.0)] * TARGET.size
+
+    package.pop_unused_training_objectives = lambda settings: None
+
+    package.next_parameter_generator = next_parameter_generator
+
+    package.compute_errors = (
+        lambda calculated_values, training_datas, settings:
+        float(np.square(calculated_values - training_datas).sum()))
+
+    monkeypatch.setitem(sys.modules, package.__name__, package)
+
+    return package
+
+
+def make_optimizer(alogrithm_parameters):
+
+    holder = CommandsHolder()
+
+    holder.excutor = lambda commands, parameters, directory: parameters
+
+    return CovarianceMatrixAdaptationEvolutionStrategyOptimizer(
+        1, None, 'quadratic', {'level': 0, 'weights': [1]},
+        np.ones(TARGET.size), 'default', None, holder, TARGET, {},
+        alogrithm_parameters, '.')
+
+
+def test_converges_on_the_sphere(quadratic_package):
+
+    np.random.seed(0)
+
+    optimizer = make_optimizer({'number_of_generations': 200,
+                                'tolerance': 1e-6})
+
+    initial_error = float(np.square(np.ones(TARGET.size) - TARGET).sum())
+
+    best_error, best_parameters = optimizer.optimize()
+
+    assert best_error < 1e-6 * initial_error
+
+    np.testing.assert_allclose(best_parameters, TARGET, atol=1e-3)
+
+
+def test_stays_within_the_constraints(quadratic_package):
+
+    np.random.seed(1)
+
+    quadratic_package.get_default_constraints = (
+        lambda: [(0.0, 1.2)] * TARGET.size)
+
+    _, best_parameters = make_optimizer(
+        {'number_of_generations': 100}).optimize()
+
+    assert np.all((best_parameters >= 0.0) & (best_parameters <= 1.2))
+
+    np.testing.assert_allclose(best_parameters, np.clip(TARGET, 0.0, 1.2),
+                               atol=1e-2)
+
+
+def test_stops_within_the_evaluation_budget(quadratic_package):
+
+    np.random.seed(2)
+
+    evaluations = []
+
+    optimizer = make_optimizer({'number_of_generations': 100,
+                                'population_size': 6,
+                                'budget': {'evaluations': 20}})
+
+    holder = optimizer._commands_holder_train
+
+    excutor = holder.excutor
+
+    holder.excutor = lambda *args: evaluations.append(1) or excutor(*args)
+
+    optimizer.optimize()
+
+    # the initial evaluation and three generations of six
+    assert len(evaluations) == 19
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from ff_optimum.user_packages.reaxff.compute import compute_residuals_reaxff
+
+
+def make_frame(energy, charges):
+    return {'energy': energy, 'q': np.array(charges, dtype='f8')}
+
+
+def make_settings(weights, objectives):
+    return {'weights': weights, 'objectives': objectives, 'mol_weights': {}}
+
+
+def test_energy_residuals_are_relative_to_the_lowest_target():
+
+    targets = {'mol': [make_frame(-1.0, [0]), make_frame(-3.0, [0]),
+                       make_frame(-2.0, [0])]}
+
+    calculated = {'mol': [make_frame(5.0, [0]), make_frame(2.0, [0]),
+                          make_frame(4.5, [0])]}
+
+    residuals = compute_residuals_reaxff(
+        calculated, targets, make_settings([1, 0, 0, 0, 0],
+                                           {'mol_energy': 'mae'}))
+
+    # (5 - 2) - (-1 + 3), 0, (4.5 - 2) - (-2 + 3)
+    np.testing.assert_allclose(residuals, np.array([1.0, 0.0, 1.5]) /
+                               np.sqrt(3))
+
+
+def test_residuals_are_scaled_by_weight_over_size():
+
+    targets = {'mol': [make_frame(0.0, [0.1, -0.1]),
+                       make_frame(1.0, [0.2, -0.2])]}
+
+    calculated = {'mol': [make_frame(0.5, [0.3, -0.3]),
+                          make_frame(1.0, [0.2, -0.1])]}
+
+    residuals = compute_residuals_reaxff(
+        calculated, targets, make_settings(
+            [1, 0, 4, 0, 0], {'mol_energy': 'mae', 'mol_charge': 'mae'}))
+
+    charges = np.array([0.2, -0.2, 0.0, 0.1])
+
+    np.testing.assert_allclose(residuals[:2], np.array([0.0, -0.5]) /
+                               np.sqrt(2))
+
+    np.testing.assert_allclose(residuals[2:], np.sqrt(4 / 4) * charges)
+
+    # the sum of squares of an objective is its weighted mean squared error
+    assert np.isclose(np.square(residuals[2:]).sum(),
+                      4 * np.mean(charges**2))
+
+
+def test_objectives_without_weight_or_values_are_skipped():
+
+    targets = {'mol': [make_frame(0.0, [0.1, -0.1])]}
+
+    calculated = {'mol': [{'energy': 0.0, 'q': None}]}
+
+    settings = make_settings([0, 0, 1, 0, 0], {'mol_energy': 'mae',
+                                               'mol_charge': 'mae'})
+
+    residuals = compute_residuals_reaxff(calculated, targets, settings)
+
+    assert residuals.size == 0
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import math
+
+import pytest
+
+from ff_optimum.cores.utilities import EvaluationBudget
+
+
+def test_from_config_without_limits_is_unbudgeted():
+
+    assert EvaluationBudget.from_config(None) is None
+
+    assert EvaluationBudget.from_config({}) is None
+
+    assert EvaluationBudget.from_config({'safety_margin': 0.1}) is None
+
+
+def test_remaining_evaluations_count_down():
+
+    budget = EvaluationBudget.from_config({'evaluations': 10})
+
+    assert budget.remaining_evaluations() == 10
+
+    budget.record()
+
+    budget.record(4)
+
+    assert budget.number_of_evaluations == 5
+
+    assert budget.remaining_evaluations() == 5
+
+    budget.record(7)
+
+    assert budget.remaining_evaluations() == 0
+
+
+def test_unlimited_budget_is_infinite():
+
+    budget = EvaluationBudget()
+
+    budget.record(100)
+
+    assert math.isinf(budget.remaining_evaluations())
+
+    assert math.isinf(budget.remaining_time())
+
+
+def test_wall_time_limits_by_measured_cost(monkeypatch):
+
+    clock = {'now': 1000.0}
+
+    monkeypatch.setattr('time.time', lambda: clock['now'])
+
+    budget = EvaluationBudget(wall_time=100.0, maximum_evaluations=1000,
+                              safety_margin=0.1)
+
+    # nothing is measured before the first evaluation
+    assert budget.remaining_evaluations() == 1000
+
+    clock['now'] += 5.0
+
+    budget.record(2)
+
+    clock['now'] += 20.0
+
+    assert budget.average_cost() == pytest.approx(10.0)
+
+    assert budget.remaining_time() == pytest.approx(90.0 - 25.0)
+
+    assert budget.remaining_evaluations() == pytest.approx(6.5)
+
+    clock['now'] += 100.0
+
+    assert budget.remaining_evaluations() == 0.0
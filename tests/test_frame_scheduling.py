@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from ff_optimum.user_packages.reaxff.compute import (estimate_frame_cost,
+                                                     plan_frame_ranks)
+
+
+def make_commands(number_of_atoms, replicate=None):
+    return {'trace_info': [f'#number_of_atom: {number_of_atoms}',
+                           '#f_flag: True', '#mol 1'],
+            'before_pair_coeff': (['units real'] +
+                                  ([f'replicate {replicate}']
+                                   if replicate else []))}
+
+
+def test_cost_counts_the_replicated_atoms():
+
+    assert estimate_frame_cost(make_commands(12)) == 12
+
+    assert estimate_frame_cost(make_commands(12, '2 3 1')) == 72
+
+
+def check_plan(groups, number_of_frames, number_of_ranks):
+
+    frames = sorted(idx for _, indices in groups for idx in indices)
+
+    assert frames == list(range(number_of_frames))
+
+    assert sum(ranks for ranks, _ in groups) <= number_of_ranks
+
+
+def test_equal_frames_are_spread_one_per_rank():
+
+    groups = plan_frame_ranks([10] * 8, 4, [8] * 8)
+
+    check_plan(groups, 8, 4)
+
+    assert [ranks for ranks, _ in groups] == [1, 1, 1, 1]
+
+    assert sorted(len(indices) for _, indices in groups) == [2, 2, 2, 2]
+
+
+def test_large_frame_is_decomposed():
+
+    costs = [1000, 10, 10, 10, 10]
+
+    groups = plan_frame_ranks(costs, 8, [6, 1, 1, 1, 1])
+
+    check_plan(groups, 5, 8)
+
+    assert groups[0] == (6, [0])
+
+    assert all(ranks == 1 for ranks, _ in groups[1:])
+
+
+def test_decomposition_leaves_ranks_for_the_small_frames():
+
+    groups = plan_frame_ranks([1000, 1], 4, [4, 1])
+
+    check_plan(groups, 2, 4)
+
+    assert groups == [(3, [0]), (1, [1])]
+
+
+def test_small_frames_are_balanced_longest_first():
+
+    groups = plan_frame_ranks([7, 5, 4, 3, 1], 2, [1] * 5)
+
+    check_plan(groups, 5, 2)
+
+    loads = sorted(sum([7, 5, 4, 3, 1][idx] for idx in indices)
+                   for _, indices in groups)
+
+    assert loads == [10, 10]
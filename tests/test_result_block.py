@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from multiprocessing import resource_tracker
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from ff_optimum.user_packages.reaxff.compute import SharedResultBlock
+
+
+def make_result(name, step, number_of_atoms, charges=True, stress=True,
+                iterations=12.0):
+
+    values = np.arange(4 * number_of_atoms, dtype='f8') + 0.25
+
+    return {'name': name, 'step': step,
+            'q': values[:number_of_atoms] if charges else None,
+            'fx': values[number_of_atoms:2 * number_of_atoms],
+            'fy': values[2 * number_of_atoms:3 * number_of_atoms],
+            'fz': values[3 * number_of_atoms:],
+            'stress': np.arange(9, dtype='f8') if stress else None,
+            'energy': -3.5, 'qeq_iterations': iterations}
+
+
+def write(block, results):
+
+    # the engines attaching the block are other processes, here the
+    # creator attaches it and must keep it registered for removing
+    with mock.patch.object(resource_tracker, 'unregister'):
+        return [SharedResultBlock.write(*block.layout(idx), res)
+                for idx, res in enumerate(results)]
+
+
+@pytest.fixture
+def block():
+
+    block = SharedResultBlock([2, 3, 1], [('a', '1'), ('b', '2'),
+                                          ('c', '3')])
+
+    yield block
+
+    block.close()
+
+
+def test_written_values_are_read_back(block):
+
+    expected = [make_result('a', '1', 2),
+                make_result('b', '2', 3, charges=False, stress=False,
+                            iterations=None),
+                make_result('c', '3', 1)]
+
+    statuses = write(block, expected)
+
+    assert statuses == [True, True, True]
+
+    for result, res in zip(block.read(statuses), expected):
+
+        assert (result['name'], result['step']) == (res['name'],
+                                                    res['step'])
+
+        assert result['energy'] == res['energy']
+
+        assert result['qeq_iterations'] == res['qeq_iterations']
+
+        for key in ('q', 'fx', 'fy', 'fz', 'stress'):
+            if res[key] is None:
+                assert result[key] is None
+            else:
+                np.testing.assert_array_equal(result[key], res[key])
+
+
+def test_failed_and_oversized_frames(block):
+
+    oversized = make_result('a', '1', 4)
+
+    statuses = write(block, [oversized, None]) + [True]
+
+    assert statuses[0] is oversized and statuses[1] is False
+
+    results = block.read(statuses)
+
+    assert results[0] is oversized
+
+    # the third frame is claimed but its slot was never written
+    assert results[1] is None and results[2] is None
+
+
+def test_reset_marks_the_frames_not_calculated(block):
+
+    statuses = write(block, [make_result('x', '1', n) for n in (2, 3, 1)])
+
+    first = block.read(statuses)
+
+    block.reset()
+
+    assert block.read(statuses) == [None, None, None]
+
+    # the values read before stay valid after the reset
+    assert first[0]['energy'] == -3.5